@@ -0,0 +1,245 @@
+"""
+Misst Latenz und SQL-Abfragen der wichtigsten Seiten und aller Scheduler-Jobs.
+
+Befuellt die Ziel-Datenbank mit :func:`seed_bench_data` (wie
+``flask seed-bench``), ruft die Seiten ``main.dashboard``,
+``tasks.task_list``, ``stats.index`` und ``shopping.shopping_list`` ueber
+den Flask-Test-Client als eingeloggter Hausmeister auf und fuehrt jeden
+Scheduler-Job direkt aus. Ausgegeben werden p50/p95 der Dauer und der
+Median der SQL-Abfragen pro Aufruf; mit ``--json`` zusaetzlich als Datei,
+z.B. als Baseline fuer spaetere Vergleiche.
+
+Es werden keine E-Mails oder Push-Nachrichten verschickt (Mail-Versand
+unterdrueckt, VAPID-Keys entfernt).
+
+Beispiele::
+
+    python benchmarks/load_suite.py
+    python benchmarks/load_suite.py --tasks 200000 --iterations 50 \\
+        --json baseline-sqlite.json
+    python benchmarks/load_suite.py \\
+        --database-url postgresql://user:pw@localhost/hauskeeping_bench
+
+Achtung: Alle Tabellen der Ziel-Datenbank werden geloescht und neu
+angelegt. Niemals gegen die Produktiv-Datenbank ausfuehren.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+PAGES = ["main.dashboard", "tasks.task_list", "stats.index", "shopping.shopping_list"]
+
+
+def _create_app(database_url):
+    """Erzeugt die App ohne Scheduler, Metriken und echten Versand."""
+    os.environ.update(
+        DATABASE_URL=database_url,
+        SCHEDULER_ENABLED="false",
+        METRICS_ENABLED="false",
+        SLOW_QUERY_MS="0",
+    )
+    os.environ.setdefault("MAIL_DEFAULT_SENDER", "bench@example.com")
+    sys.path.insert(0, SRC)
+
+    from hauskeeping import create_app
+
+    app = create_app()
+    app.config["VAPID_PRIVATE_KEY"] = None
+    app.extensions["mail"].suppress = True
+    return app
+
+
+def _jobs(app):
+    """
+    Die Scheduler-Jobs als ``(job_id, Funktion, Vorbereitung)``.
+
+    Die Vorbereitung laeuft vor jeder Messung (nicht gemessen) und stellt
+    den Ausgangszustand her, damit jeder Lauf dieselbe Arbeit erledigt.
+    """
+    from hauskeeping import scheduler
+    from hauskeeping.extensions import db
+    from hauskeeping.models import AppState, PushOutbox, Task, User
+
+    def mail_today():
+        # Der Seed verteilt die Wochentage zufaellig; ohne Anpassung haengt
+        # die Zahl der Empfaenger vom Tag der Messung ab
+        with app.app_context():
+            weekday = datetime.now(timezone.utc).date().weekday()
+            db.session.query(User).filter(
+                User.email_notifications_enabled == True  # noqa: E712
+            ).update({User.email_notification_day: weekday})
+            db.session.commit()
+
+    def clear_outbox():
+        with app.app_context():
+            db.session.query(PushOutbox).delete()
+            db.session.commit()
+
+    def fill_outbox():
+        clear_outbox()
+        scheduler._run_overdue_push(app)
+
+    def rewind_spawn():
+        # Letzte Woche vor dem Horizont erneut erzeugen lassen
+        with app.app_context():
+            state = db.session.get(AppState, "last_recurrence_monday")
+            horizon = date.fromisoformat(state.value)
+            db.session.query(Task).filter(
+                Task.parent_task_id.isnot(None), Task.due_date >= horizon
+            ).delete(synchronize_session=False)
+            state.value = str(horizon - timedelta(weeks=1))
+            db.session.commit()
+
+    return [
+        ("weekly_email_summary", scheduler._run_weekly_email_summary, mail_today),
+        ("due_today_push", scheduler._run_due_today_push, clear_outbox),
+        ("overdue_push", scheduler._run_overdue_push, clear_outbox),
+        ("recurrence_spawn", scheduler._run_recurrence_spawn, rewind_spawn),
+        ("push_outbox", scheduler._run_push_outbox, fill_outbox),
+        ("push_outbox_purge", scheduler._run_push_outbox_purge, None),
+        ("push_subscription_sweep", scheduler._run_push_subscription_sweep, None),
+    ]
+
+
+def _measure(app, func, iterations, warmup, prepare=None):
+    """
+    Fuehrt ``func`` wiederholt aus.
+
+    :return: Dauer in ms und Anzahl SQL-Abfragen pro gemessenem Lauf
+    :rtype: tuple[list[float], list[int]]
+    """
+    from hauskeeping.testing import count_queries
+
+    durations, queries = [], []
+    for i in range(warmup + iterations):
+        if prepare:
+            prepare()
+        with app.app_context(), count_queries() as counter:
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            durations.append(elapsed)
+            queries.append(counter.count)
+    return durations, queries
+
+
+def _summary(name, kind, durations, queries):
+    if len(durations) > 1:
+        p95 = statistics.quantiles(durations, n=20, method="inclusive")[18]
+    else:
+        p95 = durations[0]
+    return {
+        "name": name,
+        "kind": kind,
+        "runs": len(durations),
+        "p50_ms": round(statistics.median(durations), 2),
+        "p95_ms": round(p95, 2),
+        "queries": statistics.median(queries),
+        "queries_max": max(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Default: temporaere SQLite-Datei")
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--templates", type=int, default=100)
+    parser.add_argument("--shopping", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=30, help="Pro Seite")
+    parser.add_argument("--job-iterations", type=int, default=5, help="Pro Job")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--json", metavar="PATH", help="Ergebnisse als JSON")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    database_url = args.database_url or (
+        f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    )
+    app = _create_app(database_url)
+    logging.getLogger("hauskeeping").setLevel(logging.ERROR)
+
+    from flask import url_for
+
+    from hauskeeping.extensions import db
+    from hauskeeping.services.bench_seed import BENCH_PASSWORD, seed_bench_data
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        started = time.perf_counter()
+        counts = seed_bench_data(
+            args.users, args.tasks, args.templates, args.shopping, args.seed
+        )
+        dialect = db.engine.dialect.name
+    print(f"Datenbank: {dialect}, Testdaten in {time.perf_counter() - started:.1f}s")
+    print("  " + ", ".join(f"{name}={count}" for name, count in counts.items()))
+
+    client = app.test_client()
+    response = client.post(
+        "/auth/login", data={"username": "bench1", "password": BENCH_PASSWORD}
+    )
+    if response.status_code != 302:
+        sys.exit("Login fehlgeschlagen.")
+
+    results = []
+    for endpoint in PAGES:
+        with app.test_request_context():
+            url = url_for(endpoint)
+
+        def get(url=url):
+            response = client.get(url)
+            if response.status_code != 200:
+                sys.exit(f"{url}: HTTP {response.status_code}")
+
+        durations, queries = _measure(app, get, args.iterations, args.warmup)
+        results.append(_summary(endpoint, "page", durations, queries))
+
+    for job_id, func, prepare in _jobs(app):
+        durations, queries = _measure(
+            app,
+            lambda func=func: func(app),
+            args.job_iterations,
+            args.warmup,
+            prepare,
+        )
+        results.append(_summary(job_id, "job", durations, queries))
+
+    width = max(len(result["name"]) for result in results)
+    print(
+        f"\n{'':<{width}}  {'Laeufe':>6}  {'p50 ms':>8}  {'p95 ms':>8}  "
+        f"{'Queries':>7}"
+    )
+    for result in results:
+        queries = f"{result['queries']:g}"
+        if result["queries_max"] != result["queries"]:
+            queries += f" (max {result['queries_max']})"
+        print(
+            f"{result['name']:<{width}}  {result['runs']:>6}  "
+            f"{result['p50_ms']:>8.1f}  {result['p95_ms']:>8.1f}  {queries:>7}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"dialect": dialect, "counts": counts, "results": results},
+                handle,
+                indent=2,
+            )
+        print(f"\nErgebnisse gespeichert in {args.json}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
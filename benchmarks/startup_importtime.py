@@ -0,0 +1,111 @@
+"""
+Misst den Kaltstart von Hauskeeping mit ``python -X importtime``.
+
+Startet fuer jedes Szenario mehrfach einen frischen Python-Prozess, der die
+App erzeugt, und gibt den Median der Gesamtdauer und der Importzeit sowie
+die teuersten Top-Level-Imports aus. Zusaetzlich wird angezeigt, ob schwere
+Abhaengigkeiten (pywebpush, APScheduler, Alembic) beim Start geladen wurden.
+
+Szenarien:
+
+- ``app``: ``create_app()`` wie in einem WSGI-Worker, ohne Scheduler
+- ``cli``: ``flask routes`` als Beispiel fuer einen einmaligen CLI-Befehl
+
+Beispiele::
+
+    python benchmarks/startup_importtime.py
+    python benchmarks/startup_importtime.py --runs 10 --top 15 --scenario cli
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+SCENARIOS = {
+    "app": ["-c", "from hauskeeping import create_app; create_app()"],
+    "cli": ["-m", "flask", "--app", "hauskeeping:create_app", "routes"],
+}
+
+HEAVY_MODULES = ["pywebpush", "apscheduler", "alembic", "flask_migrate"]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _run(args, env):
+    """Startet einen Prozess und liefert (Dauer in s, importtime-Zeilen)."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.exit(f"Fehler beim Start:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, len(indent), int(self_us), int(cumulative_us)))
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), action="append", dest="scenarios"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            PYTHONPATH=SRC,
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+            SCHEDULER_ENABLED="false",
+            JINJA_BYTECODE_CACHE_DIR=os.path.join(tmp, "jinja"),
+        )
+        for scenario in args.scenarios or sorted(SCENARIOS):
+            runs = [_run(SCENARIOS[scenario], env) for _ in range(args.runs)]
+            wall = statistics.median(elapsed for elapsed, _ in runs)
+            import_ms = statistics.median(
+                sum(self_us for _, _, self_us, _ in imports) / 1000
+                for _, imports in runs
+            )
+            imports = runs[-1][1]
+            loaded = {name for name, *_ in imports}
+
+            print(f"\n== {scenario} ({args.runs} Laeufe, Median)")
+            print(f"Gesamt:  {wall * 1000:7.1f} ms")
+            print(f"Imports: {import_ms:7.1f} ms ({len(imports)} Module)")
+            print(
+                "Geladen: "
+                + ", ".join(
+                    f"{name}={'ja' if name in loaded else 'nein'}"
+                    for name in HEAVY_MODULES
+                )
+            )
+            top_level = sorted(
+                (item for item in imports if item[1] == 0),
+                key=lambda item: item[3],
+                reverse=True,
+            )
+            print(f"Top {args.top} Top-Level-Imports (kumuliert):")
+            for name, _, _, cumulative_us in top_level[: args.top]:
+                print(f"  {cumulative_us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Zeigt die Query-Plaene der heissen Task-Abfragen ohne und mit Indizes.
+
+Legt in einer *separaten* Datenbank die Tabellen ``users``,
+``task_categories`` und ``tasks`` an, befuellt sie mit synthetischen
+Aufgaben und gibt fuer jede Abfrage den Plan ohne Indizes und mit den
+Indizes aus ``Task.__table_args__`` aus.
+
+Beispiele::
+
+    python benchmarks/task_index_plans.py --database-url sqlite:///bench.db
+    python benchmarks/task_index_plans.py \\
+        --database-url postgresql://user:pw@localhost/hauskeeping_bench \\
+        --tasks 1000000
+
+Achtung: Die Tabellen in der Ziel-Datenbank werden geloescht und neu
+angelegt. Niemals gegen die Produktiv-Datenbank ausfuehren.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert, or_, select, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hauskeeping.extensions import db  # noqa: E402
+from hauskeeping.models import Task, TaskCategory, User  # noqa: E402
+
+TABLES = [User.__table__, TaskCategory.__table__, Task.__table__]
+
+
+def _queries(today):
+    """Die Abfrage-Formen der heissen Pfade (Name, Statement)."""
+    monday = today - timedelta(days=today.weekday())
+    sunday = monday + timedelta(days=6)
+    not_done = Task.is_done == False  # noqa: E712
+    return [
+        (
+            "main.dashboard",
+            select(Task)
+            .where(Task.due_date >= monday, Task.due_date <= sunday)
+            .order_by(Task.due_date),
+        ),
+        (
+            "tasks.task_list (open)",
+            select(Task).where(not_done).order_by(Task.due_date).limit(50),
+        ),
+        (
+            "_run_due_today_push",
+            select(Task).where(
+                Task.due_date == today, not_done, Task.assigned_to.isnot(None)
+            ),
+        ),
+        (
+            "_run_overdue_push",
+            select(Task).where(
+                Task.due_date < today, not_done, Task.assigned_to.isnot(None)
+            ),
+        ),
+        (
+            "_send_summary_to_user",
+            select(Task)
+            .where(
+                Task.assigned_to == 3,
+                not_done,
+                Task.due_date >= monday,
+                Task.due_date <= sunday,
+            )
+            .order_by(Task.due_date),
+        ),
+        (
+            "recurrence duplicate check",
+            select(Task.id).where(
+                or_(Task.id == 42, Task.parent_task_id == 42),
+                Task.due_date == today,
+            ),
+        ),
+        (
+            "admin.delete_user (completed_by)",
+            select(Task.id).where(Task.completed_by == 3),
+        ),
+        ("tasks.delete_category", select(Task.id).where(Task.category_id == 2)),
+    ]
+
+
+def _seed(engine, n_tasks, n_users, n_templates):
+    """Erzeugt Users, Kategorien und ``n_tasks`` Aufgaben per Bulk-Insert."""
+    rnd = random.Random(42)
+    today = date.today()
+    now = datetime.now()
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User.__table__),
+            [
+                {
+                    "id": i,
+                    "username": f"user{i}",
+                    "password_hash": "x",
+                    "role": "member",
+                    "created_at": now,
+                }
+                for i in range(1, n_users + 1)
+            ],
+        )
+        conn.execute(
+            insert(TaskCategory.__table__),
+            [
+                {
+                    "id": i,
+                    "name": f"Kategorie {i}",
+                    "slug": f"kategorie-{i}",
+                    "color": "#6c757d",
+                    "position": i,
+                    "exclude_from_stats": False,
+                }
+                for i in range(1, 9)
+            ],
+        )
+
+    batch = []
+    for i in range(1, n_tasks + 1):
+        # Der Grossteil liegt in der Vergangenheit und ist erledigt
+        due = today + timedelta(days=rnd.randint(-5 * 365, 60))
+        done = due < today - timedelta(days=14) and rnd.random() < 0.97
+        user = rnd.randint(1, n_users)
+        batch.append(
+            {
+                "id": i,
+                "title": f"Aufgabe {i}",
+                "due_date": due,
+                "is_done": done,
+                "category_id": rnd.choice([None, rnd.randint(1, 8)]),
+                "assigned_to": rnd.choice([None, user, user]),
+                "created_by": user,
+                "completed_by": user if done else None,
+                "parent_task_id": (
+                    rnd.randint(1, n_templates) if i > n_templates else None
+                ),
+                "created_at": now,
+            }
+        )
+        if len(batch) == 50_000:
+            with engine.begin() as conn:
+                conn.execute(insert(Task.__table__), batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(Task.__table__), batch)
+
+
+def _explain(conn, statement):
+    """Gibt den Query-Plan einer Abfrage als Liste von Zeilen zurueck."""
+    sql = str(statement.compile(conn.engine, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).fetchall()
+        return [row[-1] for row in rows]
+    rows = conn.execute(text("EXPLAIN " + sql)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _access_path(plan):
+    """Fasst einen Plan als Seq-Scan oder Index-Zugriff zusammen."""
+    joined = " ".join(plan)
+    if "USING INDEX" in joined or "USING COVERING INDEX" in joined:
+        return "index"
+    if "Index" in joined or "Bitmap" in joined:
+        return "index"
+    if "USING INTEGER PRIMARY KEY" in joined:
+        return "index"
+    return "seq scan"
+
+
+def _analyze(conn):
+    conn.execute(text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=25)
+    parser.add_argument("--templates", type=int, default=500)
+    parser.add_argument("--verbose", action="store_true", help="Plaene ausgeben")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    metadata = db.Model.metadata
+    metadata.drop_all(engine, tables=list(reversed(TABLES)))
+    metadata.create_all(engine, tables=TABLES)
+
+    started = time.perf_counter()
+    _seed(engine, args.tasks, args.users, args.templates)
+    print(f"{args.tasks} Aufgaben erzeugt in {time.perf_counter() - started:.1f}s")
+
+    indexes = list(Task.__table__.indexes)
+    queries = _queries(date.today())
+
+    for index in indexes:
+        index.drop(engine)
+    with engine.begin() as conn:
+        _analyze(conn)
+        before = [_explain(conn, stmt) for _, stmt in queries]
+
+    for index in indexes:
+        index.create(engine)
+    with engine.begin() as conn:
+        _analyze(conn)
+        after = [_explain(conn, stmt) for _, stmt in queries]
+
+    width = max(len(name) for name, _ in queries)
+    print(f"\n{'Abfrage':<{width}}  {'ohne Indizes':<12}  mit Indizes")
+    for (name, _), plan_before, plan_after in zip(queries, before, after):
+        print(
+            f"{name:<{width}}  {_access_path(plan_before):<12}  "
+            f"{_access_path(plan_after)}"
+        )
+        if args.verbose:
+            for line in plan_after:
+                print(f"    {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""widen tasks.recurrence_rule for RRULE strings
+
+Revision ID: a7b1c4d8e2f3
+Revises: f6a9b3d5e7c2
+Create Date: 2026-03-06 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b1c4d8e2f3'
+down_revision = 'f6a9b3d5e7c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column(
+            'recurrence_rule',
+            existing_type=sa.String(length=50),
+            type_=sa.String(length=255),
+            existing_nullable=True,
+        )
+
+
+def downgrade():
+    # Laengere Regeln wuerden beim Verkuerzen abgeschnitten bzw. abgelehnt
+    op.execute(
+        "UPDATE tasks SET recurrence_rule = NULL WHERE length(recurrence_rule) > 50"
+    )
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column(
+            'recurrence_rule',
+            existing_type=sa.String(length=255),
+            type_=sa.String(length=50),
+            existing_nullable=True,
+        )
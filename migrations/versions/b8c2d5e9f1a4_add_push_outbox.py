@@ -0,0 +1,46 @@
+"""add push_outbox table
+
+Revision ID: b8c2d5e9f1a4
+Revises: a7b1c4d8e2f3
+Create Date: 2026-03-09 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c2d5e9f1a4'
+down_revision = 'a7b1c4d8e2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'push_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(200), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('url', sa.String(500), nullable=True),
+        sa.Column('idempotency_key', sa.String(200), nullable=True),
+        sa.Column('status', sa.String(10), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('claim_token', sa.String(32), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+    )
+    op.create_index(
+        'ix_push_outbox_status_next', 'push_outbox', ['status', 'next_attempt_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_push_outbox_status_next', table_name='push_outbox')
+    op.drop_table('push_outbox')
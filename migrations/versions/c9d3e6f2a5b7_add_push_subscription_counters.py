@@ -0,0 +1,34 @@
+"""add delivery counters to push_subscriptions
+
+Revision ID: c9d3e6f2a5b7
+Revises: b8c2d5e9f1a4
+Create Date: 2026-03-11 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d3e6f2a5b7'
+down_revision = 'b8c2d5e9f1a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('push_subscriptions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_success_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_failure_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                'failure_count', sa.Integer(), nullable=False, server_default='0'
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('push_subscriptions', schema=None) as batch_op:
+        batch_op.drop_column('failure_count')
+        batch_op.drop_column('last_failure_at')
+        batch_op.drop_column('last_success_at')
@@ -0,0 +1,41 @@
+"""add job_runs table
+
+Revision ID: d1e4a7c9b2f6
+Revises: c9d3e6f2a5b7
+Create Date: 2026-03-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1e4a7c9b2f6'
+down_revision = 'c9d3e6f2a5b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(50), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(10), nullable=False),
+        sa.Column('items', sa.Integer(), nullable=False),
+        sa.Column('pushes', sa.Integer(), nullable=False),
+        sa.Column('mails', sa.Integer(), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.Column('host', sa.String(100), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_runs_job_started', 'job_runs', ['job_id', 'started_at'])
+    op.create_index('ix_job_runs_started_at', 'job_runs', ['started_at'])
+
+
+def downgrade():
+    op.drop_index('ix_job_runs_started_at', table_name='job_runs')
+    op.drop_index('ix_job_runs_job_started', table_name='job_runs')
+    op.drop_table('job_runs')
@@ -0,0 +1,52 @@
+"""add task_stats_daily rollup table
+
+Revision ID: e5f8a2c4d6b1
+Revises: d4e6g8h0j2k4
+Create Date: 2026-03-02 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f8a2c4d6b1'
+down_revision = 'd4e6g8h0j2k4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_stats_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('kind', sa.String(10), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('done', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_stats_daily_day', 'task_stats_daily', ['day'])
+
+    # Bestehende Aufgaben einmalig in die Rollup-Tabelle uebernehmen
+    # (entspricht "flask rebuild-stats").
+    for kind, user_col, done_expr in (
+        ('created', 'created_by', 'CASE WHEN is_done THEN 1 ELSE 0 END'),
+        ('assigned', 'assigned_to', 'CASE WHEN is_done THEN 1 ELSE 0 END'),
+        ('completed', 'completed_by', '1'),
+    ):
+        op.execute(
+            "INSERT INTO task_stats_daily "
+            "(day, kind, user_id, category_id, total, done) "
+            f"SELECT due_date, '{kind}', {user_col}, category_id, "
+            f"COUNT(id), SUM({done_expr}) "
+            f"FROM tasks WHERE {user_col} IS NOT NULL "
+            f"GROUP BY due_date, {user_col}, category_id"
+        )
+
+
+def downgrade():
+    op.drop_index('ix_task_stats_daily_day', table_name='task_stats_daily')
+    op.drop_table('task_stats_daily')
@@ -0,0 +1,56 @@
+"""add occurrence_date and spawned_until to tasks
+
+Revision ID: e7b3c5d9a1f4
+Revises: d1e4a7c9b2f6
+Create Date: 2026-03-18 10:00:00.000000
+
+"""
+from datetime import date, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3c5d9a1f4'
+down_revision = 'd1e4a7c9b2f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('occurrence_date', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('spawned_until', sa.Date(), nullable=True))
+
+    # Bestehende Instanzen: das Vorkommen ist das aktuelle Faelligkeitsdatum
+    op.execute(
+        'UPDATE tasks SET occurrence_date = due_date '
+        'WHERE parent_task_id IS NOT NULL'
+    )
+
+    # Bestehende Templates sind bis zum bisherigen Spawn-Horizont gespawnt
+    marker = op.get_bind().scalar(
+        sa.text("SELECT value FROM app_state WHERE key = 'last_recurrence_monday'")
+    )
+    if marker is not None:
+        op.execute(
+            sa.text(
+                'UPDATE tasks SET spawned_until = :until '
+                'WHERE recurrence_rule IS NOT NULL AND parent_task_id IS NULL'
+            ).bindparams(until=date.fromisoformat(marker) + timedelta(days=6))
+        )
+
+    op.drop_index('ix_tasks_parent_due', table_name='tasks')
+    op.create_index(
+        'ix_tasks_parent_occurrence', 'tasks', ['parent_task_id', 'occurrence_date']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tasks_parent_occurrence', table_name='tasks')
+    op.create_index('ix_tasks_parent_due', 'tasks', ['parent_task_id', 'due_date'])
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('spawned_until')
+        batch_op.drop_column('occurrence_date')
@@ -0,0 +1,43 @@
+"""add indexes for hot task queries
+
+Revision ID: f6a9b3d5e7c2
+Revises: e5f8a2c4d6b1
+Create Date: 2026-03-04 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a9b3d5e7c2'
+down_revision = 'e5f8a2c4d6b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'])
+    op.create_index(
+        'ix_tasks_assigned_done_due', 'tasks', ['assigned_to', 'is_done', 'due_date']
+    )
+    op.create_index('ix_tasks_parent_due', 'tasks', ['parent_task_id', 'due_date'])
+    op.create_index('ix_tasks_completed_by', 'tasks', ['completed_by'])
+    op.create_index('ix_tasks_category_id', 'tasks', ['category_id'])
+    # Partieller Index nur ueber offene Aufgaben
+    op.create_index(
+        'ix_tasks_open_due',
+        'tasks',
+        ['due_date'],
+        postgresql_where=sa.text('is_done = false'),
+        sqlite_where=sa.text('is_done = 0'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tasks_open_due', table_name='tasks')
+    op.drop_index('ix_tasks_category_id', table_name='tasks')
+    op.drop_index('ix_tasks_completed_by', table_name='tasks')
+    op.drop_index('ix_tasks_parent_due', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_done_due', table_name='tasks')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
@@ -4,7 +4,7 @@ from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .config import Config
-from .extensions import bcrypt, db, login_manager, mail, migrate
+from .extensions import bcrypt, db, login_manager, mail
 
 
 def create_app():
@@ -23,19 +23,35 @@ def create_app():
         static_folder="static",
     )
     app.config.from_object(Config)
+    cli_command = _cli_command()
 
     # Extensions initialisieren
     db.init_app(app)
-    migrate.init_app(app, db)
     login_manager.init_app(app)
     bcrypt.init_app(app)
     mail.init_app(app)
 
+    # Flask-Migrate zieht Alembic nach und wird nur fuer die Flask-CLI
+    # (flask db ...) benoetigt
+    if cli_command is not None:
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
+
     # Proxy-Konfiguration
     if app.config["USE_PROXY"]:
         app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
         app.config["APPLICATION_ROOT"] = app.config["PROXY_PREFIX"]
 
+    # Kompilierte Templates zwischen Prozessen und Neustarts wiederverwenden
+    if app.config["JINJA_BYTECODE_CACHE"]:
+        from jinja2 import FileSystemBytecodeCache
+
+        cache_dir = app.config["JINJA_BYTECODE_CACHE_DIR"]
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
     # Models importieren (fuer Flask-Migrate)
     from . import models  # noqa: F401
 
@@ -46,22 +62,59 @@ def create_app():
     def load_user(user_id):
         return db.session.get(User, int(user_id))
 
+    # Request-Instrumentierung (opt-in ueber METRICS_ENABLED / SLOW_QUERY_MS)
+    from .metrics import init_metrics
+    from .slow_queries import init_slow_query_log
+
+    init_metrics(app)
+    init_slow_query_log(app)
+
     # Blueprints registrieren
     from .routes import register_blueprints
 
     register_blueprints(app)
 
+    # Speicher-Profiling der Views (opt-in ueber MEMORY_PROFILING)
+    from .memory_profiling import init_memory_profiling
+
+    init_memory_profiling(app)
+
     # CLI-Commands registrieren
     from .cli import register_commands
 
     register_commands(app)
 
-    # Scheduler initialisieren (nur im Hauptprozess, nicht im Reloader)
-    import os
-
-    if os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug:
+    # Scheduler initialisieren (nur im Hauptprozess, nicht im Reloader). Mit
+    # SCHEDULER_ENABLED=false uebernimmt der separate Worker-Prozess die Jobs
+    # (flask hauskeeping-worker). Einmalige CLI-Befehle (flask db,
+    # flask create-admin, ...) starten keinen Scheduler.
+    if (
+        app.config["SCHEDULER_ENABLED"]
+        and cli_command in (None, "run")
+        and (os.environ.get("WERKZEUG_RUN_MAIN") == "true" or not app.debug)
+    ):
         from .scheduler import init_scheduler
 
         init_scheduler(app)
 
     return app
+
+
+def _cli_command():
+    """
+    Liefert den Namen des aktiven Click-Kontexts, in dem die App geladen wird.
+
+    Eingebaute Befehle (``flask run``, ``flask routes``) laden die App in
+    ihrem eigenen Kontext. App- und Plugin-Befehle (``flask db``,
+    ``flask create-admin``, ...) laden sie dagegen schon beim Aufloesen des
+    Befehls in der Gruppe, der Name ist dann ``"flask"``.
+
+    :return: Name des Click-Kontexts (z.B. ``"run"`` oder ``"flask"``) oder
+        ``None``, wenn die App nicht ueber die Flask-CLI gestartet wird
+        (run.py, WSGI-Server)
+    :rtype: str | None
+    """
+    import click
+
+    ctx = click.get_current_context(silent=True)
+    return ctx.info_name if ctx is not None else None
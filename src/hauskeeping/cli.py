@@ -44,3 +44,94 @@ def register_commands(app: Flask):
         """Erstellt alle Datenbanktabellen."""
         db.create_all()
         click.echo("Datenbank wurde initialisiert.")
+
+    @app.cli.command("rebuild-stats")
+    def rebuild_stats():
+        """Baut die Statistik-Tabelle task_stats_daily neu auf."""
+        from .services.stats_service import rebuild_task_stats
+
+        rows = rebuild_task_stats()
+        click.echo(f"Statistik neu aufgebaut ({rows} Zeilen).")
+
+    @app.cli.command("drain-push-outbox")
+    def drain_push_outbox():
+        """Stellt alle faelligen Nachrichten der Push-Outbox sofort zu."""
+        from .services.outbox_service import drain_outbox
+
+        total = 0
+        while processed := drain_outbox():
+            total += processed
+        click.echo(f"{total} Outbox-Nachricht(en) bearbeitet.")
+
+    @app.cli.command("compile-templates")
+    def compile_templates():
+        """Kompiliert alle Templates in den Jinja-Bytecode-Cache vor."""
+        from .services.email_renderer import compile_templates
+
+        if app.jinja_env.bytecode_cache is None:
+            click.echo("Fehler: JINJA_BYTECODE_CACHE ist deaktiviert.")
+            return
+        count = compile_templates(app)
+        click.echo(f"{count} Template(s) kompiliert.")
+
+    @app.cli.command("seed-bench")
+    @click.option("--users", default=25, show_default=True, help="Anzahl User")
+    @click.option(
+        "--tasks", default=20_000, show_default=True, help="Einzelne Aufgaben"
+    )
+    @click.option(
+        "--templates",
+        default=100,
+        show_default=True,
+        help="Wiederkehrende Aufgaben (Instanzen werden zusaetzlich erzeugt)",
+    )
+    @click.option(
+        "--shopping", default=150, show_default=True, help="Einkaufslisten-Eintraege"
+    )
+    @click.option("--seed", default=42, show_default=True, help="Zufalls-Startwert")
+    def seed_bench(users, tasks, templates, shopping, seed):
+        """Erzeugt Testdaten fuer Lasttests (nur in einer leeren Datenbank)."""
+        from .services.bench_seed import BENCH_PASSWORD, seed_bench_data
+
+        try:
+            counts = seed_bench_data(users, tasks, templates, shopping, seed)
+        except ValueError as exc:
+            click.echo(f"Fehler: {exc}")
+            return
+        for name, count in counts.items():
+            click.echo(f"{name:<20} {count:>8}")
+        click.echo(
+            f"Login: bench1 (Hausmeister) bis bench{users}, "
+            f"Passwort '{BENCH_PASSWORD}'."
+        )
+
+    @app.cli.command("profile-job")
+    @click.argument("job_id")
+    @click.option("--top", default=15, show_default=True, help="Anzahl der Codezeilen")
+    def profile_job(job_id, top):
+        """Fuehrt einen Scheduler-Job einmal unter dem Speicher-Profiler aus."""
+        from .memory_profiling import profile_memory
+        from .metrics import job_scope
+        from .scheduler import JOBS
+
+        func = JOBS.get(job_id)
+        if func is None:
+            click.echo(f"Fehler: Unbekannter Job '{job_id}'.")
+            click.echo("Verfuegbar: " + ", ".join(sorted(JOBS)))
+            return
+
+        # Direkt ausfuehren, ohne Lease und ohne Eintrag in job_runs
+        with job_scope(job_id), profile_memory(f"job:{job_id}", top) as profile:
+            func(app)
+        if profile is None:
+            click.echo("Fehler: Es laeuft bereits ein anderes Speicherprofil.")
+            return
+        click.echo(profile.format())
+
+    @app.cli.command("hauskeeping-worker")
+    def hauskeeping_worker():
+        """Startet nur den Scheduler mit allen geplanten Jobs (blockiert)."""
+        from .worker import run_worker
+
+        click.echo("Hauskeeping-Worker gestartet, Beenden mit Strg+C.")
+        run_worker(app)
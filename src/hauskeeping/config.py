@@ -18,10 +18,57 @@ class Config:
     SQLALCHEMY_DATABASE_URI = _db_url
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Maximale Anzahl SQL-Abfragen pro View (siehe hauskeeping.testing)
+    QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "20"))
+
+    # Request-Instrumentierung (SQL-Abfragen, DB-/Renderzeit, Latenz) als
+    # Server-Timing-Header und unter /metrics (nur Hausmeister)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    # Slow-Query-Log: Abfragen ab dieser Dauer (ms) mit Parametern und
+    # Herkunft loggen (0 = aus), optional mit EXPLAIN-Plan
+    SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "0"))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    # Speicher-Profiling (tracemalloc) fuer alle Scheduler-Jobs und die
+    # angegebenen Endpoints; nur zur Fehlersuche, verlangsamt die App deutlich
+    MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "false").lower() == "true"
+    MEMORY_PROFILING_ENDPOINTS = [
+        endpoint.strip()
+        for endpoint in os.getenv(
+            "MEMORY_PROFILING_ENDPOINTS", "tasks.task_list,stats.index"
+        ).split(",")
+        if endpoint.strip()
+    ]
+    MEMORY_PROFILING_TOP = int(os.getenv("MEMORY_PROFILING_TOP", "10"))
+
+    # Aufgabenliste: Anzahl Aufgaben pro Seite
+    TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", "50"))
+
+    # Wiederkehrende Aufgaben: Wochen, die im Voraus erzeugt werden, und
+    # maximale Anzahl Wochen, die nach einer Downtime nachgeholt werden
+    RECURRENCE_LOOKAHEAD_WEEKS = int(os.getenv("RECURRENCE_LOOKAHEAD_WEEKS", "4"))
+    RECURRENCE_MAX_CATCHUP_WEEKS = int(os.getenv("RECURRENCE_MAX_CATCHUP_WEEKS", "52"))
+    # Wochen nach dem Spawn-Horizont, die die Aufgabenliste ohne Enddatum
+    # virtuell (ohne gespeicherte Instanzen) anzeigt
+    RECURRENCE_VIRTUAL_WEEKS = int(os.getenv("RECURRENCE_VIRTUAL_WEEKS", "8"))
+
+    # Scheduler im Web-Prozess starten; bei false laufen die Jobs nur im
+    # separaten Worker-Prozess (flask hauskeeping-worker)
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    # Scheduler: Gueltigkeit des DB-Leases pro Job-Lauf (Sekunden). Nur ein
+    # Prozess fuehrt einen Lauf aus, solange er den Lease haelt.
+    SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "300"))
+    # Job-Protokoll (Tabelle job_runs): Aufbewahrung in Tagen
+    JOB_RUNS_RETENTION_DAYS = int(os.getenv("JOB_RUNS_RETENTION_DAYS", "30"))
+
     # Reverse Proxy
     USE_PROXY = os.getenv("USE_PROXY", "false").lower() == "true"
     PROXY_PREFIX = os.getenv("PROXY_PREFIX", "")
 
+    # Jinja-Bytecode-Cache: kompilierte Templates auf der Platte ablegen
+    # (ohne Verzeichnis im Standard-Temp-Verzeichnis von Jinja)
+    JINJA_BYTECODE_CACHE = os.getenv("JINJA_BYTECODE_CACHE", "true").lower() == "true"
+    JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR") or None
+
     # Mail
     MAIL_SERVER = os.getenv("MAIL_SERVER")
     MAIL_PORT = int(os.getenv("MAIL_PORT", "587"))
@@ -30,8 +77,29 @@ class Config:
     MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "true").lower() == "true"
     MAIL_USE_SSL = os.getenv("MAIL_USE_SSL", "false").lower() == "true"
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER")
+    # Woechentliche Zusammenfassung: Mails pro Charge, Threads zum Rendern
+    # und maximale Mails pro Minute (0 = unbegrenzt)
+    WEEKLY_MAIL_BATCH_SIZE = int(os.getenv("WEEKLY_MAIL_BATCH_SIZE", "50"))
+    WEEKLY_MAIL_RENDER_WORKERS = int(os.getenv("WEEKLY_MAIL_RENDER_WORKERS", "4"))
+    WEEKLY_MAIL_RATE_LIMIT = int(os.getenv("WEEKLY_MAIL_RATE_LIMIT", "0"))
 
     # VAPID (Web Push)
     VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY")
     VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY")
     VAPID_CLAIM_EMAIL = os.getenv("VAPID_CLAIM_EMAIL")
+    # Parallele Zustellung: Anzahl Threads und Timeout pro Request (Sekunden)
+    PUSH_MAX_WORKERS = int(os.getenv("PUSH_MAX_WORKERS", "8"))
+    PUSH_TIMEOUT = float(os.getenv("PUSH_TIMEOUT", "10"))
+    # Subscriptions entfernen nach N Fehlern in Folge bzw. nach N Tagen ohne
+    # erfolgreiche Zustellung (bei fehlgeschlagenen Versuchen)
+    PUSH_SUBSCRIPTION_MAX_FAILURES = int(
+        os.getenv("PUSH_SUBSCRIPTION_MAX_FAILURES", "10")
+    )
+    PUSH_SUBSCRIPTION_STALE_DAYS = int(os.getenv("PUSH_SUBSCRIPTION_STALE_DAYS", "30"))
+    # Push-Outbox: Intervall des Zustell-Jobs (Sekunden), Nachrichten pro
+    # Charge, Wiederholungen mit Backoff-Basis (Sekunden) und Aufbewahrung
+    PUSH_OUTBOX_INTERVAL = int(os.getenv("PUSH_OUTBOX_INTERVAL", "15"))
+    PUSH_OUTBOX_BATCH_SIZE = int(os.getenv("PUSH_OUTBOX_BATCH_SIZE", "100"))
+    PUSH_OUTBOX_MAX_ATTEMPTS = int(os.getenv("PUSH_OUTBOX_MAX_ATTEMPTS", "6"))
+    PUSH_OUTBOX_BACKOFF_SECONDS = int(os.getenv("PUSH_OUTBOX_BACKOFF_SECONDS", "60"))
+    PUSH_OUTBOX_RETENTION_DAYS = int(os.getenv("PUSH_OUTBOX_RETENTION_DAYS", "7"))
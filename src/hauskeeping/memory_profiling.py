@@ -0,0 +1,213 @@
+import contextlib
+import functools
+import logging
+import os
+import threading
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Gespeicherte Frames pro Allokation; noetig, um Allokationen in SQLAlchemy
+# oder Jinja der aufrufenden Zeile in Hauskeeping zuzuordnen
+_FRAMES = 25
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Eigene Allokationen von tracemalloc und dem Import-System ausblenden
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# tracemalloc misst prozessweit; parallele Profile wuerden sich gegenseitig
+# verfaelschen, daher laeuft immer nur eines
+_profile_lock = threading.Lock()
+
+
+class MemoryProfile:
+    """
+    Ergebnis eines Profils von :func:`profile_memory`.
+
+    ``peak_bytes`` ist der hoechste Speicherverbrauch waehrend des Blocks,
+    ``retained_bytes`` der nach dem Block verbliebene Zuwachs (jeweils
+    relativ zum Stand vor dem Block). ``top`` listet die Codezeilen in
+    Hauskeeping mit dem groessten verbliebenen Zuwachs als
+    ``(ort, bytes, bloecke)``; Allokationen in Bibliotheken zaehlen zur
+    aufrufenden Zeile.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.peak_bytes = 0
+        self.retained_bytes = 0
+        self.top = []
+
+    def format(self):
+        """
+        :return: Mehrzeilige Zusammenfassung fuer Log und CLI
+        :rtype: str
+        """
+        lines = [
+            f"Speicherprofil {self.label}: Peak {_mib(self.peak_bytes)}, "
+            f"verbleibend {_mib(self.retained_bytes)}"
+        ]
+        for location, size, count in self.top:
+            lines.append(f"  {size / 1024:+10.1f} KiB {count:+8d} Bloecke  {location}")
+        return "\n".join(lines)
+
+
+class MemoryProfileRegistry:
+    """Thread-sichere Sammlung des jeweils letzten Profils pro Label."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = {}
+
+    def record(self, profile):
+        with self._lock:
+            self._profiles[profile.label] = profile
+
+    def snapshot(self):
+        """
+        :return: Letztes Profil pro Label
+        :rtype: dict[str, MemoryProfile]
+        """
+        with self._lock:
+            return dict(self._profiles)
+
+
+memory_profiles = MemoryProfileRegistry()
+
+
+@contextlib.contextmanager
+def profile_memory(label, top=10):
+    """
+    Misst den Speicherverbrauch des umschlossenen Blocks mit tracemalloc.
+
+    Vor und nach dem Block wird ein Snapshot erstellt; die Differenz ergibt
+    die Codezeilen mit dem groessten verbliebenen Zuwachs (Kandidaten fuer
+    wachsenden Speicher). Laeuft tracemalloc noch nicht, wird es nur fuer
+    den Block gestartet. Laeuft in einem anderen Thread bereits ein Profil,
+    wird der Block ohne Profil ausgefuehrt und ``None`` geliefert.
+
+    :param label: Bezeichnung, z.B. ``job:overdue_push``
+    :type label: str
+    :param top: Anzahl der ausgegebenen Codezeilen
+    :type top: int
+    :return: Profil, das nach dem Block befuellt ist, oder ``None``
+    :rtype: MemoryProfile | None
+    """
+    if not _profile_lock.acquire(blocking=False):
+        logger.debug("Speicherprofil %s uebersprungen: Profil laeuft bereits.", label)
+        yield None
+        return
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(_FRAMES)
+    try:
+        profile = MemoryProfile(label)
+        before = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield profile
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            profile.peak_bytes = max(peak - baseline, 0)
+            profile.retained_bytes = current - baseline
+            profile.top = _top_sites(after.compare_to(before, "traceback"), top)
+            memory_profiles.record(profile)
+            logger.info(profile.format())
+    finally:
+        if started:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+def job_memory_profile(app, job_id):
+    """
+    Profil fuer einen Scheduler-Job, wenn ``MEMORY_PROFILING`` aktiv ist.
+
+    :return: Context-Manager (ohne Profiling ein No-Op)
+    """
+    if not app.config["MEMORY_PROFILING"]:
+        return contextlib.nullcontext()
+    return profile_memory(f"job:{job_id}", app.config["MEMORY_PROFILING_TOP"])
+
+
+def init_memory_profiling(app):
+    """
+    Aktiviert das Speicher-Profiling, wenn ``MEMORY_PROFILING`` gesetzt ist.
+
+    Startet tracemalloc fuer den ganzen Prozess und umschliesst die Views
+    der Endpoints aus ``MEMORY_PROFILING_ENDPOINTS`` mit
+    :func:`profile_memory`. Scheduler-Jobs werden in
+    :func:`~hauskeeping.scheduler._leased` profiliert. Muss nach dem
+    Registrieren der Blueprints aufgerufen werden.
+
+    :param app: Die Flask-App-Instanz
+    :type app: Flask
+    """
+    if not app.config["MEMORY_PROFILING"]:
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(_FRAMES)
+    top = app.config["MEMORY_PROFILING_TOP"]
+    for endpoint in app.config["MEMORY_PROFILING_ENDPOINTS"]:
+        view = app.view_functions.get(endpoint)
+        if view is None:
+            logger.warning("Speicherprofil: Endpoint %s existiert nicht.", endpoint)
+            continue
+        app.view_functions[endpoint] = _profiled_view(view, f"endpoint:{endpoint}", top)
+    logger.warning(
+        "Speicher-Profiling aktiv (tracemalloc) – verlangsamt die App deutlich."
+    )
+
+
+def _profiled_view(view, label, top):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with profile_memory(label, top):
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _top_sites(stats, limit):
+    """
+    Summiert Snapshot-Differenzen pro Codezeile in Hauskeeping.
+
+    Massgeblich ist der juengste Frame innerhalb des Pakets; liegt keiner
+    im Paket, der juengste Frame ueberhaupt.
+    """
+    sites = {}
+    for stat in stats:
+        frame = next(
+            (
+                f
+                for f in reversed(stat.traceback)
+                if f.filename.startswith(_PACKAGE_DIR)
+            ),
+            stat.traceback[-1],
+        )
+        filename = frame.filename
+        if filename.startswith(_PACKAGE_DIR):
+            filename = os.path.relpath(filename, os.path.dirname(_PACKAGE_DIR))
+        site = sites.setdefault(f"{filename}:{frame.lineno}", [0, 0])
+        site[0] += stat.size_diff
+        site[1] += stat.count_diff
+    ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+    return [
+        (location, size, count)
+        for location, (size, count) in ranked[:limit]
+        if size > 0
+    ]
+
+
+def _mib(size):
+    return f"{size / 1024 / 1024:+.1f} MiB"
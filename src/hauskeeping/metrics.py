@@ -0,0 +1,367 @@
+import contextlib
+import contextvars
+import threading
+import time
+from datetime import timezone
+
+from flask import (
+    before_render_template,
+    g,
+    has_request_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+
+from .extensions import db
+
+# Grenzen der Latenz-Histogramme in Sekunden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ID des Scheduler-Jobs, der im aktuellen Thread laeuft (siehe job_scope)
+_current_job = contextvars.ContextVar("hauskeeping_current_job", default=None)
+
+
+class RequestMetrics:
+    """Messwerte des laufenden Requests (liegt in ``flask.g``)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.render_started = []
+
+
+class EndpointStats:
+    """Aufsummierte Messwerte eines Endpoints."""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.total_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+
+class MetricsRegistry:
+    """Thread-sichere Sammlung der Request-Metriken pro Endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def record(self, endpoint, queries, db_seconds, render_seconds, total_seconds):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.requests += 1
+            stats.queries += queries
+            stats.db_seconds += db_seconds
+            stats.render_seconds += render_seconds
+            stats.total_seconds += total_seconds
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if total_seconds <= bound:
+                    stats.buckets[index] += 1
+
+    def snapshot(self):
+        """
+        :return: Kopie der Messwerte pro Endpoint
+        :rtype: dict[str, EndpointStats]
+        """
+        with self._lock:
+            snapshot = {}
+            for endpoint, stats in self._endpoints.items():
+                copy = EndpointStats()
+                copy.__dict__.update(stats.__dict__, buckets=list(stats.buckets))
+                snapshot[endpoint] = copy
+            return snapshot
+
+
+registry = MetricsRegistry()
+
+
+def init_metrics(app):
+    """
+    Aktiviert die Request-Instrumentierung, wenn ``METRICS_ENABLED`` gesetzt ist.
+
+    Zaehlt pro Request die SQL-Abfragen und deren Dauer (SQLAlchemy-Events
+    ``before/after_cursor_execute``), die Renderdauer der Templates und die
+    Gesamtdauer. Die Werte werden als ``Server-Timing``-Header zurueckgegeben
+    und pro Endpoint in :data:`registry` gesammelt (siehe ``/metrics``).
+
+    :param app: Die Flask-App-Instanz
+    :type app: Flask
+    """
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+@contextlib.contextmanager
+def job_scope(job_id):
+    """
+    Markiert den umschlossenen Code als Lauf des Scheduler-Jobs ``job_id``.
+
+    :param job_id: ID des Jobs, z. B. ``overdue_push``
+    :type job_id: str
+    """
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def current_origin():
+    """
+    Beschreibt, wodurch der laufende Code ausgeloest wurde.
+
+    :return: ``endpoint:<name>`` im Request, ``job:<id>`` in einem
+        Scheduler-Job, sonst ``None``
+    :rtype: str | None
+    """
+    if has_request_context():
+        return f"endpoint:{request.endpoint or '<unmatched>'}"
+    job_id = _current_job.get()
+    if job_id is not None:
+        return f"job:{job_id}"
+    return None
+
+
+def _current():
+    """Messwerte des laufenden Requests oder ``None`` (z.B. in Scheduler-Jobs)."""
+    if not has_request_context():
+        return None
+    return g.get("request_metrics")
+
+
+def _start_request():
+    g.request_metrics = RequestMetrics()
+
+
+def _finish_request(response):
+    metrics = _current()
+    if metrics is None:
+        return response
+
+    total = time.perf_counter() - metrics.started
+    registry.record(
+        request.endpoint or "<unmatched>",
+        metrics.queries,
+        metrics.db_seconds,
+        metrics.render_seconds,
+        total,
+    )
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries", '
+        f"render;dur={metrics.render_seconds * 1000:.1f}, "
+        f"total;dur={total * 1000:.1f}",
+    )
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current() is not None:
+        conn.info.setdefault("request_metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current()
+    started = conn.info.get("request_metrics_started")
+    if metrics is None or not started:
+        return
+    metrics.queries += 1
+    metrics.db_seconds += time.perf_counter() - started.pop()
+
+
+def _before_render_template(sender, template, context, **extra):
+    metrics = _current()
+    if metrics is not None:
+        metrics.render_started.append(time.perf_counter())
+
+
+def _template_rendered(sender, template, context, **extra):
+    metrics = _current()
+    if metrics is None or not metrics.render_started:
+        return
+    elapsed = time.perf_counter() - metrics.render_started.pop()
+    # Verschachtelte render_template-Aufrufe nur einmal zaehlen
+    if not metrics.render_started:
+        metrics.render_seconds += elapsed
+
+
+def render_prometheus():
+    """
+    Gibt alle Metriken im Prometheus-Textformat aus.
+
+    Neben den Request-Metriken dieses Prozesses enthaelt die Ausgabe die
+    E-Mail-Renderzeiten, die Job-Laeufe aus der Tabelle ``job_runs`` und
+    bei aktivem ``MEMORY_PROFILING`` die letzten Speicherprofile.
+
+    :return: Inhalt fuer ``/metrics``
+    :rtype: str
+    """
+    from .memory_profiling import memory_profiles
+    from .services.email_renderer import render_stats
+    from .services.job_runs import job_summaries, latest_job_runs
+
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(_sample(name, labels, value))
+
+    endpoints = sorted(registry.snapshot().items())
+    metric(
+        "hauskeeping_http_requests_total",
+        "counter",
+        "Anzahl Requests pro Endpoint.",
+        [({"endpoint": name}, stats.requests) for name, stats in endpoints],
+    )
+    metric(
+        "hauskeeping_db_queries_total",
+        "counter",
+        "Anzahl SQL-Abfragen pro Endpoint.",
+        [({"endpoint": name}, stats.queries) for name, stats in endpoints],
+    )
+    metric(
+        "hauskeeping_db_seconds_total",
+        "counter",
+        "Dauer der SQL-Abfragen pro Endpoint in Sekunden.",
+        [({"endpoint": name}, stats.db_seconds) for name, stats in endpoints],
+    )
+    metric(
+        "hauskeeping_template_render_seconds_total",
+        "counter",
+        "Renderdauer der Templates pro Endpoint in Sekunden.",
+        [({"endpoint": name}, stats.render_seconds) for name, stats in endpoints],
+    )
+
+    histogram = "hauskeeping_http_request_duration_seconds"
+    lines.append(f"# HELP {histogram} Gesamtdauer der Requests in Sekunden.")
+    lines.append(f"# TYPE {histogram} histogram")
+    for name, stats in endpoints:
+        for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+            lines.append(
+                _sample(f"{histogram}_bucket", {"endpoint": name, "le": bound}, count)
+            )
+        lines.append(
+            _sample(
+                f"{histogram}_bucket", {"endpoint": name, "le": "+Inf"}, stats.requests
+            )
+        )
+        lines.append(
+            _sample(f"{histogram}_sum", {"endpoint": name}, stats.total_seconds)
+        )
+        lines.append(_sample(f"{histogram}_count", {"endpoint": name}, stats.requests))
+
+    emails = render_stats.snapshot()
+    metric(
+        "hauskeeping_email_renders_total",
+        "counter",
+        "Anzahl gerenderter E-Mails.",
+        [({}, emails["count"])],
+    )
+    metric(
+        "hauskeeping_email_render_seconds_total",
+        "counter",
+        "Renderdauer der E-Mails in Sekunden.",
+        [({}, emails["total_seconds"])],
+    )
+
+    summaries = job_summaries(days=1)
+    metric(
+        "hauskeeping_job_runs_24h",
+        "gauge",
+        "Laeufe pro Scheduler-Job und Status in den letzten 24 Stunden.",
+        [
+            ({"job": summary["job_id"], "status": status}, count)
+            for summary in summaries
+            for status, count in (
+                ("ok", summary["runs"] - summary["skipped"] - summary["failed"]),
+                ("failed", summary["failed"]),
+                ("skipped", summary["skipped"]),
+            )
+        ],
+    )
+    last_runs = latest_job_runs()
+    metric(
+        "hauskeeping_job_last_run_timestamp_seconds",
+        "gauge",
+        "Startzeit des letzten ausgefuehrten Laufs (Unix-Zeit).",
+        [
+            (
+                {"job": run.job_id},
+                run.started_at.replace(tzinfo=timezone.utc).timestamp(),
+            )
+            for run in last_runs
+        ],
+    )
+    metric(
+        "hauskeeping_job_last_duration_seconds",
+        "gauge",
+        "Dauer des letzten ausgefuehrten Laufs in Sekunden.",
+        [({"job": run.job_id}, run.duration_ms / 1000) for run in last_runs],
+    )
+    metric(
+        "hauskeeping_job_last_items",
+        "gauge",
+        "Verarbeitete Elemente im letzten ausgefuehrten Lauf.",
+        [({"job": run.job_id}, run.items) for run in last_runs],
+    )
+    metric(
+        "hauskeeping_job_last_failures",
+        "gauge",
+        "Fehler im letzten ausgefuehrten Lauf.",
+        [({"job": run.job_id}, run.failures) for run in last_runs],
+    )
+
+    profiles = sorted(memory_profiles.snapshot().items())
+    if profiles:
+        metric(
+            "hauskeeping_memory_peak_bytes",
+            "gauge",
+            "Speicher-Peak des letzten profilierten Laufs (MEMORY_PROFILING).",
+            [({"target": label}, profile.peak_bytes) for label, profile in profiles],
+        )
+        metric(
+            "hauskeeping_memory_retained_bytes",
+            "gauge",
+            "Nach dem letzten profilierten Lauf verbliebener Speicherzuwachs.",
+            [
+                ({"target": label}, profile.retained_bytes)
+                for label, profile in profiles
+            ],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _sample(name, labels, value):
+    """Formatiert eine Zeile im Prometheus-Format, z.B. ``name{a="b"} 1``."""
+    if not labels:
+        return f"{name} {value}"
+    pairs = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+    return f"{name}{{{pairs}}} {value}"
+
+
+def _escape(value):
+    """Maskiert einen Label-Wert (Backslash, Anfuehrungszeichen, Zeilenumbruch)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,7 +1,10 @@
 from .app_state import AppState
+from .job_run import JobRun
+from .push_outbox import PushOutbox
 from .push_subscription import PushSubscription
 from .shopping import ShoppingCategory, ShoppingListItem
 from .task import Task, TaskCategory
+from .task_stats import TaskStatsDaily
 from .user import InviteCode, User
 
 __all__ = [
@@ -9,8 +12,11 @@ __all__ = [
     "InviteCode",
     "Task",
     "TaskCategory",
+    "TaskStatsDaily",
     "ShoppingCategory",
     "ShoppingListItem",
     "PushSubscription",
+    "PushOutbox",
     "AppState",
+    "JobRun",
 ]
@@ -0,0 +1,37 @@
+from ..extensions import db
+
+
+class JobRun(db.Model):
+    """
+    Protokoll eines Scheduler-Job-Laufs.
+
+    Wird von :func:`~hauskeeping.scheduler._leased` nach jedem Lauf
+    geschrieben. ``status`` ist ``ok``, ``failed`` (mindestens ein Fehler)
+    oder ``skipped`` (Lease von einem anderen Prozess gehalten). Die Zaehler
+    melden die Jobs ueber
+    :func:`~hauskeeping.services.job_runs.record_job_counts`.
+    """
+
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        # Admin-Seite und Metriken: letzte Laeufe pro Job
+        db.Index("ix_job_runs_job_started", "job_id", "started_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(50), nullable=False)
+    # UTC ohne Zeitzone
+    started_at = db.Column(db.DateTime, nullable=False, index=True)
+    duration_ms = db.Column(db.Float, nullable=False, default=0)
+    status = db.Column(db.String(10), nullable=False)
+    # Verarbeitete Elemente (Aufgaben, Nachrichten, Subscriptions, ...)
+    items = db.Column(db.Integer, nullable=False, default=0)
+    # Eingereihte bzw. zugestellte Push-Nachrichten
+    pushes = db.Column(db.Integer, nullable=False, default=0)
+    mails = db.Column(db.Integer, nullable=False, default=0)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    # Prozess, der den Lauf ausgefuehrt hat (host:pid)
+    host = db.Column(db.String(100), nullable=True)
+
+    def __repr__(self):
+        return f"<JobRun {self.job_id} {self.started_at} {self.status}>"
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from ..extensions import db
+
+
+class PushOutbox(db.Model):
+    """
+    Ausgehende Push-Nachrichten (Outbox).
+
+    Nachrichten werden in derselben Transaktion wie die ausloesende Aenderung
+    eingetragen und vom Outbox-Job gesammelt zugestellt. Fehlgeschlagene
+    Zustellungen werden mit exponentiellem Backoff wiederholt und nach
+    ``PUSH_OUTBOX_MAX_ATTEMPTS`` Versuchen als ``dead`` markiert.
+
+    Status: ``pending`` (wartet auf Zustellung), ``sent`` (zugestellt),
+    ``skipped`` (keine Subscription bzw. Push deaktiviert) oder ``dead``.
+    """
+
+    __tablename__ = "push_outbox"
+    __table_args__ = (
+        # Outbox-Job: faellige Nachrichten in Einfuegereihenfolge
+        db.Index("ix_push_outbox_status_next", "status", "next_attempt_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    url = db.Column(db.String(500), nullable=True)
+    # Verhindert doppelte Nachrichten, z.B. wenn ein Job mehrfach laeuft
+    idempotency_key = db.Column(db.String(200), unique=True, nullable=True)
+    status = db.Column(db.String(10), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    # Prozess, der die Nachricht gerade zustellt
+    claim_token = db.Column(db.String(32), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<PushOutbox {self.id} user={self.user_id} {self.status}>"
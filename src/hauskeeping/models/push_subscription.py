@@ -22,6 +22,11 @@ class PushSubscription(db.Model):
     created_at = db.Column(
         db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
+    # Zustellstatistik: letzte erfolgreiche/fehlgeschlagene Zustellung und
+    # Anzahl Fehler in Folge seit der letzten erfolgreichen Zustellung
+    last_success_at = db.Column(db.DateTime, nullable=True)
+    last_failure_at = db.Column(db.DateTime, nullable=True)
+    failure_count = db.Column(db.Integer, nullable=False, default=0)
 
     def __repr__(self):
         return f"<PushSubscription user={self.user_id}>"
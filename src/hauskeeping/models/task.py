@@ -1,6 +1,8 @@
 import re
 from datetime import datetime, timezone
 
+from sqlalchemy.orm import configure_mappers, joinedload
+
 from ..extensions import db
 
 
@@ -45,6 +47,23 @@ class Task(db.Model):
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Kalender/Dashboard: Aufgaben eines Zeitraums
+        db.Index("ix_tasks_due_date", "due_date"),
+        # Push-Jobs und Wochen-Mail: offene Aufgaben eines Users nach Datum
+        db.Index("ix_tasks_assigned_done_due", "assigned_to", "is_done", "due_date"),
+        # Recurrence: Instanzen eines Templates zu einem Vorkommen
+        db.Index("ix_tasks_parent_occurrence", "parent_task_id", "occurrence_date"),
+        db.Index("ix_tasks_completed_by", "completed_by"),
+        db.Index("ix_tasks_category_id", "category_id"),
+        # Offene Aufgaben nach Datum (Aufgabenliste, Ueberfaellig-Push)
+        db.Index(
+            "ix_tasks_open_due",
+            "due_date",
+            postgresql_where=db.text("is_done = false"),
+            sqlite_where=db.text("is_done = 0"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -56,10 +75,16 @@ class Task(db.Model):
     )
     assigned_to = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    recurrence_rule = db.Column(db.String(50), nullable=True)
+    # Wiederholungsregel: RRULE-Teilmenge (siehe services.recurrence)
+    recurrence_rule = db.Column(db.String(255), nullable=True)
     parent_task_id = db.Column(
         db.Integer, db.ForeignKey("tasks.id"), nullable=True
     )
+    # Instanz: urspruengliches Datum des Vorkommens, bleibt beim Verschieben
+    # (Aendern von due_date) erhalten
+    occurrence_date = db.Column(db.Date, nullable=True)
+    # Template: letzter Tag, bis zu dem die Instanzen gespeichert sind
+    spawned_until = db.Column(db.Date, nullable=True)
     completed_by = db.Column(
         db.Integer, db.ForeignKey("users.id"), nullable=True
     )
@@ -70,6 +95,9 @@ class Task(db.Model):
 
     category = db.relationship("TaskCategory", backref="tasks")
 
+    # Gespeicherte Aufgabe; Gegenstueck zu services.recurrence.VirtualTask
+    is_virtual = False
+
     @property
     def is_overdue(self):
         """
@@ -82,5 +110,30 @@ class Task(db.Model):
             return False
         return self.due_date < datetime.now(timezone.utc).date()
 
+    @staticmethod
+    def display_options(assignee=True, completer=False):
+        """
+        Eager-Loading-Optionen fuer Ansichten, die Aufgaben auflisten.
+
+        Laedt Kategorie und optional zugewiesenen bzw. erledigenden User per
+        JOIN mit, damit das Template nicht pro Zeile einen Lazy Load ausloest.
+
+        :param assignee: Zugewiesenen User mitladen
+        :type assignee: bool
+        :param completer: Erledigenden User mitladen
+        :type completer: bool
+        :return: Liste von Loader-Optionen fuer ``query.options()``
+        :rtype: list
+        """
+        # assignee/completer sind Backrefs aus User und existieren erst
+        # nach der Mapper-Konfiguration.
+        configure_mappers()
+        options = [joinedload(Task.category)]
+        if assignee:
+            options.append(joinedload(Task.assignee))
+        if completer:
+            options.append(joinedload(Task.completer))
+        return options
+
     def __repr__(self):
         return f"<Task {self.title}>"
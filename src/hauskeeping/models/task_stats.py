@@ -0,0 +1,29 @@
+from ..extensions import db
+
+
+class TaskStatsDaily(db.Model):
+    """
+    Vorberechnete Aufgaben-Zaehler pro Tag, User und Kategorie.
+
+    Jede Zeile zaehlt die Aufgaben mit Faelligkeitsdatum ``day`` aus Sicht
+    einer Rolle (``kind``): ``created`` (Ersteller), ``assigned``
+    (zugewiesener User) oder ``completed`` (erledigt von). Die Tabelle wird
+    bei jeder Aenderung an Aufgaben inkrementell gepflegt und dient der
+    Statistik-Seite als Datenquelle.
+
+    Die Zaehler sind additiv: Mehrere Zeilen mit gleichem Schluessel sind
+    erlaubt und werden beim Auslesen aufsummiert.
+    """
+
+    __tablename__ = "task_stats_daily"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    kind = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    category_id = db.Column(db.Integer, nullable=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    done = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TaskStatsDaily {self.day} {self.kind} user={self.user_id}>"
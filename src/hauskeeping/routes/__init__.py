@@ -3,6 +3,7 @@ from flask import Flask
 from .admin import admin_bp
 from .auth import auth_bp
 from .main import main_bp
+from .metrics import metrics_bp
 from .settings import settings_bp
 from .shopping import shopping_bp
 from .stats import stats_bp
@@ -23,3 +24,7 @@ def register_blueprints(app: Flask):
     app.register_blueprint(admin_bp)
     app.register_blueprint(settings_bp)
     app.register_blueprint(stats_bp)
+
+    # Prometheus-Endpoint nur bei aktivierter Instrumentierung
+    if app.config["METRICS_ENABLED"]:
+        app.register_blueprint(metrics_bp)
@@ -6,9 +6,13 @@ from flask import Blueprint, flash, jsonify, redirect, render_template, request,
 from flask_login import current_user, login_required
 
 from ..extensions import db
+from ..models.job_run import JobRun
+from ..models.push_outbox import PushOutbox
 from ..models.shopping import ShoppingListItem
 from ..models.task import Task
 from ..models.user import InviteCode, User
+from ..services.job_runs import job_summaries
+from ..services.stats_service import reassign_user_stats
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -116,6 +120,8 @@ def delete_user(user_id):
     Task.query.filter_by(created_by=user.id).update({"created_by": current_user.id})
     ShoppingListItem.query.filter_by(added_by=user.id).update({"added_by": current_user.id})
     InviteCode.query.filter_by(created_by=user.id).update({"created_by": current_user.id})
+    reassign_user_stats(user.id, current_user.id)
+    PushOutbox.query.filter_by(user_id=user.id).delete()
 
     db.session.delete(user)
     db.session.commit()
@@ -124,6 +130,28 @@ def delete_user(user_id):
     return redirect(url_for("admin.user_list"))
 
 
+@admin_bp.route("/jobs")
+@hausmeister_required
+def job_runs():
+    """
+    Zeigt die Laeufe der Scheduler-Jobs an.
+
+    Oben eine Zusammenfassung der letzten 7 Tage pro Job, darunter die
+    letzten 100 Laeufe (optional gefiltert per ``?job=<id>``).
+    """
+    job_id = request.args.get("job") or None
+    query = JobRun.query
+    if job_id:
+        query = query.filter_by(job_id=job_id)
+    runs = query.order_by(JobRun.started_at.desc(), JobRun.id.desc()).limit(100).all()
+    return render_template(
+        "admin/job_runs.html",
+        summaries=job_summaries(days=7),
+        runs=runs,
+        job_id=job_id,
+    )
+
+
 @admin_bp.route("/push/test", methods=["POST"])
 @hausmeister_required
 def test_push():
@@ -133,7 +161,7 @@ def test_push():
     Erwartet JSON: {"user_id": int, "title": str, "body": str}
     """
     from ..models.push_subscription import PushSubscription
-    from ..services.push_service import send_push_to_user
+    from ..services.outbox_service import enqueue_push
 
     data = request.get_json()
     if not data:
@@ -157,9 +185,7 @@ def test_push():
     if not user.push_notifications_enabled:
         return jsonify({"error": f"{user.username} hat Push-Benachrichtigungen deaktiviert."}), 400
 
-    try:
-        send_push_to_user(user, title, body)
-    except Exception as exc:
-        return jsonify({"error": f"Sendefehler: {exc}"}), 500
+    enqueue_push(user, title, body)
+    db.session.commit()
 
-    return jsonify({"success": True, "message": f"Push an {user.username} gesendet ({sub_count} Gerät(e))."})
+    return jsonify({"success": True, "message": f"Push an {user.username} eingereiht ({sub_count} Gerät(e))."})
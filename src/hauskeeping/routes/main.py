@@ -4,6 +4,7 @@ from flask import Blueprint, jsonify, render_template, request, send_from_direct
 from flask_login import current_user, login_required
 
 from ..models.task import Task
+from ..services.recurrence import expand_recurrences
 
 main_bp = Blueprint("main", __name__)
 
@@ -49,7 +50,8 @@ def dashboard():
     """
     Kalender-Dashboard als Hauptseite.
 
-    Zeigt die Wochenansicht mit allen Aufgaben der aktuellen Woche.
+    Zeigt die Wochenansicht mit allen Aufgaben der aktuellen Woche,
+    inklusive noch nicht gespeicherter Vorkommen wiederkehrender Aufgaben.
     Per Query-Parameter ``week_offset`` kann zwischen Wochen navigiert werden.
     """
     week_offset = request.args.get("week_offset", 0, type=int)
@@ -61,9 +63,13 @@ def dashboard():
 
     tasks = (
         Task.query.filter(Task.due_date >= monday, Task.due_date <= sunday)
+        .options(*Task.display_options())
         .order_by(Task.due_date)
         .all()
     )
+    # Noch nicht gespeicherte Vorkommen wiederkehrender Aufgaben (v.a.
+    # Wochen nach dem Spawn-Horizont) werden berechnet
+    tasks += expand_recurrences(monday, sunday)
 
     # Aufgaben nach Wochentag gruppieren
     days = []
@@ -0,0 +1,15 @@
+from flask import Blueprint, Response, abort
+from flask_login import current_user, login_required
+
+from ..metrics import render_prometheus
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics")
+@login_required
+def metrics():
+    """Request-Metriken im Prometheus-Textformat (nur fuer Hausmeister)."""
+    if not current_user.is_hausmeister:
+        abort(403)
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -128,6 +128,8 @@ def push_subscribe():
         existing.p256dh = p256dh
         existing.auth = auth
         existing.platform = platform
+        # Neu registriert: bisherige Fehlversuche zaehlen nicht mehr
+        existing.failure_count = 0
     else:
         sub = PushSubscription(
             user_id=current_user.id,
@@ -1,13 +1,33 @@
 import logging
-from datetime import datetime, timezone
-
-from flask import Blueprint, flash, redirect, render_template, request, url_for
+from datetime import datetime, timedelta, timezone
+
+from flask import (
+    Blueprint,
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import current_user, login_required
+from sqlalchemy import and_, or_
 
 from ..extensions import db
 from ..models.task import Task, TaskCategory
 from ..models.user import User
-from ..services.push_service import send_push_to_user
+from ..services.outbox_service import enqueue_push
+from ..services.recurrence import (
+    VirtualTask,
+    expand_recurrences,
+    find_occurrence,
+    is_occurrence,
+    materialize_occurrence,
+    validate_rule,
+)
+from ..services.stats_service import clear_category_stats, record_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -18,24 +38,209 @@ tasks_bp = Blueprint("tasks", __name__, url_prefix="/tasks")
 @login_required
 def task_list():
     """
-    Listet alle Aufgaben auf, sortiert nach Faelligkeitsdatum.
+    Listet Aufgaben seitenweise auf, sortiert nach Faelligkeitsdatum.
+
+    Unterstuetzt Filterung nach Status (``show``: all, open, done),
+    zugewiesenem User (``assignee``), Kategorie (``category``), Zeitraum
+    (``date_from``, ``date_to``) und Ueberfaelligkeit (``overdue=1``).
+    Gepaginiert wird per Keyset-Cursor (``cursor``) auf
+    ``(due_date, id)``, sodass jede Seite unabhaengig von der Gesamtzahl
+    der Aufgaben gleich schnell geladen wird. Noch nicht gespeicherte
+    Vorkommen wiederkehrender Aufgaben werden virtuell eingemischt.
+    """
+    filters = _parse_task_filters(request.args)
+    tasks, next_cursor = _task_page(filters)
+
+    users = User.query.order_by(User.username).all()
+    categories = TaskCategory.query.order_by(TaskCategory.position).all()
+    return render_template(
+        "tasks/list.html",
+        tasks=tasks,
+        show=filters["show"],
+        filters=filters,
+        filter_args=_filter_args(request.args),
+        next_cursor=next_cursor,
+        users=users,
+        categories=categories,
+    )
+
+
+@tasks_bp.route("/api")
+@login_required
+def task_list_json():
+    """
+    JSON-Variante der Aufgabenliste mit denselben Filtern und Cursorn.
+
+    :return: ``{"tasks": [...], "next_cursor": str | None}``
+    """
+    filters = _parse_task_filters(request.args)
+    tasks, next_cursor = _task_page(filters)
+    return jsonify(
+        {
+            "tasks": [_task_to_dict(task) for task in tasks],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+_FILTER_PARAMS = ("show", "assignee", "category", "date_from", "date_to", "overdue")
+
+
+def _parse_task_filters(args):
+    """Liest die Filter der Aufgabenliste aus den Query-Parametern."""
+    show = args.get("show", "open")
+    if show not in ("open", "done", "all"):
+        show = "open"
+
+    cursor = None
+    raw_cursor = args.get("cursor", "")
+    if raw_cursor:
+        date_str, _, id_str = raw_cursor.partition("_")
+        due_date = _parse_date(date_str)
+        if due_date and id_str.isdigit():
+            cursor = (due_date, int(id_str))
+
+    return {
+        "show": show,
+        "assignee": args.get("assignee", type=int),
+        "category": args.get("category", type=int),
+        "date_from": _parse_date(args.get("date_from", "")),
+        "date_to": _parse_date(args.get("date_to", "")),
+        "overdue": args.get("overdue") == "1",
+        "cursor": cursor,
+    }
+
+
+def _filter_args(args):
+    """Gesetzte Filter-Parameter fuer Links auf Folgeseiten."""
+    return {key: args[key] for key in _FILTER_PARAMS if args.get(key)}
 
-    Unterstuetzt Filterung nach Status (``show``: all, open, done).
+
+def _parse_date(value):
+    """Parst ein ISO-Datum, liefert None bei leeren oder ungueltigen Werten."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _task_page(filters):
     """
-    show = request.args.get("show", "open")
+    Laedt eine Seite der gefilterten Aufgabenliste.
 
+    :return: Tupel aus Aufgaben der Seite und Cursor der Folgeseite (oder None)
+    """
+    page_size = current_app.config["TASKS_PAGE_SIZE"]
     query = Task.query
-    if show == "open":
-        query = query.filter_by(is_done=False)
-    elif show == "done":
-        query = query.filter_by(is_done=True)
 
-    tasks = query.order_by(Task.due_date).all()
-    categories = TaskCategory.query.order_by(TaskCategory.position).all()
-    return render_template(
-        "tasks/list.html", tasks=tasks, show=show, categories=categories
+    if filters["show"] == "open":
+        query = query.filter(Task.is_done == False)  # noqa: E712
+    elif filters["show"] == "done":
+        query = query.filter(Task.is_done == True)  # noqa: E712
+    if filters["assignee"]:
+        query = query.filter(Task.assigned_to == filters["assignee"])
+    if filters["category"]:
+        query = query.filter(Task.category_id == filters["category"])
+    if filters["date_from"]:
+        query = query.filter(Task.due_date >= filters["date_from"])
+    if filters["date_to"]:
+        query = query.filter(Task.due_date <= filters["date_to"])
+    if filters["overdue"]:
+        query = query.filter(
+            Task.is_done == False,  # noqa: E712
+            Task.due_date < datetime.now(timezone.utc).date(),
+        )
+
+    if filters["cursor"]:
+        cursor_date, cursor_id = filters["cursor"]
+        query = query.filter(
+            or_(
+                Task.due_date > cursor_date,
+                and_(Task.due_date == cursor_date, Task.id > cursor_id),
+            )
+        )
+
+    tasks = (
+        query.options(*Task.display_options(completer=filters["show"] != "open"))
+        .order_by(Task.due_date, Task.id)
+        .limit(page_size + 1)
+        .all()
     )
 
+    next_cursor = None
+    if len(tasks) > page_size:
+        tasks = tasks[:page_size]
+        last = tasks[-1]
+        next_cursor = f"{last.due_date.isoformat()}_{last.id}"
+
+    if filters["show"] != "done" and not filters["overdue"]:
+        tasks = _merge_virtual_tasks(filters, tasks, next_cursor)
+    return tasks, next_cursor
+
+
+def _merge_virtual_tasks(filters, tasks, next_cursor):
+    """
+    Mischt virtuelle Vorkommen in eine Seite der Aufgabenliste.
+
+    Eine Seite deckt die Tage nach dem Cursor bis zum Datum der letzten
+    gespeicherten Aufgabe ab; die letzte Seite reicht bis ``date_to`` bzw.
+    ``RECURRENCE_VIRTUAL_WEEKS`` Wochen in die Zukunft. Virtuelle Vorkommen
+    am Cursor-Datum sind daher bereits auf der vorherigen Seite enthalten.
+    """
+    today = datetime.now(timezone.utc).date()
+    start = filters["date_from"] or today
+    if filters["cursor"]:
+        start = max(start, filters["cursor"][0] + timedelta(days=1))
+    if next_cursor:
+        end = tasks[-1].due_date
+    else:
+        end = filters["date_to"] or today + timedelta(
+            weeks=current_app.config["RECURRENCE_VIRTUAL_WEEKS"]
+        )
+
+    virtual = expand_recurrences(
+        start, end, assignee=filters["assignee"], category=filters["category"]
+    )
+    if not virtual:
+        return tasks
+    return sorted(
+        tasks + virtual, key=lambda task: (task.due_date, task.id or 0, task.is_virtual)
+    )
+
+
+def _task_to_dict(task):
+    """Serialisiert eine Aufgabe fuer die JSON-API."""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "due_date": task.due_date.isoformat(),
+        "is_done": bool(task.is_done),
+        "is_overdue": task.is_overdue,
+        "category": (
+            {
+                "id": task.category.id,
+                "name": task.category.name,
+                "color": task.category.color,
+            }
+            if task.category
+            else None
+        ),
+        "assigned_to": (
+            {"id": task.assignee.id, "username": task.assignee.username}
+            if task.assignee
+            else None
+        ),
+        "completed_by": (
+            {"id": task.completer.id, "username": task.completer.username}
+            if task.completer
+            else None
+        ),
+        "recurrence_rule": task.recurrence_rule,
+        "parent_task_id": task.parent_task_id,
+        "is_virtual": task.is_virtual,
+    }
+
 
 @tasks_bp.route("/create", methods=["GET", "POST"])
 @login_required
@@ -55,7 +260,7 @@ def create():
         due_date_str = request.form.get("due_date", "")
         category_id = request.form.get("category_id", type=int) or None
         assigned_to = request.form.get("assigned_to", type=int) or None
-        recurrence_rule = request.form.get("recurrence_rule", "").strip() or None
+        recurrence_rule = _recurrence_rule_from_form()
 
         if not title:
             flash("Titel ist erforderlich.", "danger")
@@ -63,6 +268,13 @@ def create():
                 "tasks/create.html", users=users, categories=categories
             )
 
+        error = recurrence_rule and validate_rule(recurrence_rule)
+        if error:
+            flash(f"Ungueltige Wiederholungsregel: {error}", "danger")
+            return render_template(
+                "tasks/create.html", users=users, categories=categories
+            )
+
         try:
             due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
         except ValueError:
@@ -81,21 +293,25 @@ def create():
             recurrence_rule=recurrence_rule,
         )
         db.session.add(task)
-        db.session.commit()
+        record_tasks([task])
+        if recurrence_rule:
+            _spawn_template(task)
 
-        # Push an zugewiesenen User (wenn nicht selbst zugewiesen)
+        # Push an zugewiesenen User (wenn nicht selbst zugewiesen). Wird in
+        # derselben Transaktion in die Outbox eingetragen und asynchron
+        # zugestellt.
         if assigned_to and assigned_to != current_user.id:
-            try:
-                formatted_date = due_date.strftime("%d.%m.%Y")
-                send_push_to_user(
-                    assigned_to,
-                    "Neue Aufgabe",
-                    f"{current_user.username} hat eine Aufgabe fuer den "
-                    f"{formatted_date} hinzugefuegt: {title}",
-                    url="/tasks",
-                )
-            except Exception:
-                logger.exception("Push-Benachrichtigung fuer neue Aufgabe fehlgeschlagen.")
+            db.session.flush()
+            formatted_date = due_date.strftime("%d.%m.%Y")
+            enqueue_push(
+                assigned_to,
+                "Neue Aufgabe",
+                f"{current_user.username} hat eine Aufgabe fuer den "
+                f"{formatted_date} hinzugefuegt: {title}",
+                url="/tasks",
+                idempotency_key=f"task-created:{task.id}",
+            )
+        db.session.commit()
 
         flash("Aufgabe erstellt.", "success")
         return redirect(url_for("tasks.task_list"))
@@ -112,19 +328,46 @@ def edit(task_id):
     :param task_id: ID der zu bearbeitenden Aufgabe
     :type task_id: int
     """
-    task = db.get_or_404(Task, task_id)
+    return _edit_task(db.get_or_404(Task, task_id))
+
+
+@tasks_bp.route("/recurring/<int:template_id>/<due_date>/edit", methods=["GET", "POST"])
+@login_required
+def edit_occurrence(template_id, due_date):
+    """
+    Bearbeitet ein Vorkommen einer wiederkehrenden Aufgabe.
+
+    Ist das Vorkommen noch virtuell, wird es erst beim Speichern als
+    Aufgabe angelegt.
+
+    :param template_id: ID des Templates
+    :type template_id: int
+    :param due_date: Datum des Vorkommens (ISO-Format)
+    :type due_date: str
+    """
+    template, occ_date = _get_occurrence_or_404(template_id, due_date)
+    if request.method == "POST":
+        task = materialize_occurrence(template, occ_date)
+    else:
+        task = find_occurrence(template, occ_date) or VirtualTask(template, occ_date)
+    return _edit_task(task)
+
+
+def _edit_task(task):
+    """Zeigt das Bearbeitungsformular an bzw. speichert die Aenderungen."""
     users = User.query.order_by(User.username).all()
     categories = TaskCategory.query.order_by(TaskCategory.position).all()
 
     if request.method == "POST":
+        previous_rule = task.recurrence_rule
+        # Alten Stand aus der Statistik austragen (Rollback bei Fehlern)
+        record_tasks([task], sign=-1)
         task.title = request.form.get("title", "").strip()
         task.description = request.form.get("description", "").strip() or None
         due_date_str = request.form.get("due_date", "")
         task.category_id = request.form.get("category_id", type=int) or None
         task.assigned_to = request.form.get("assigned_to", type=int) or None
-        task.recurrence_rule = (
-            request.form.get("recurrence_rule", "").strip() or None
-        )
+        task.recurrence_rule = _recurrence_rule_from_form()
 
         if not task.title:
             flash("Titel ist erforderlich.", "danger")
@@ -132,6 +375,13 @@ def edit(task_id):
                 "tasks/edit.html", task=task, users=users, categories=categories
             )
 
+        error = task.recurrence_rule and validate_rule(task.recurrence_rule)
+        if error:
+            flash(f"Ungueltige Wiederholungsregel: {error}", "danger")
+            return render_template(
+                "tasks/edit.html", task=task, users=users, categories=categories
+            )
+
         try:
             task.due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
         except ValueError:
@@ -140,6 +390,11 @@ def edit(task_id):
                 "tasks/edit.html", task=task, users=users, categories=categories
             )
 
+        record_tasks([task])
+        # Template geaendert: kuenftige offene Instanzen nach dem neuen Stand
+        # bis zum Spawn-Horizont neu anlegen
+        if task.parent_task_id is None and (task.recurrence_rule or previous_rule):
+            _spawn_template(task)
         db.session.commit()
         flash("Aufgabe aktualisiert.", "success")
         return redirect(url_for("tasks.task_list"))
@@ -149,6 +404,19 @@ def edit(task_id):
     )
 
 
+def _spawn_template(template):
+    """Gleicht die Instanzen eines Templates fuer verarbeitete Wochen ab."""
+    from ..scheduler import spawn_template
+
+    spawn_template(template)
+
+
+def _recurrence_rule_from_form():
+    """Wiederholungsregel aus dem Formular; eine eigene Regel hat Vorrang."""
+    custom = request.form.get("recurrence_custom", "").strip()
+    return custom or request.form.get("recurrence_rule", "").strip() or None
+
+
 @tasks_bp.route("/<int:task_id>/toggle", methods=["POST"])
 @login_required
 def toggle(task_id):
@@ -158,7 +426,37 @@ def toggle(task_id):
     :param task_id: ID der Aufgabe
     :type task_id: int
     """
-    task = db.get_or_404(Task, task_id)
+    return _toggle_task(db.get_or_404(Task, task_id))
+
+
+@tasks_bp.route("/recurring/<int:template_id>/<due_date>/toggle", methods=["POST"])
+@login_required
+def toggle_occurrence(template_id, due_date):
+    """
+    Markiert ein Vorkommen einer wiederkehrenden Aufgabe als erledigt oder
+    offen und legt es dafuer bei Bedarf als Aufgabe an.
+
+    :param template_id: ID des Templates
+    :type template_id: int
+    :param due_date: Datum des Vorkommens (ISO-Format)
+    :type due_date: str
+    """
+    template, occ_date = _get_occurrence_or_404(template_id, due_date)
+    return _toggle_task(materialize_occurrence(template, occ_date))
+
+
+def _get_occurrence_or_404(template_id, due_date):
+    """Laedt Template und Datum eines Vorkommens, 404 bei ungueltigen Angaben."""
+    template = db.get_or_404(Task, template_id)
+    occ_date = _parse_date(due_date)
+    if occ_date is None or not is_occurrence(template, occ_date):
+        abort(404)
+    return template, occ_date
+
+
+def _toggle_task(task):
+    """Kehrt den Erledigt-Status einer Aufgabe um und committet."""
+    record_tasks([task], sign=-1)
     task.is_done = not task.is_done
     if task.is_done:
         task.completed_by = current_user.id
@@ -166,6 +464,7 @@ def toggle(task_id):
     else:
         task.completed_by = None
         task.completed_at = None
+    record_tasks([task])
     db.session.commit()
 
     status = "erledigt" if task.is_done else "offen"
@@ -183,6 +482,7 @@ def delete(task_id):
     :type task_id: int
     """
     task = db.get_or_404(Task, task_id)
+    record_tasks([task], sign=-1)
     db.session.delete(task)
     db.session.commit()
 
@@ -268,6 +568,7 @@ def delete_category(category_id):
     category = db.get_or_404(TaskCategory, category_id)
 
     Task.query.filter_by(category_id=category.id).update({"category_id": None})
+    clear_category_stats(category.id)
 
     db.session.delete(category)
     db.session.commit()
@@ -1,10 +1,11 @@
 import atexit
-import calendar
+import functools
 import logging
+import threading
 from datetime import date, datetime, timedelta, timezone
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy import or_, update
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,9 @@ def init_scheduler(app):
     """
     Initialisiert den APScheduler mit allen geplanten Jobs.
 
+    Jeder Job laeuft ueber :func:`_leased`, sodass bei mehreren Prozessen
+    (z.B. Gunicorn-Worker) nur einer einen Lauf ausfuehrt.
+
     Muss innerhalb von ``create_app()`` aufgerufen werden.
     """
     if scheduler.running:
@@ -25,7 +29,7 @@ def init_scheduler(app):
     # Job 1: Woechentliche E-Mail-Zusammenfassung
     # Laeuft taeglich um 07:00 UTC – die Funktion selbst filtert nach Wochentag.
     scheduler.add_job(
-        func=_run_weekly_email_summary,
+        func=_leased("weekly_email_summary", _run_weekly_email_summary),
         trigger="cron",
         hour=7,
         minute=0,
@@ -36,7 +40,7 @@ def init_scheduler(app):
 
     # Job 2: Push fuer heute faellige Aufgaben – taeglich um 08:00 UTC
     scheduler.add_job(
-        func=_run_due_today_push,
+        func=_leased("due_today_push", _run_due_today_push),
         trigger="cron",
         hour=8,
         minute=0,
@@ -47,7 +51,7 @@ def init_scheduler(app):
 
     # Job 3: Push-Erinnerung fuer ueberfaellige Aufgaben – taeglich um 09:00 UTC
     scheduler.add_job(
-        func=_run_overdue_push,
+        func=_leased("overdue_push", _run_overdue_push),
         trigger="cron",
         hour=9,
         minute=0,
@@ -56,11 +60,12 @@ def init_scheduler(app):
         kwargs={"app": app},
     )
 
-    # Job 4: Wiederkehrende Aufgaben fuer die aktuelle Woche erzeugen.
-    # Laeuft taeglich um 00:01 UTC.  Die Funktion ist idempotent (State-Check),
-    # d.h. sie tut nichts, wenn die Woche schon verarbeitet wurde.
+    # Job 4: Wiederkehrende Aufgaben fuer die aktuelle Woche und die naechsten
+    # RECURRENCE_LOOKAHEAD_WEEKS Wochen erzeugen. Laeuft taeglich um 00:01 UTC.
+    # Die Funktion ist idempotent (State-Check), d.h. sie tut nichts, wenn
+    # alle Wochen bis zum Horizont schon verarbeitet wurden.
     scheduler.add_job(
-        func=_run_recurrence_spawn,
+        func=_leased("recurrence_spawn", _run_recurrence_spawn),
         trigger="cron",
         hour=0,
         minute=1,
@@ -69,13 +74,177 @@ def init_scheduler(app):
         kwargs={"app": app},
     )
 
+    # Job 5: Push-Outbox zustellen – alle PUSH_OUTBOX_INTERVAL Sekunden
+    scheduler.add_job(
+        func=_leased("push_outbox", _run_push_outbox, release=True),
+        trigger="interval",
+        seconds=app.config["PUSH_OUTBOX_INTERVAL"],
+        id="push_outbox",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        kwargs={"app": app},
+    )
+
+    # Job 6: Abgeschlossene Outbox-Eintraege und alte Job-Laeufe aufraeumen –
+    # taeglich um 03:30 UTC
+    scheduler.add_job(
+        func=_leased("push_outbox_purge", _run_push_outbox_purge),
+        trigger="cron",
+        hour=3,
+        minute=30,
+        id="push_outbox_purge",
+        replace_existing=True,
+        kwargs={"app": app},
+    )
+
+    # Job 7: Nicht mehr erreichbare Push-Subscriptions entfernen – taeglich
+    # um 03:45 UTC
+    scheduler.add_job(
+        func=_leased("push_subscription_sweep", _run_push_subscription_sweep),
+        trigger="cron",
+        hour=3,
+        minute=45,
+        id="push_subscription_sweep",
+        replace_existing=True,
+        kwargs={"app": app},
+    )
+
     scheduler.start()
     logger.info("APScheduler gestartet mit %d Jobs.", len(scheduler.get_jobs()))
 
     # Direkt beim Startup ausfuehren: behandelt den Downtime-Fall.
     # War die App am Montag nicht aktiv, wird der Spawn beim naechsten
-    # Start sofort nachgeholt.
-    _run_recurrence_spawn(app)
+    # Start sofort nachgeholt – im Hintergrund, damit der Start (und der
+    # erste Request) nicht darauf wartet.
+    threading.Thread(
+        target=_run_recurrence_spawn,
+        args=(app,),
+        name="recurrence-spawn-startup",
+        daemon=True,
+    ).start()
+
+
+def _schema_ready(app):
+    """
+    Prueft einmal pro Prozess, ob das Datenbankschema vollstaendig ist.
+
+    Vergleicht die Alembic-Revision der Datenbank mit dem Head der
+    Migrationen. Ohne Alembic-Stand (z.B. nach ``flask init-db``) oder ohne
+    Migrations-Verzeichnis wird stattdessen geprueft, ob die benoetigten
+    Tabellen existieren. Nur ein positives Ergebnis wird gecacht, sodass
+    nachtraeglich ausgefuehrte Migrationen ohne Neustart erkannt werden.
+    Muss innerhalb eines App-Kontexts aufgerufen werden.
+
+    :return: True, wenn die Jobs auf das Schema zugreifen koennen
+    :rtype: bool
+    """
+    if app.extensions.get("hauskeeping_schema_ready"):
+        return True
+
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from alembic.util import CommandError
+    from sqlalchemy import inspect as sa_inspect
+
+    from .extensions import db
+
+    heads = None
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+        if current:
+            try:
+                # Flask-Migrate ist nur unter der Flask-CLI registriert
+                migrate = app.extensions.get("migrate")
+                directory = migrate.directory if migrate else "migrations"
+                heads = set(ScriptDirectory(directory).get_heads())
+            except CommandError:
+                pass
+            if heads is not None and current != heads:
+                logger.info(
+                    "Schema nicht aktuell (Revision %s, erwartet %s) – Migration "
+                    "ausstehend?",
+                    ", ".join(sorted(current)),
+                    ", ".join(sorted(heads)),
+                )
+                return False
+
+        if heads is None:
+            inspector = sa_inspect(connection)
+            if not inspector.has_table("app_state") or not inspector.has_table("tasks"):
+                return False
+
+    app.extensions["hauskeeping_schema_ready"] = True
+    return True
+
+
+def _leased(job_id, func, release=False):
+    """
+    Verpackt einen Job so, dass pro Lauf nur ein Prozess ihn ausfuehrt.
+
+    Vor dem Lauf wird der Lease ``job_id`` fuer ``SCHEDULER_LEASE_SECONDS``
+    beansprucht (siehe :func:`~hauskeeping.services.job_lease.acquire_lease`);
+    haelt ihn ein anderer Prozess, wird der Lauf ohne weitere Arbeit
+    uebersprungen. Cron-Jobs behalten den Lease bis zum Ablauf, damit
+    Prozesse, die denselben Zeitpunkt etwas spaeter ausloesen, nicht erneut
+    laufen. Intervall-Jobs geben ihn mit ``release=True`` direkt nach dem
+    Lauf wieder frei.
+
+    Jeder Lauf wird in ``job_runs`` protokolliert (siehe
+    :func:`~hauskeeping.services.job_runs.track_job_run`). Bei Intervall-Jobs
+    werden nur Laeufe gespeichert, die etwas verarbeitet haben, sonst
+    entstuende alle paar Sekunden ein Eintrag pro Prozess. Mit
+    ``MEMORY_PROFILING`` wird jeder Lauf zusaetzlich mit tracemalloc
+    profiliert (siehe :mod:`hauskeeping.memory_profiling`).
+
+    :param job_id: ID des Jobs, zugleich Name des Leases
+    :param func: Job-Funktion mit dem Parameter ``app``
+    :param release: Lease nach dem Lauf sofort freigeben
+    :return: Job-Funktion mit dem Parameter ``app``
+    """
+
+    @functools.wraps(func)
+    def run(app):
+        from .memory_profiling import job_memory_profile
+        from .metrics import job_scope
+        from .services.job_lease import acquire_lease, release_lease
+        from .services.job_runs import save_job_run, track_job_run
+
+        started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        with app.app_context():
+            try:
+                token = acquire_lease(job_id, app.config["SCHEDULER_LEASE_SECONDS"])
+            except Exception:
+                logger.exception(
+                    "Lease fuer Job %s konnte nicht geprueft werden.", job_id
+                )
+                return
+        if token is None:
+            logger.debug(
+                "Job %s uebersprungen: Lease von anderem Prozess gehalten.", job_id
+            )
+            if not release:
+                save_job_run(app, job_id, started_at, 0, "skipped")
+            return
+
+        try:
+            with (
+                job_scope(job_id),
+                track_job_run(app, job_id, record_idle=not release),
+                job_memory_profile(app, job_id),
+            ):
+                func(app)
+        finally:
+            if release:
+                with app.app_context():
+                    try:
+                        release_lease(job_id, token)
+                    except Exception:
+                        logger.exception(
+                            "Lease fuer Job %s konnte nicht freigegeben werden.", job_id
+                        )
+
+    return run
 
 
 # ---------------------------------------------------------------------------
@@ -84,160 +253,296 @@ def init_scheduler(app):
 
 def _run_recurrence_spawn(app):
     """
-    Erzeugt wiederkehrende Aufgaben fuer die aktuelle Woche, sofern noch
+    Erzeugt wiederkehrende Aufgaben bis zum Spawn-Horizont, sofern noch
     nicht geschehen.
 
-    Idempotent und Race-Condition-sicher: Die Woche wird zuerst atomar via
+    Der Horizont ist die aktuelle Woche plus ``RECURRENCE_LOOKAHEAD_WEEKS``
+    Wochen, damit auch die Navigation in kommende Wochen ohne weitere
+    Arbeit alle Aufgaben zeigt.
+
+    Idempotent und Race-Condition-sicher: Die Wochen werden zuerst atomar via
     bedingtem UPDATE/INSERT in der app_state-Tabelle beansprucht (commit),
     bevor Tasks erstellt werden. Laufen mehrere Prozesse (z.B. Gunicorn-Worker)
     gleichzeitig, bekommt nur einer rowcount=1 zurueck – alle anderen beenden
     die Funktion fruehzeitig ohne Duplikate zu erzeugen.
 
-    Downtime-sicher: Beim Startup wird sie sofort ausgefuehrt, sodass
-    ein verpasster Montag beim naechsten App-Start aufgeholt wird.
+    Downtime-sicher: Beim Startup wird sie sofort ausgefuehrt. Alle Wochen
+    seit dem letzten Lauf werden in einer Transaktion nachgeholt.
     """
     with app.app_context():
-        from sqlalchemy import inspect as sa_inspect
-
         from .extensions import db
         from .models.app_state import AppState
         from .models.task import Task
+        from .services.job_runs import record_job_counts
 
         # Migrationen noch nicht vollstaendig? Tabellen koennen noch fehlen.
-        inspector = sa_inspect(db.engine)
-        if not inspector.has_table("app_state") or not inspector.has_table("tasks"):
+        if not _schema_ready(app):
             logger.info(
-                "Recurrence-Spawn uebersprungen: Tabellen noch nicht vorhanden "
+                "Recurrence-Spawn uebersprungen: Schema noch nicht bereit "
                 "(Migration ausstehend?)."
             )
             return
 
         today = date.today()
         monday = today - timedelta(days=today.weekday())
-        monday_str = str(monday)
+        horizon = monday + timedelta(weeks=app.config["RECURRENCE_LOOKAHEAD_WEEKS"])
+        horizon_str = str(horizon)
 
         # --- Atomisches "Claim-First"-Pattern ---
-        # Schritt 1: Versuche den vorhandenen Eintrag bedingt zu aktualisieren.
+        # Der Marker enthaelt den Montag der letzten bereits erzeugten Woche.
         # ISO-Datumsstrings sortieren lexikografisch identisch zu chronologisch,
         # daher ist der String-Vergleich korrekt.
-        # Der UPDATE ist auf Datenbankebene atomar (Row-Level-Lock bei PostgreSQL,
-        # File-Lock bei SQLite), sodass bei mehreren gleichzeitigen Prozessen nur
-        # einer rowcount=1 zurueckbekommt.
-        result = db.session.execute(
-            update(AppState)
-            .where(AppState.key == "last_recurrence_monday")
-            .where(AppState.value < monday_str)
-            .values(value=monday_str)
-        )
-        db.session.commit()
-
-        if result.rowcount == 0:
-            # Entweder existiert noch kein Eintrag (erste Ausfuehrung ueberhaupt)
-            # oder die Woche ist bereits verarbeitet.
-            state = db.session.get(AppState, "last_recurrence_monday")
-            if state is None:
-                # Schritt 2a: Ersten Eintrag anlegen – bei konkurrierenden
-                # Prozessen schlaegt der zweite INSERT mit IntegrityError fehl.
-                try:
-                    db.session.add(AppState(key="last_recurrence_monday", value=monday_str))
-                    db.session.commit()
-                except IntegrityError:
-                    db.session.rollback()
-                    logger.info(
-                        "Recurrence-Spawn uebersprungen: Woche %s bereits von "
-                        "einem anderen Prozess beansprucht.",
-                        monday_str,
-                    )
-                    return
-            else:
-                # Schritt 2b: Eintrag existiert und ist bereits >= monday.
-                logger.debug(
-                    "Recurrence-Spawn uebersprungen: Woche %s bereits verarbeitet.",
-                    monday_str,
+        state = db.session.get(AppState, "last_recurrence_monday")
+        if state is None:
+            # Erste Ausfuehrung ueberhaupt: Ersten Eintrag anlegen – bei
+            # konkurrierenden Prozessen schlaegt der zweite INSERT mit
+            # IntegrityError fehl.
+            first_monday = monday
+            try:
+                db.session.add(
+                    AppState(key="last_recurrence_monday", value=horizon_str)
+                )
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                logger.info(
+                    "Recurrence-Spawn uebersprungen: Wochen bis %s bereits von "
+                    "einem anderen Prozess beansprucht.",
+                    horizon_str,
+                )
+                return
+        elif state.value >= horizon_str:
+            logger.debug(
+                "Recurrence-Spawn uebersprungen: Wochen bis %s bereits verarbeitet.",
+                horizon_str,
+            )
+            return
+        else:
+            # Compare-and-Swap: Der UPDATE greift nur, wenn der Marker noch
+            # unveraendert ist. Er ist auf Datenbankebene atomar (Row-Level-Lock
+            # bei PostgreSQL, File-Lock bei SQLite), sodass bei mehreren
+            # gleichzeitigen Prozessen nur einer rowcount=1 zurueckbekommt.
+            previous = state.value
+            result = db.session.execute(
+                update(AppState)
+                .where(AppState.key == "last_recurrence_monday")
+                .where(AppState.value == previous)
+                .values(value=horizon_str)
+            )
+            db.session.commit()
+            if result.rowcount == 0:
+                logger.info(
+                    "Recurrence-Spawn uebersprungen: Wochen bis %s bereits von "
+                    "einem anderen Prozess beansprucht.",
+                    horizon_str,
                 )
                 return
 
-        # Ab hier hat exklusiv dieser Prozess die Woche beansprucht.
-        logger.info("Recurrence-Spawn gestartet fuer Woche ab %s.", monday_str)
+            # Alle Wochen seit dem Marker nachholen (Downtime), begrenzt auf
+            # RECURRENCE_MAX_CATCHUP_WEEKS in die Vergangenheit.
+            first_monday = date.fromisoformat(previous) + timedelta(weeks=1)
+            earliest = monday - timedelta(
+                weeks=app.config["RECURRENCE_MAX_CATCHUP_WEEKS"]
+            )
+            if first_monday < earliest:
+                logger.warning(
+                    "Recurrence-Spawn: Letzter Lauf fuer Woche ab %s, Nachholen "
+                    "wird auf Wochen ab %s begrenzt.",
+                    previous,
+                    earliest,
+                )
+                first_monday = earliest
 
-        # Alle Template-Tasks: haben recurrence_rule, aber keinen parent
-        templates = Task.query.filter(
-            Task.recurrence_rule.isnot(None),
-            Task.parent_task_id.is_(None),
-        ).all()
+        # Ab hier hat exklusiv dieser Prozess die Wochen beansprucht.
+        logger.info(
+            "Recurrence-Spawn gestartet fuer Wochen %s bis %s.",
+            first_monday,
+            horizon_str,
+        )
 
-        for template in templates:
-            for occ_date in _get_week_occurrences(template, monday):
-                # Sicherheits-Duplikat-Check (z.B. falls Template-due_date
-                # mit einem Vorkommen uebereinstimmt)
-                exists = Task.query.filter(
-                    or_(
-                        Task.id == template.id,
-                        Task.parent_task_id == template.id,
-                    ),
-                    Task.due_date == occ_date,
-                ).first()
-
-                if not exists:
-                    new_task = Task(
-                        title=template.title,
-                        description=template.description,
-                        due_date=occ_date,
-                        category_id=template.category_id,
-                        assigned_to=template.assigned_to,
-                        created_by=template.created_by,
-                        recurrence_rule=template.recurrence_rule,
-                        parent_task_id=template.id,
-                    )
-                    db.session.add(new_task)
-                    logger.debug(
-                        "Neue Instanz fuer Template #%d erzeugt: '%s' am %s.",
-                        template.id,
-                        template.title,
-                        occ_date,
-                    )
+        # Alle Template-Tasks: haben recurrence_rule, aber keinen parent.
+        # Als schlanke Rows statt ORM-Objekte geladen (nur lesend benoetigt).
+        templates = db.session.execute(
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.due_date,
+                Task.category_id,
+                Task.assigned_to,
+                Task.created_by,
+                Task.recurrence_rule,
+                Task.spawned_until,
+            ).where(
+                Task.recurrence_rule.isnot(None),
+                Task.parent_task_id.is_(None),
+            )
+        ).all()
 
+        created = _spawn_weeks(templates, first_monday, horizon)
         db.session.commit()
-        logger.info("Recurrence-Spawn abgeschlossen fuer Woche ab %s.", monday_str)
+        record_job_counts(items=created)
+        logger.info(
+            "Recurrence-Spawn abgeschlossen fuer Wochen %s bis %s "
+            "(%d neue Aufgaben).",
+            first_monday,
+            horizon_str,
+            created,
+        )
 
 
-def _get_week_occurrences(template, monday):
+def _spawn_weeks(templates, first_monday, last_monday):
+    """
+    Erzeugt die fehlenden Instanzen aller Templates fuer mehrere Wochen.
+
+    Alle bereits vorhandenen ``(parent_task_id, occurrence_date)``-Paare des
+    Zeitraums werden mit einer einzigen Abfrage geladen, die fehlenden
+    Vorkommen im Speicher bestimmt und per Bulk-``INSERT`` angelegt. Die
+    Anzahl der Datenbank-Roundtrips ist damit unabhaengig von der Anzahl der
+    Templates. Verglichen wird mit dem urspruenglichen Datum des Vorkommens,
+    verschobene Instanzen werden daher nicht erneut angelegt.
+
+    Templates, deren ``spawned_until`` vor ``first_monday`` liegt, werden ab
+    dem Tag danach nachgeholt; anschliessend steht ``spawned_until`` aller
+    Templates mindestens auf dem Sonntag der letzten Woche. Committet nicht.
+
+    :param templates: Template-Tasks bzw. Rows mit deren Spalten
+        (recurrence_rule gesetzt, kein parent)
+    :param first_monday: Montag der ersten zu verarbeitenden Woche (date)
+    :param last_monday: Montag der letzten zu verarbeitenden Woche (date)
+    :return: Anzahl der neu angelegten Aufgaben
+    :rtype: int
     """
-    Gibt die Daten zurueck, an denen ein Template in der angegebenen Woche
-    vorkommen soll.
+    from .extensions import db
+    from .models.task import Task
+    from .services.recurrence import iter_occurrences
+    from .services.stats_service import record_task_rows
+
+    if not templates:
+        return 0
+    sunday = last_monday + timedelta(days=6)
+
+    starts = {}
+    for template in templates:
+        start = first_monday
+        if template.spawned_until is not None and template.spawned_until < start:
+            start = template.spawned_until + timedelta(days=1)
+        starts[template.id] = start
+
+    # Sicherheits-Duplikat-Check: vorhandene Instanzen des Zeitraums sowie die
+    # Templates selbst (falls ihr due_date mit einem Vorkommen uebereinstimmt)
+    existing = set(
+        db.session.execute(
+            select(Task.parent_task_id, Task.occurrence_date).where(
+                Task.parent_task_id.isnot(None),
+                Task.occurrence_date >= min(starts.values()),
+                Task.occurrence_date <= sunday,
+            )
+        ).all()
+    )
+    existing.update((template.id, template.due_date) for template in templates)
 
-    Beruecksichtigt nur Daten >= template.due_date, damit keine Instanzen
-    vor dem urspruenglichen Faelligkeitsdatum erzeugt werden.
+    rows = []
+    for template in templates:
+        for occ_date in iter_occurrences(template, starts[template.id], sunday):
+            if (template.id, occ_date) in existing:
+                continue
+            rows.append(
+                {
+                    "title": template.title,
+                    "description": template.description,
+                    "due_date": occ_date,
+                    "occurrence_date": occ_date,
+                    "category_id": template.category_id,
+                    "assigned_to": template.assigned_to,
+                    "created_by": template.created_by,
+                    "recurrence_rule": template.recurrence_rule,
+                    "parent_task_id": template.id,
+                }
+            )
 
-    :param template: Task-Objekt mit gesetzter recurrence_rule
-    :param monday: Montag der zu verarbeitenden Woche (date)
-    :return: Liste von date-Objekten
-    """
-    occurrences = []
+    if rows:
+        db.session.execute(insert(Task.__table__), rows)
+        record_task_rows(rows)
+    db.session.execute(
+        update(Task)
+        .where(Task.id.in_([template.id for template in templates]))
+        .where(or_(Task.spawned_until.is_(None), Task.spawned_until < sunday))
+        .values(spawned_until=sunday)
+    )
+    return len(rows)
 
-    if template.recurrence_rule == "daily":
-        for i in range(7):
-            d = monday + timedelta(days=i)
-            if d >= template.due_date:
-                occurrences.append(d)
 
-    elif template.recurrence_rule == "weekly":
-        # Gleicher Wochentag wie das Template (0 = Montag, 6 = Sonntag)
-        target_date = monday + timedelta(days=template.due_date.weekday())
-        if target_date >= template.due_date:
-            occurrences.append(target_date)
+def spawn_template(template):
+    """
+    Gleicht die Instanzen eines neuen oder geaenderten Templates ab der
+    aktuellen Woche mit dem Template ab.
+
+    Offene, nicht verschobene Instanzen ab dem aktuellen Montag werden
+    geloescht und fuer die Wochen, die der Recurrence-Spawn bereits
+    verarbeitet hat (bis zum Marker ``last_recurrence_monday``), mit Regel,
+    Titel, Zuweisung usw. des Templates neu angelegt. Erledigte und
+    verschobene Instanzen bleiben erhalten. Ohne Regel werden die Instanzen
+    nur geloescht.
+
+    Der Spawn legt nur Wochen nach dem Marker an; ohne diesen Aufruf
+    fehlten einem neuen Template die Vorkommen bis zum Spawn-Horizont, und
+    ein geaendertes behielte sie nach der alten Regel. Liegt der Marker vor
+    der aktuellen Woche, holt der naechste Spawn-Lauf die Wochen ohnehin
+    nach. Flusht das Template, committet aber nicht.
+
+    :param template: Template-Task (kein parent)
+    :type template: Task
+    :return: Anzahl der neu angelegten Aufgaben
+    :rtype: int
+    """
+    from .extensions import db
+    from .models.app_state import AppState
+    from .models.task import Task
+    from .services.stats_service import record_task_rows
+
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    db.session.flush()
+
+    stale = (
+        db.session.execute(
+            select(
+                Task.id,
+                Task.due_date,
+                Task.is_done,
+                Task.created_by,
+                Task.assigned_to,
+                Task.completed_by,
+                Task.category_id,
+            ).where(
+                Task.parent_task_id == template.id,
+                Task.is_done == False,  # noqa: E712
+                Task.due_date == Task.occurrence_date,
+                Task.occurrence_date >= monday,
+            )
+        )
+        .mappings()
+        .all()
+    )
+    if stale:
+        record_task_rows(stale, sign=-1)
+        db.session.execute(
+            delete(Task).where(Task.id.in_([row["id"] for row in stale]))
+        )
+    # Geloeschte Wochen bis zum Respawn virtuell anzeigen
+    if template.spawned_until is not None and template.spawned_until >= monday:
+        template.spawned_until = monday - timedelta(days=1)
 
-    elif template.recurrence_rule == "monthly":
-        # Gleicher Tag im Monat; bei kuerzeren Monaten wird auf den letzten
-        # gueltigen Tag geklemmt (z.B. 31. -> 28./29. im Februar).
-        target_day = template.due_date.day
-        for i in range(7):
-            d = monday + timedelta(days=i)
-            max_day = calendar.monthrange(d.year, d.month)[1]
-            if d.day == min(target_day, max_day) and d >= template.due_date:
-                occurrences.append(d)
+    state = db.session.get(AppState, "last_recurrence_monday")
+    if not template.recurrence_rule or state is None:
+        return 0
+    marker = date.fromisoformat(state.value)
+    if marker < monday:
+        return 0
 
-    return occurrences
+    db.session.flush()
+    return _spawn_weeks([template], monday, marker)
 
 
 # ---------------------------------------------------------------------------
@@ -247,95 +552,209 @@ def _get_week_occurrences(template, monday):
 def _run_weekly_email_summary(app):
     """Wrapper der den Flask-App-Kontext fuer den Mail-Service bereitstellt."""
     with app.app_context():
+        from .services.job_runs import record_job_counts
         from .services.mail_service import send_weekly_summary
 
         try:
             send_weekly_summary()
         except Exception:
+            record_job_counts(failures=1)
             logger.exception("Fehler beim Senden der woechentlichen Zusammenfassung.")
 
 
+def _load_push_tasks(today, overdue=False):
+    """
+    Laedt die offenen Aufgaben aller Push-Empfaenger mit einer Abfrage.
+
+    Benachrichtigungs-Einstellungen und vorhandene Subscriptions werden per
+    Join bzw. ``EXISTS`` direkt in der Abfrage geprueft, sodass die Anzahl
+    der Roundtrips nicht von der Anzahl der User abhaengt. Muss innerhalb
+    eines App-Kontexts aufgerufen werden.
+
+    :param today: Stichtag
+    :type today: date
+    :param overdue: ``True`` fuer ueberfaellige statt heute faelliger Aufgaben;
+        beruecksichtigt dann zusaetzlich ``overdue_reminders_enabled``
+    :type overdue: bool
+    :return: Aufgabentitel pro User-ID
+    :rtype: dict[int, list[str]]
+    """
+    from .extensions import db
+    from .models.push_subscription import PushSubscription
+    from .models.task import Task
+    from .models.user import User
+
+    has_subscription = (
+        db.session.query(PushSubscription.id)
+        .filter(PushSubscription.user_id == User.id)
+        .exists()
+    )
+    query = (
+        db.session.query(Task.assigned_to, Task.title)
+        .join(User, User.id == Task.assigned_to)
+        .filter(
+            Task.is_done == False,  # noqa: E712
+            User.push_notifications_enabled == True,  # noqa: E712
+            has_subscription,
+        )
+        .order_by(Task.due_date, Task.id)
+    )
+    if overdue:
+        query = query.filter(
+            Task.due_date < today,
+            User.overdue_reminders_enabled == True,  # noqa: E712
+        )
+    else:
+        query = query.filter(Task.due_date == today)
+
+    user_tasks = {}
+    for user_id, title in query:
+        user_tasks.setdefault(user_id, []).append(title)
+    return user_tasks
+
+
 def _run_due_today_push(app):
-    """Sendet Push-Benachrichtigungen fuer heute faellige Aufgaben."""
+    """Reiht Push-Benachrichtigungen fuer heute faellige Aufgaben ein."""
     with app.app_context():
-        from .models.task import Task
-        from .services.push_service import send_push_to_user
+        from .extensions import db
+        from .services.job_runs import record_job_counts
+        from .services.outbox_service import enqueue_pushes
 
         today = datetime.now(timezone.utc).date()
 
-        tasks = (
-            Task.query.filter(
-                Task.due_date == today,
-                Task.is_done == False,  # noqa: E712
-                Task.assigned_to.isnot(None),
-            )
-            .all()
-        )
-
-        user_tasks = {}
-        for task in tasks:
-            user_tasks.setdefault(task.assigned_to, []).append(task)
+        user_tasks = _load_push_tasks(today)
 
+        notifications = []
         for user_id, task_list in user_tasks.items():
             count = len(task_list)
             if count == 1:
                 title = "Aufgabe faellig"
-                body = f"Heute faellig: {task_list[0].title}"
+                body = f"Heute faellig: {task_list[0]}"
             else:
                 title = f"{count} Aufgaben faellig"
-                body = "Heute faellig: " + ", ".join(t.title for t in task_list[:3])
+                body = "Heute faellig: " + ", ".join(task_list[:3])
                 if count > 3:
                     body += f" (+{count - 3} weitere)"
+            notifications.append(
+                (user_id, title, body, "/tasks", f"due-today:{user_id}:{today}")
+            )
 
-            try:
-                send_push_to_user(user_id, title, body, url="/tasks")
-            except Exception:
-                logger.exception(
-                    "Fehler beim Senden der Due-Today-Push an User %d.", user_id
-                )
+        # Zustellung uebernimmt der Outbox-Job; der Schluessel verhindert
+        # doppelte Nachrichten, falls der Job mehrfach laeuft.
+        try:
+            enqueued = enqueue_pushes(notifications)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            record_job_counts(failures=1)
+            logger.exception("Fehler beim Einreihen der Due-Today-Push.")
+            return
+        record_job_counts(
+            items=sum(len(task_list) for task_list in user_tasks.values()),
+            pushes=enqueued,
+        )
 
 
 def _run_overdue_push(app):
-    """Sendet Push-Erinnerungen fuer ueberfaellige Aufgaben."""
+    """Reiht Push-Erinnerungen fuer ueberfaellige Aufgaben ein."""
     with app.app_context():
         from .extensions import db
-        from .models.task import Task
-        from .models.user import User
-        from .services.push_service import send_push_to_user
+        from .services.job_runs import record_job_counts
+        from .services.outbox_service import enqueue_pushes
 
         today = datetime.now(timezone.utc).date()
 
-        tasks = (
-            Task.query.filter(
-                Task.due_date < today,
-                Task.is_done == False,  # noqa: E712
-                Task.assigned_to.isnot(None),
-            )
-            .all()
-        )
-
-        user_tasks = {}
-        for task in tasks:
-            user_tasks.setdefault(task.assigned_to, []).append(task)
+        user_tasks = _load_push_tasks(today, overdue=True)
 
+        notifications = []
         for user_id, task_list in user_tasks.items():
-            user = db.session.get(User, user_id)
-            if not user or not user.overdue_reminders_enabled:
-                continue
-
             count = len(task_list)
             if count == 1:
                 title = "Ueberfaellige Aufgabe"
-                body = f"Ueberfaellig: {task_list[0].title}"
+                body = f"Ueberfaellig: {task_list[0]}"
             else:
                 title = f"{count} ueberfaellige Aufgaben"
-                body = "Ueberfaellig: " + ", ".join(t.title for t in task_list[:3])
+                body = "Ueberfaellig: " + ", ".join(task_list[:3])
                 if count > 3:
                     body += f" (+{count - 3} weitere)"
+            notifications.append(
+                (user_id, title, body, "/tasks", f"overdue:{user_id}:{today}")
+            )
 
-            try:
-                send_push_to_user(user_id, title, body, url="/tasks")
-            except Exception:
-                logger.exception(
-                    "Fehler beim Senden der Overdue-Push an User %d.", user_id
-                )
+        # Zustellung uebernimmt der Outbox-Job
+        try:
+            enqueued = enqueue_pushes(notifications)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            record_job_counts(failures=1)
+            logger.exception("Fehler beim Einreihen der Overdue-Push.")
+            return
+        record_job_counts(
+            items=sum(len(task_list) for task_list in user_tasks.values()),
+            pushes=enqueued,
+        )
+
+
+def _run_push_outbox(app):
+    """Stellt faellige Nachrichten aus der Push-Outbox zu."""
+    with app.app_context():
+        from .services.job_runs import record_job_counts
+        from .services.outbox_service import drain_outbox
+
+        batch_size = app.config["PUSH_OUTBOX_BATCH_SIZE"]
+        try:
+            # Chargenweise abarbeiten, bis keine faelligen Nachrichten mehr
+            # vorliegen (drain_outbox meldet die Zaehler selbst)
+            while drain_outbox(batch_size) == batch_size:
+                pass
+        except Exception:
+            record_job_counts(failures=1)
+            logger.exception("Fehler beim Zustellen der Push-Outbox.")
+
+
+def _run_push_outbox_purge(app):
+    """
+    Loescht abgeschlossene Outbox-Eintraege und alte Job-Laeufe nach der
+    jeweiligen Aufbewahrungsfrist.
+    """
+    with app.app_context():
+        from .services.job_runs import purge_job_runs, record_job_counts
+        from .services.outbox_service import purge_outbox
+
+        try:
+            purged = purge_outbox()
+            logger.info("Push-Outbox: %d alte Eintraege geloescht.", purged)
+            purged_runs = purge_job_runs()
+            logger.info("Job-Protokoll: %d alte Laeufe geloescht.", purged_runs)
+            record_job_counts(items=purged + purged_runs)
+        except Exception:
+            record_job_counts(failures=1)
+            logger.exception("Fehler beim Aufraeumen der Push-Outbox.")
+
+
+def _run_push_subscription_sweep(app):
+    """Entfernt Push-Subscriptions, die seit laengerem nicht erreichbar sind."""
+    with app.app_context():
+        from .services.job_runs import record_job_counts
+        from .services.push_service import prune_stale_subscriptions
+
+        try:
+            pruned = prune_stale_subscriptions()
+            logger.info("Push-Sweep: %d Subscription(s) entfernt.", pruned)
+            record_job_counts(items=pruned)
+        except Exception:
+            record_job_counts(failures=1)
+            logger.exception("Fehler beim Entfernen alter Push-Subscriptions.")
+
+
+# Job-Funktionen nach Job-ID (z.B. fuer ``flask profile-job``)
+JOBS = {
+    "weekly_email_summary": _run_weekly_email_summary,
+    "due_today_push": _run_due_today_push,
+    "overdue_push": _run_overdue_push,
+    "recurrence_spawn": _run_recurrence_spawn,
+    "push_outbox": _run_push_outbox,
+    "push_outbox_purge": _run_push_outbox_purge,
+    "push_subscription_sweep": _run_push_subscription_sweep,
+}
@@ -1,8 +1,22 @@
-from .mail_service import send_weekly_summary
-from .push_service import send_push_notification, send_push_to_user
+import importlib
+
+# Exporte werden erst beim ersten Zugriff importiert: der Push-Service laedt
+# pywebpush (inkl. cryptography und requests), was sonst jeden Import eines
+# Services und damit jeden App-Start verlangsamt.
+_EXPORTS = {
+    "send_weekly_summary": ".mail_service",
+    "send_push_notification": ".push_service",
+    "send_push_to_user": ".push_service",
+}
 
 __all__ = [
     "send_weekly_summary",
     "send_push_notification",
     "send_push_to_user",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
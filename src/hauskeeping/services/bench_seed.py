@@ -0,0 +1,311 @@
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import func, insert, select
+
+from ..extensions import bcrypt, db
+from ..models.app_state import AppState
+from ..models.push_subscription import PushSubscription
+from ..models.shopping import ShoppingCategory, ShoppingListItem
+from ..models.task import Task, TaskCategory
+from ..models.user import User
+from .recurrence import iter_occurrences
+from .stats_service import rebuild_task_stats
+
+# Passwort aller erzeugten User (Login z.B. als ``bench1`` / ``bench``)
+BENCH_PASSWORD = "bench"
+
+# Aufgaben-Kategorien mit typischen Titeln
+_TASKS = {
+    ("Küche", "#fd7e14"): [
+        "Geschirrspüler ausräumen",
+        "Kühlschrank putzen",
+        "Herd reinigen",
+        "Arbeitsplatte wischen",
+    ],
+    ("Bad", "#0dcaf0"): ["Bad putzen", "Handtücher wechseln", "Spiegel putzen"],
+    ("Wäsche", "#6f42c1"): ["Wäsche waschen", "Wäsche aufhängen", "Bügeln"],
+    ("Garten", "#198754"): ["Rasen mähen", "Blumen gießen", "Unkraut jäten"],
+    ("Müll", "#6c757d"): ["Restmüll rausbringen", "Altpapier wegbringen"],
+    ("Reparaturen", "#dc3545"): ["Glühbirne tauschen", "Fahrrad reparieren"],
+}
+# Kategorie, die in der Statistik ausgeblendet wird
+_EXCLUDED_CATEGORY = "Reparaturen"
+
+_SHOPPING = {
+    ("Lebensmittel", "#28a745"): ["Milch", "Brot", "Eier", "Äpfel", "Nudeln"],
+    ("Haushalt", "#007bff"): ["Spülmittel", "Müllbeutel", "Küchenrolle"],
+    ("Drogerie", "#e83e8c"): ["Zahnpasta", "Duschgel", "Shampoo"],
+    ("Sonstiges", "#6c757d"): ["Batterien", "Geschenkpapier"],
+}
+
+# Wiederholungsregeln mit Gewichtung (woechentlich ist am haeufigsten)
+_RULES = [
+    ("FREQ=WEEKLY", 6),
+    ("FREQ=WEEKLY;BYDAY=MO,TH", 3),
+    ("FREQ=WEEKLY;INTERVAL=2;BYDAY=SA", 2),
+    ("FREQ=DAILY", 1),
+    ("FREQ=MONTHLY;BYMONTHDAY=1", 2),
+    ("FREQ=MONTHLY;BYDAY=-1FR", 1),
+]
+
+# Bulk-Inserts in Chargen dieser Groesse
+_CHUNK = 10_000
+
+
+def seed_bench_data(users=25, tasks=20_000, templates=100, shopping=150, seed=42):
+    """
+    Erzeugt realistische Testdaten fuer Lasttests in einer leeren Datenbank.
+
+    Legt Kategorien, ``users`` User (der erste ist Hausmeister, Passwort
+    :data:`BENCH_PASSWORD`) mit gemischten Benachrichtigungs-Einstellungen
+    und Push-Subscriptions, ``tasks`` einzelne Aufgaben ueber die letzten
+    zwei Jahre, ``templates`` wiederkehrende Aufgaben samt Instanzen bis zum
+    Spawn-Horizont sowie ``shopping`` Einkaufslisten-Eintraege an.
+    Vergangene Aufgaben sind groesstenteils erledigt. Zum Schluss wird die
+    Statistik-Tabelle neu aufgebaut. Committet.
+
+    :param users: Anzahl User
+    :param tasks: Anzahl einzelner (nicht wiederkehrender) Aufgaben
+    :param templates: Anzahl wiederkehrender Aufgaben (Templates)
+    :param shopping: Anzahl Einkaufslisten-Eintraege
+    :param seed: Startwert des Zufallsgenerators (gleicher Wert = gleiche Daten)
+    :return: Anzahl erzeugter Zeilen pro Art
+    :rtype: dict[str, int]
+    :raises ValueError: Wenn die Datenbank bereits User enthaelt
+    """
+    if db.session.scalar(select(func.count(User.id))):
+        raise ValueError("Die Datenbank enthaelt bereits User.")
+
+    rnd = random.Random(seed)
+    today = date.today()
+    now = _utcnow()
+    counts = {}
+
+    user_ids = _seed_users(rnd, users, now)
+    counts["users"] = len(user_ids)
+    counts["push_subscriptions"] = _seed_subscriptions(rnd, user_ids, now)
+
+    categories = _seed_categories()
+    counts["tasks"] = _seed_tasks(rnd, tasks, user_ids, categories, today, now)
+    template_rows = _seed_templates(rnd, templates, user_ids, categories, today, now)
+    counts["templates"] = len(template_rows)
+    counts["instances"] = _seed_instances(rnd, template_rows, user_ids, today, now)
+    counts["shopping_items"] = _seed_shopping(rnd, shopping, user_ids, now)
+    db.session.commit()
+
+    counts["stats_rows"] = rebuild_task_stats()
+    return counts
+
+
+def _seed_users(rnd, count, now):
+    """Legt die User an und gibt ihre IDs zurueck."""
+    password_hash = bcrypt.generate_password_hash(BENCH_PASSWORD).decode("utf-8")
+    users = [
+        User(
+            username=f"bench{i}",
+            email=f"bench{i}@example.com",
+            password_hash=password_hash,
+            role="hausmeister" if i == 1 else "member",
+            email_notifications_enabled=rnd.random() < 0.6,
+            email_notification_day=rnd.randint(0, 6),
+            push_notifications_enabled=rnd.random() < 0.7,
+            overdue_reminders_enabled=rnd.random() < 0.8,
+            created_at=now - timedelta(days=rnd.randint(30, 730)),
+        )
+        for i in range(1, count + 1)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+    return [user.id for user in users]
+
+
+def _seed_subscriptions(rnd, user_ids, now):
+    """Ein bis drei Geraete pro User mit aktiviertem Push."""
+    enabled = db.session.scalars(
+        select(User.id).where(User.push_notifications_enabled == True)  # noqa: E712
+    ).all()
+    rows = [
+        {
+            "user_id": user_id,
+            # .invalid kann nie aufgeloest werden, es gehen keine Pushes raus
+            "endpoint": f"https://push.example.invalid/{user_id}/{device}",
+            "p256dh": "bench",
+            "auth": "bench",
+            "platform": rnd.choice(["android", "ios", "desktop"]),
+            "created_at": now,
+            "failure_count": 0,
+        }
+        for user_id in enabled
+        for device in range(rnd.randint(1, 3))
+    ]
+    _bulk_insert(PushSubscription, rows)
+    return len(rows)
+
+
+def _seed_categories():
+    """Legt Aufgaben- und Einkaufs-Kategorien an (fehlende nur)."""
+    for model, specs in ((TaskCategory, _TASKS), (ShoppingCategory, _SHOPPING)):
+        existing = set(db.session.scalars(select(model.slug)))
+        for position, (name, color) in enumerate(specs, start=1):
+            slug = model.make_slug(name)
+            if slug in existing:
+                continue
+            category = model(name=name, slug=slug, color=color, position=position)
+            if model is TaskCategory:
+                category.exclude_from_stats = name == _EXCLUDED_CATEGORY
+            db.session.add(category)
+    db.session.flush()
+
+    by_slug = dict(db.session.execute(select(TaskCategory.slug, TaskCategory.id)).all())
+    return [
+        (by_slug[TaskCategory.make_slug(name)], titles)
+        for (name, _), titles in _TASKS.items()
+    ]
+
+
+def _task_row(rnd, title, due, user_ids, category_id, today, now):
+    """Eine Aufgabe; vergangene sind meist erledigt, aktuelle selten."""
+    creator = rnd.choice(user_ids)
+    assignee = rnd.choice([None, creator, rnd.choice(user_ids)])
+    if due < today - timedelta(days=7):
+        done = rnd.random() < 0.95
+    elif due <= today:
+        done = rnd.random() < 0.5
+    else:
+        done = rnd.random() < 0.05
+    completer = (assignee or rnd.choice(user_ids)) if done else None
+    return {
+        "title": title,
+        "description": None,
+        "due_date": due,
+        "is_done": done,
+        "category_id": category_id,
+        "assigned_to": assignee,
+        "created_by": creator,
+        "completed_by": completer,
+        "completed_at": (
+            datetime.combine(due, time(rnd.randint(7, 21), rnd.randint(0, 59)))
+            if done
+            else None
+        ),
+        "created_at": now,
+    }
+
+
+def _seed_tasks(rnd, count, user_ids, categories, today, now):
+    """Einzelne Aufgaben ueber die letzten zwei Jahre bis 60 Tage voraus."""
+    rows = []
+    for _ in range(count):
+        category_id, titles = rnd.choice(categories)
+        rows.append(
+            _task_row(
+                rnd,
+                rnd.choice(titles),
+                today + timedelta(days=rnd.randint(-730, 60)),
+                user_ids,
+                rnd.choice([category_id, category_id, None]),
+                today,
+                now,
+            )
+        )
+    _bulk_insert(Task, rows)
+    return len(rows)
+
+
+def _seed_templates(rnd, count, user_ids, categories, today, now):
+    """Wiederkehrende Aufgaben mit Startdatum im letzten halben Jahr."""
+    rules = [rule for rule, _ in _RULES]
+    weights = [weight for _, weight in _RULES]
+    templates = []
+    for _ in range(count):
+        category_id, titles = rnd.choice(categories)
+        task = Task(
+            title=rnd.choice(titles),
+            due_date=today - timedelta(days=rnd.randint(0, 180)),
+            category_id=category_id,
+            assigned_to=rnd.choice(user_ids),
+            created_by=rnd.choice(user_ids),
+            recurrence_rule=rnd.choices(rules, weights)[0],
+            created_at=now,
+        )
+        templates.append(task)
+    db.session.add_all(templates)
+    db.session.flush()
+    return templates
+
+
+def _seed_instances(rnd, templates, user_ids, today, now):
+    """
+    Instanzen aller Templates vom Startdatum bis zum Spawn-Horizont.
+
+    Setzt den Marker ``last_recurrence_monday`` und ``spawned_until`` der
+    Templates wie der Recurrence-Spawn, sodass der naechste Spawn-Lauf
+    nichts nachholen muss.
+    """
+    monday = today - timedelta(days=today.weekday())
+    horizon = monday + timedelta(weeks=current_app.config["RECURRENCE_LOOKAHEAD_WEEKS"])
+    sunday = horizon + timedelta(days=6)
+
+    rows = []
+    for template in templates:
+        for due in iter_occurrences(template, template.due_date, sunday):
+            # Das erste Vorkommen ist das Template selbst
+            if due == template.due_date:
+                continue
+            row = _task_row(
+                rnd, template.title, due, user_ids, template.category_id, today, now
+            )
+            row.update(
+                occurrence_date=due,
+                assigned_to=template.assigned_to,
+                created_by=template.created_by,
+                recurrence_rule=template.recurrence_rule,
+                parent_task_id=template.id,
+            )
+            if row["is_done"]:
+                row["completed_by"] = template.assigned_to
+            rows.append(row)
+        template.spawned_until = sunday
+    _bulk_insert(Task, rows)
+
+    state = db.session.get(AppState, "last_recurrence_monday")
+    if state is None:
+        db.session.add(AppState(key="last_recurrence_monday", value=str(horizon)))
+    else:
+        state.value = str(horizon)
+    return len(rows)
+
+
+def _seed_shopping(rnd, count, user_ids, now):
+    """Einkaufsliste; etwa ein Drittel ist bereits abgehakt."""
+    items = [
+        (ShoppingCategory.make_slug(name), item)
+        for (name, _), names in _SHOPPING.items()
+        for item in names
+    ]
+    rows = []
+    for _ in range(count):
+        slug, name = rnd.choice(items)
+        rows.append(
+            {
+                "name": name,
+                "category": slug,
+                "is_checked": rnd.random() < 0.3,
+                "added_by": rnd.choice(user_ids),
+                "created_at": now - timedelta(minutes=rnd.randint(0, 60 * 24 * 14)),
+            }
+        )
+    _bulk_insert(ShoppingListItem, rows)
+    return len(rows)
+
+
+def _bulk_insert(model, rows):
+    """executemany in Chargen von :data:`_CHUNK` Zeilen."""
+    for offset in range(0, len(rows), _CHUNK):
+        db.session.execute(insert(model.__table__), rows[offset : offset + _CHUNK])
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+
+from flask import current_app, render_template
+from markupsafe import Markup
+
+logger = logging.getLogger(__name__)
+
+# Hauskeeping ist bisher nur auf Deutsch verfuegbar
+DEFAULT_LOCALE = "de"
+
+# Statische Bausteine, die in jede E-Mail eingesetzt werden
+_FRAGMENTS = {
+    "email_header": "email/_header.html",
+    "email_footer": "email/_footer.html",
+}
+
+
+class RenderStats:
+    """Thread-sichere Kennzahlen ueber gerenderte E-Mails."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self):
+        """
+        :return: Anzahl, Gesamt-, Durchschnitts- und Maximaldauer in Sekunden
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": self.total_seconds,
+                "avg_seconds": self.total_seconds / self.count if self.count else 0.0,
+                "max_seconds": self.max_seconds,
+            }
+
+
+render_stats = RenderStats()
+
+
+def render_email(template_name, locale=DEFAULT_LOCALE, **context):
+    """
+    Rendert ein E-Mail-Template mit den gecachten Header- und Footer-Bausteinen.
+
+    Die Dauer jedes Aufrufs fliesst in :data:`render_stats` ein. Benoetigt
+    einen aktiven Flask-App-Kontext.
+
+    :param template_name: Pfad des Templates, z. B. ``email/weekly_summary.html``
+    :param locale: Sprache der statischen Bausteine
+    :param context: Template-Variablen
+    :return: Gerendertes HTML
+    :rtype: str
+    """
+    start = time.perf_counter()
+    for name, fragment in _FRAGMENTS.items():
+        context.setdefault(name, email_fragment(fragment, locale))
+    html = render_template(template_name, locale=locale, **context)
+    render_stats.record(time.perf_counter() - start)
+    return html
+
+
+def email_fragment(template_name, locale=DEFAULT_LOCALE):
+    """
+    Liefert einen statischen E-Mail-Baustein, gerendert einmal pro Sprache.
+
+    Der Cache liegt in ``app.extensions`` und lebt so lange wie der Prozess;
+    im Debug-Modus wird jedes Mal neu gerendert.
+
+    :param template_name: Pfad des Bausteins
+    :param locale: Sprache, als ``locale`` an das Template uebergeben
+    :return: Gerendertes, bereits escaptes HTML
+    :rtype: Markup
+    """
+    app = current_app._get_current_object()
+    if app.debug:
+        return Markup(app.jinja_env.get_template(template_name).render(locale=locale))
+
+    cache = app.extensions.setdefault("email_fragments", {})
+    key = (template_name, locale)
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = Markup(
+            app.jinja_env.get_template(template_name).render(locale=locale)
+        )
+        cache[key] = fragment
+    return fragment
+
+
+def compile_templates(app):
+    """
+    Kompiliert alle Templates der App in den Jinja-Bytecode-Cache.
+
+    :param app: Flask-App mit konfiguriertem ``bytecode_cache``
+    :return: Anzahl kompilierter Templates
+    :rtype: int
+    """
+    env = app.jinja_env
+    count = 0
+    for name in env.list_templates(extensions=["html"]):
+        env.get_template(name)
+        count += 1
+    return count
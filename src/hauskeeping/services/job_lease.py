@@ -0,0 +1,92 @@
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.app_state import AppState
+
+logger = logging.getLogger(__name__)
+
+# Kennung dieses Prozesses, wird zur Diagnose im Lease gespeichert
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lease(name, seconds):
+    """
+    Beansprucht einen zeitlich begrenzten Lease in der ``app_state``-Tabelle.
+
+    Gleiches Muster wie der Recurrence-Spawn: Existiert noch kein Eintrag,
+    wird er per INSERT angelegt (``IntegrityError`` = ein anderer Prozess
+    war schneller). Ein abgelaufener Lease wird per Compare-and-Swap auf den
+    alten Wert uebernommen, sodass bei gleichzeitigen Prozessen genau einer
+    gewinnt. Committet sofort. Benoetigt einen aktiven Flask-App-Kontext.
+
+    :param name: Name des Leases, z. B. ``job:due_today_push``
+    :type name: str
+    :param seconds: Gueltigkeitsdauer in Sekunden
+    :type seconds: int
+    :return: Token fuer :func:`release_lease` oder ``None``, wenn ein anderer
+        Prozess den Lease haelt
+    :rtype: str | None
+    """
+    key = f"lease:{name}"
+    now = _utcnow()
+    token = f"{(now + timedelta(seconds=seconds)).isoformat()}|{_OWNER}"
+
+    previous = db.session.execute(
+        select(AppState.value).where(AppState.key == key)
+    ).scalar()
+    if previous is None:
+        try:
+            db.session.add(AppState(key=key, value=token))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
+        return token
+
+    if _lease_until(previous) > now:
+        db.session.rollback()
+        return None
+
+    result = db.session.execute(
+        update(AppState)
+        .where(AppState.key == key, AppState.value == previous)
+        .values(value=token)
+    )
+    db.session.commit()
+    return token if result.rowcount == 1 else None
+
+
+def release_lease(name, token):
+    """
+    Gibt einen Lease vorzeitig frei, sofern er noch von ``token`` gehalten wird.
+
+    :param name: Name des Leases
+    :type name: str
+    :param token: Rueckgabewert von :func:`acquire_lease`
+    :type token: str
+    """
+    db.session.execute(
+        update(AppState)
+        .where(AppState.key == f"lease:{name}", AppState.value == token)
+        .values(value=f"{_utcnow().isoformat()}|{_OWNER}")
+    )
+    db.session.commit()
+
+
+def _lease_until(value):
+    """Liest das Ablaufdatum aus einem Lease-Wert (unlesbar = abgelaufen)."""
+    try:
+        return datetime.fromisoformat(value.split("|", 1)[0])
+    except ValueError:
+        logger.warning("Ungueltiger Lease-Wert %r wird ueberschrieben.", value)
+        return datetime.min
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
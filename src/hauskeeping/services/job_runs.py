@@ -0,0 +1,227 @@
+import contextlib
+import contextvars
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, select
+
+from ..extensions import db
+from ..models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+# Zaehler des Job-Laufs, der im aktuellen Thread laeuft (siehe track_job_run)
+_current_run = contextvars.ContextVar("hauskeeping_job_run", default=None)
+
+_HOST = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobRunCounts:
+    """Zaehler eines laufenden Job-Laufs."""
+
+    def __init__(self):
+        self.items = 0
+        self.pushes = 0
+        self.mails = 0
+        self.failures = 0
+
+    @property
+    def idle(self):
+        """``True``, wenn der Lauf nichts verarbeitet hat."""
+        return not (self.items or self.pushes or self.mails or self.failures)
+
+
+def record_job_counts(items=0, pushes=0, mails=0, failures=0):
+    """
+    Addiert Zaehler zum laufenden Job-Lauf.
+
+    Ausserhalb eines Scheduler-Jobs (z.B. bei ``flask drain-push-outbox``)
+    passiert nichts.
+
+    :param items: Verarbeitete Elemente
+    :param pushes: Eingereihte bzw. zugestellte Push-Nachrichten
+    :param mails: Versendete E-Mails
+    :param failures: Fehler
+    """
+    run = _current_run.get()
+    if run is None:
+        return
+    run.items += items
+    run.pushes += pushes
+    run.mails += mails
+    run.failures += failures
+
+
+@contextlib.contextmanager
+def track_job_run(app, job_id, record_idle=True):
+    """
+    Misst einen Job-Lauf und speichert ihn in der Tabelle ``job_runs``.
+
+    Innerhalb des Blocks sammelt :func:`record_job_counts` die Zaehler.
+    Eine Exception zaehlt als Fehler und wird weitergereicht.
+
+    :param app: Die Flask-App-Instanz
+    :type app: Flask
+    :param job_id: ID des Jobs
+    :type job_id: str
+    :param record_idle: Auch Laeufe ohne verarbeitete Elemente speichern
+    :type record_idle: bool
+    """
+    run = JobRunCounts()
+    token = _current_run.set(run)
+    started_at = _utcnow()
+    started = time.perf_counter()
+    try:
+        yield run
+    except Exception:
+        run.failures += 1
+        raise
+    finally:
+        _current_run.reset(token)
+        if record_idle or not run.idle:
+            save_job_run(
+                app,
+                job_id,
+                started_at,
+                (time.perf_counter() - started) * 1000,
+                "failed" if run.failures else "ok",
+                run,
+            )
+
+
+def save_job_run(app, job_id, started_at, duration_ms, status, counts=None):
+    """
+    Schreibt einen Job-Lauf in die Tabelle ``job_runs``.
+
+    Fehler (z.B. fehlende Tabelle vor der Migration) werden nur geloggt,
+    damit das Protokoll den Job selbst nie beeintraechtigt.
+
+    :param app: Die Flask-App-Instanz
+    :param job_id: ID des Jobs
+    :param started_at: Startzeit (UTC ohne Zeitzone)
+    :param duration_ms: Dauer in Millisekunden
+    :param status: ``ok``, ``failed`` oder ``skipped``
+    :param counts: Zaehler des Laufs
+    :type counts: JobRunCounts | None
+    """
+    counts = counts or JobRunCounts()
+    with app.app_context():
+        try:
+            db.session.add(
+                JobRun(
+                    job_id=job_id,
+                    started_at=started_at,
+                    duration_ms=duration_ms,
+                    status=status,
+                    items=counts.items,
+                    pushes=counts.pushes,
+                    mails=counts.mails,
+                    failures=counts.failures,
+                    host=_HOST,
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.warning(
+                "Lauf von Job %s konnte nicht gespeichert werden.",
+                job_id,
+                exc_info=True,
+            )
+
+
+def job_summaries(days=7):
+    """
+    Fasst die Laeufe der letzten ``days`` Tage pro Job zusammen.
+
+    :param days: Zeitraum in Tagen
+    :type days: int
+    :return: Pro Job ``job_id``, ``runs``, ``skipped``, ``failed``,
+        ``avg_ms``, ``max_ms`` und ``last`` (letzter ausgefuehrter Lauf,
+        ``None`` wenn alle uebersprungen wurden), sortiert nach ``job_id``
+    :rtype: list[dict]
+    """
+    since = _utcnow() - timedelta(days=days)
+    executed = JobRun.status != "skipped"
+    rows = db.session.execute(
+        select(
+            JobRun.job_id,
+            func.count(JobRun.id),
+            func.count(JobRun.id).filter(JobRun.status == "skipped"),
+            func.count(JobRun.id).filter(JobRun.status == "failed"),
+            func.avg(JobRun.duration_ms).filter(executed),
+            func.max(JobRun.duration_ms).filter(executed),
+        )
+        .where(JobRun.started_at >= since)
+        .group_by(JobRun.job_id)
+        .order_by(JobRun.job_id)
+    ).all()
+
+    last_runs = {run.job_id: run for run in latest_job_runs()}
+    return [
+        {
+            "job_id": job_id,
+            "runs": runs,
+            "skipped": skipped,
+            "failed": failed,
+            "avg_ms": avg_ms,
+            "max_ms": max_ms,
+            "last": last_runs.get(job_id),
+        }
+        for job_id, runs, skipped, failed, avg_ms, max_ms in rows
+    ]
+
+
+def latest_job_runs():
+    """
+    Laedt den letzten ausgefuehrten (nicht uebersprungenen) Lauf jedes Jobs.
+
+    :return: Letzte Laeufe, sortiert nach ``job_id``
+    :rtype: list[JobRun]
+    """
+    latest = (
+        select(JobRun.job_id, func.max(JobRun.started_at).label("started_at"))
+        .where(JobRun.status != "skipped")
+        .group_by(JobRun.job_id)
+        .subquery()
+    )
+    runs = db.session.scalars(
+        select(JobRun)
+        .join(
+            latest,
+            (JobRun.job_id == latest.c.job_id)
+            & (JobRun.started_at == latest.c.started_at),
+        )
+        .where(JobRun.status != "skipped")
+        .order_by(JobRun.job_id, JobRun.id.desc())
+    )
+    # Bei gleicher Startzeit gewinnt der zuletzt gespeicherte Lauf
+    last_runs = {}
+    for run in runs:
+        last_runs.setdefault(run.job_id, run)
+    return list(last_runs.values())
+
+
+def purge_job_runs(days=None):
+    """
+    Loescht Job-Laeufe, die aelter als ``days`` Tage sind.
+
+    :param days: Aufbewahrungsdauer (Default: ``JOB_RUNS_RETENTION_DAYS``)
+    :return: Anzahl geloeschter Laeufe
+    :rtype: int
+    """
+    days = days if days is not None else current_app.config["JOB_RUNS_RETENTION_DAYS"]
+    result = db.session.execute(
+        delete(JobRun).where(JobRun.started_at < _utcnow() - timedelta(days=days))
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _utcnow():
+    """Aktuelle UTC-Zeit ohne Zeitzone (wie in den DateTime-Spalten)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
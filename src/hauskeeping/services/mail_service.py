@@ -1,12 +1,19 @@
 import logging
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
-from flask import current_app, render_template
+from flask import current_app
 from flask_mail import Message
+from sqlalchemy import and_, or_
 
 from ..extensions import db, mail
 from ..models.task import Task
 from ..models.user import User
+from .email_renderer import render_email, render_stats
+from .job_runs import record_job_counts
 
 logger = logging.getLogger(__name__)
 
@@ -17,102 +24,241 @@ def send_weekly_summary():
 
     Wird fuer jeden User aufgerufen, der ``email_notifications_enabled = True``
     hat und dessen ``email_notification_day`` dem aktuellen Wochentag entspricht.
+    Die Aufgaben aller Empfaenger kommen aus einer einzigen Abfrage, die Mails
+    werden chargenweise (``WEEKLY_MAIL_BATCH_SIZE``) in einem Thread-Pool
+    gerendert und pro Charge ueber eine eigene SMTP-Verbindung versendet.
+    Trennt der Server die Verbindung (Idle-Timeout, Limit pro Verbindung),
+    wird einmal neu verbunden und die Mail erneut gesendet.
     Benoetigt einen aktiven Flask-App-Kontext.
+
+    :return: Anzahl versendeter Mails
+    :rtype: int
     """
     today = datetime.now(timezone.utc).date()
     weekday = today.weekday()  # 0=Mo, 6=So
 
-    users = User.query.filter_by(
+    users = []
+    for user in User.query.filter_by(
         email_notifications_enabled=True,
         email_notification_day=weekday,
-    ).all()
-
-    for user in users:
+    ).order_by(User.id):
         if not user.email:
             logger.warning(
                 "User %s hat E-Mail-Benachrichtigungen aktiv, aber keine E-Mail-Adresse.",
                 user.username,
             )
             continue
+        users.append(user)
 
-        try:
-            _send_summary_to_user(user, today)
-        except Exception:
-            logger.exception(
-                "Fehler beim Senden der Zusammenfassung an %s", user.username
-            )
+    if not users:
+        return 0
+
+    summaries = _collect_summaries(users, today)
+    rendered_before = render_stats.snapshot()
+    batch_size = max(current_app.config["WEEKLY_MAIL_BATCH_SIZE"], 1)
+    sent = 0
+    throttle = _Throttle(current_app.config["WEEKLY_MAIL_RATE_LIMIT"])
+    for offset in range(0, len(summaries), batch_size):
+        batch = summaries[offset : offset + batch_size]
+        messages = _render_messages(batch)
+        with _smtp_connection() as connection:
+            for summary, msg in zip(batch, messages):
+                if msg is None:
+                    continue
+                throttle.wait()
+                try:
+                    _send(connection, msg)
+                except Exception:
+                    logger.exception(
+                        "Fehler beim Senden der Zusammenfassung an %s",
+                        summary["user"].username,
+                    )
+                    continue
+                sent += 1
+                logger.info(
+                    "Woechentliche Zusammenfassung an %s gesendet.",
+                    summary["user"].email,
+                )
+
+    # Nicht gerenderte oder nicht versendete Mails zaehlen als Fehler
+    record_job_counts(items=len(summaries), mails=sent, failures=len(summaries) - sent)
+
+    rendered = render_stats.snapshot()
+    count = rendered["count"] - rendered_before["count"]
+    if count:
+        render_ms = (
+            rendered["total_seconds"] - rendered_before["total_seconds"]
+        ) * 1000
+        logger.info(
+            "%d Zusammenfassung(en) gerendert in %.1f ms (Durchschnitt %.1f ms).",
+            count,
+            render_ms,
+            render_ms / count,
+        )
+    return sent
+
+
+def _collect_summaries(users, today):
+    """
+    Laedt die Aufgaben aller Empfaenger und teilt sie pro User auf.
 
+    Eine Abfrage liefert alle offenen Aufgaben bis Ende naechster Woche und
+    die erledigten Aufgaben der Vorwoche; die Aufteilung auf aktuelle Woche,
+    Ueberfaellige und Vorschau passiert im Speicher.
 
-def _send_summary_to_user(user, today):
-    """Erstellt und versendet die Zusammenfassungs-Mail fuer einen User."""
+    :param users: Empfaenger
+    :type users: list[User]
+    :param today: Stichtag
+    :type today: date
+    :return: Template-Kontext pro User in der Reihenfolge von ``users``
+    :rtype: list[dict]
+    """
     monday = today - timedelta(days=today.weekday())
     sunday = monday + timedelta(days=6)
     next_monday = monday + timedelta(weeks=1)
     next_sunday = next_monday + timedelta(days=6)
+    prev_monday = monday - timedelta(weeks=1)
+
+    summaries = {
+        user.id: {
+            "user": user,
+            "current_week_tasks": [],
+            "overdue_tasks": [],
+            "next_week_tasks": [],
+            "completed_last_week": 0,
+            "monday": monday,
+            "sunday": sunday,
+        }
+        for user in users
+    }
 
-    # Aufgaben der aktuellen Woche (zugewiesen an den User)
-    current_week_tasks = (
+    tasks = (
         Task.query.filter(
-            Task.assigned_to == user.id,
-            Task.due_date >= monday,
-            Task.due_date <= sunday,
-            Task.is_done == False,  # noqa: E712
+            Task.assigned_to.in_(summaries),
+            or_(
+                and_(
+                    Task.is_done == False,  # noqa: E712
+                    Task.due_date <= next_sunday,
+                ),
+                and_(
+                    Task.is_done == True,  # noqa: E712
+                    Task.due_date >= prev_monday,
+                    Task.due_date < monday,
+                ),
+            ),
         )
-        .order_by(Task.due_date)
-        .all()
+        .options(*Task.display_options(assignee=False))
+        .order_by(Task.due_date, Task.id)
     )
+    for task in tasks:
+        summary = summaries[task.assigned_to]
+        if task.is_done:
+            summary["completed_last_week"] += 1
+        elif task.due_date < monday:
+            summary["overdue_tasks"].append(task)
+        elif task.due_date <= sunday:
+            summary["current_week_tasks"].append(task)
+        else:
+            summary["next_week_tasks"].append(task)
 
-    # Ueberfaellige Aufgaben
-    overdue_tasks = (
-        Task.query.filter(
-            Task.assigned_to == user.id,
-            Task.due_date < monday,
-            Task.is_done == False,  # noqa: E712
+    return list(summaries.values())
+
+
+def _render_messages(summaries):
+    """
+    Rendert die Mails einer Charge parallel (``WEEKLY_MAIL_RENDER_WORKERS``).
+
+    :return: Message pro Zusammenfassung in derselben Reihenfolge, ``None``
+        wenn das Rendern fehlgeschlagen ist
+    :rtype: list[Message | None]
+    """
+    app = current_app._get_current_object()
+    workers = max(min(app.config["WEEKLY_MAIL_RENDER_WORKERS"], len(summaries)), 1)
+    if workers == 1:
+        return [_render_message(app, summary) for summary in summaries]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(lambda summary: _render_message(app, summary), summaries)
         )
-        .order_by(Task.due_date)
-        .all()
-    )
 
-    # Vorschau naechste Woche
-    next_week_tasks = (
-        Task.query.filter(
-            Task.assigned_to == user.id,
-            Task.due_date >= next_monday,
-            Task.due_date <= next_sunday,
-            Task.is_done == False,  # noqa: E712
+
+def _render_message(app, summary):
+    """Erstellt die Zusammenfassungs-Mail fuer einen User."""
+    user = summary["user"]
+    total_open = len(summary["current_week_tasks"]) + len(summary["overdue_tasks"])
+    try:
+        with app.app_context():
+            return Message(
+                subject=f"Deine Hauskeeping-Woche – {total_open} Aufgaben stehen an",
+                recipients=[user.email],
+                html=render_email("email/weekly_summary.html", **summary),
+            )
+    except Exception:
+        logger.exception(
+            "Fehler beim Erstellen der Zusammenfassung fuer %s", user.username
         )
-        .order_by(Task.due_date)
-        .all()
-    )
+        return None
 
-    # Erledigte Aufgaben der Vorwoche (Statistik)
-    prev_monday = monday - timedelta(weeks=1)
-    prev_sunday = monday - timedelta(days=1)
-    completed_last_week = Task.query.filter(
-        Task.assigned_to == user.id,
-        Task.due_date >= prev_monday,
-        Task.due_date <= prev_sunday,
-        Task.is_done == True,  # noqa: E712
-    ).count()
-
-    total_open = len(current_week_tasks) + len(overdue_tasks)
-    subject = f"Deine Hauskeeping-Woche – {total_open} Aufgaben stehen an"
-
-    html_body = render_template(
-        "email/weekly_summary.html",
-        user=user,
-        current_week_tasks=current_week_tasks,
-        overdue_tasks=overdue_tasks,
-        next_week_tasks=next_week_tasks,
-        completed_last_week=completed_last_week,
-        monday=monday,
-        sunday=sunday,
-    )
 
-    msg = Message(
-        subject=subject,
-        recipients=[user.email],
-        html=html_body,
-    )
-    mail.send(msg)
-    logger.info("Woechentliche Zusammenfassung an %s gesendet.", user.email)
+@contextmanager
+def _smtp_connection():
+    """
+    Oeffnet eine SMTP-Verbindung fuer eine Charge.
+
+    Anders als ``with mail.connect()`` bricht ein Fehler beim Schliessen
+    (z.B. Server hat die Verbindung bereits getrennt) den Versand nicht ab.
+    """
+    connection = mail.connect()
+    connection.__enter__()
+    try:
+        yield connection
+    finally:
+        _close(connection)
+
+
+def _send(connection, msg):
+    """Sendet eine Mail; nach einem Verbindungsabbruch einmal neu verbinden."""
+    try:
+        connection.send(msg)
+    except Exception as exc:
+        if not _is_disconnect(exc):
+            raise
+        logger.warning("SMTP-Verbindung getrennt (%s), verbinde neu.", exc)
+        _close(connection)
+        connection.host = connection.configure_host()
+        connection.send(msg)
+
+
+def _is_disconnect(exc):
+    """Verbindung getrennt bzw. Server beendet die Sitzung (421)."""
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionError)):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code == 421
+
+
+def _close(connection):
+    """Schliesst die SMTP-Verbindung, Fehler werden ignoriert."""
+    host, connection.host = connection.host, None
+    if host is None:
+        return
+    try:
+        host.quit()
+    except (smtplib.SMTPException, OSError):
+        host.close()
+
+
+class _Throttle:
+    """Begrenzt den Versand auf ``per_minute`` Mails pro Minute (0 = aus)."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
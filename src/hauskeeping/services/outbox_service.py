@@ -0,0 +1,260 @@
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.push_outbox import PushOutbox
+from .job_runs import record_job_counts
+from .push_service import PUSH_SENT, PUSH_SKIPPED, send_push_batch
+
+logger = logging.getLogger(__name__)
+
+# Sperrdauer einer beanspruchten Nachricht; stirbt der Prozess waehrend der
+# Zustellung, wird sie danach erneut versucht.
+_CLAIM_LEASE = timedelta(minutes=5)
+
+# Datenbanken mit INSERT ... ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def enqueue_push(user, title, body, url=None, idempotency_key=None):
+    """
+    Traegt eine Push-Nachricht in die Outbox ein.
+
+    Die Nachricht wird mit dem naechsten Commit der aktuellen Session
+    gespeichert und vom Outbox-Job zugestellt.
+
+    :param user: User-Objekt oder User-ID
+    :param title: Titel der Benachrichtigung
+    :param body: Text der Benachrichtigung
+    :param url: Optionale URL, die beim Klick geoeffnet wird
+    :param idempotency_key: Optionaler eindeutiger Schluessel; existiert
+        bereits eine Nachricht mit diesem Schluessel, wird keine neue
+        eingetragen
+    :return: True, wenn die Nachricht eingetragen wurde
+    :rtype: bool
+    """
+    return enqueue_pushes([(user, title, body, url, idempotency_key)]) == 1
+
+
+def enqueue_pushes(notifications):
+    """
+    Traegt mehrere Push-Nachrichten in die Outbox ein (ohne Commit).
+
+    Nachrichten, deren ``idempotency_key`` bereits existiert, werden
+    uebersprungen. Auf SQLite und PostgreSQL geschieht das per
+    ``INSERT ... ON CONFLICT DO NOTHING``, sodass auch gleichzeitig laufende
+    Prozesse (z.B. ein manueller CLI-Aufruf neben dem Scheduler) sich nicht
+    gegenseitig mit einem ``IntegrityError`` abbrechen.
+
+    :param notifications: Iterable von
+        ``(user, title, body, url, idempotency_key)``-Tupeln
+    :return: Anzahl neu eingetragener Nachrichten
+    :rtype: int
+    """
+    rows = []
+    seen = set()
+    for user, title, body, url, key in notifications:
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        rows.append(
+            {
+                "user_id": user if isinstance(user, int) else user.id,
+                "title": title,
+                "body": body,
+                "url": url,
+                "idempotency_key": key,
+            }
+        )
+    if not rows:
+        return 0
+
+    table = PushOutbox.__table__
+    dialect = db.session.get_bind().dialect
+    if dialect.name in _UPSERT_INSERTS and dialect.insert_executemany_returning:
+        # executemany mit RETURNING – ein Roundtrip, Zaehlung auch bei
+        # uebersprungenen Zeilen korrekt
+        stmt = (
+            _UPSERT_INSERTS[dialect.name](table)
+            .on_conflict_do_nothing(index_elements=[table.c.idempotency_key])
+            .returning(table.c.id)
+        )
+        return len(db.session.execute(stmt, rows).all())
+
+    # Andere Datenbanken: vorhandene Schluessel vorab ausfiltern und bei
+    # einem gleichzeitig eingetragenen Schluessel einmal erneut versuchen
+    for attempt in range(2):
+        rows = _without_existing_keys(rows)
+        if not rows:
+            return 0
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table), rows)
+            return len(rows)
+        except IntegrityError:
+            if attempt:
+                raise
+    return 0
+
+
+def _without_existing_keys(rows):
+    """Entfernt Zeilen, deren idempotency_key bereits in der Outbox steht."""
+    keys = [row["idempotency_key"] for row in rows if row["idempotency_key"]]
+    if not keys:
+        return rows
+    existing = set(
+        db.session.scalars(
+            select(PushOutbox.idempotency_key).where(
+                PushOutbox.idempotency_key.in_(keys)
+            )
+        )
+    )
+    return [row for row in rows if row["idempotency_key"] not in existing]
+
+
+def drain_outbox(batch_size=None):
+    """
+    Stellt eine Charge faelliger Nachrichten aus der Outbox zu.
+
+    Die Nachrichten werden zuerst per bedingtem UPDATE beansprucht
+    (commit), sodass parallel laufende Prozesse keine Nachricht doppelt
+    senden. Die Zustellung laeuft gesammelt ueber
+    :func:`send_push_batch`, die Ergebnisse werden mit wenigen Massen-
+    UPDATEs zurueckgeschrieben. Fehlgeschlagene Nachrichten werden mit
+    exponentiellem Backoff (``PUSH_OUTBOX_BACKOFF_SECONDS`` * 2^n) erneut
+    eingeplant und nach ``PUSH_OUTBOX_MAX_ATTEMPTS`` Versuchen als
+    ``dead`` markiert.
+
+    :param batch_size: Maximale Anzahl Nachrichten (Default:
+        ``PUSH_OUTBOX_BATCH_SIZE``)
+    :type batch_size: int | None
+    :return: Anzahl bearbeiteter Nachrichten
+    :rtype: int
+    """
+    config = current_app.config
+    batch_size = batch_size or config["PUSH_OUTBOX_BATCH_SIZE"]
+    now = _utcnow()
+    token = uuid.uuid4().hex
+
+    due = (PushOutbox.status == "pending", PushOutbox.next_attempt_at <= now)
+    candidates = (
+        select(PushOutbox.id).where(*due).order_by(PushOutbox.id).limit(batch_size)
+    )
+    db.session.execute(
+        update(PushOutbox)
+        .where(PushOutbox.id.in_(candidates), *due)
+        .values(claim_token=token, next_attempt_at=now + _CLAIM_LEASE)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    messages = db.session.execute(
+        select(
+            PushOutbox.id,
+            PushOutbox.user_id,
+            PushOutbox.title,
+            PushOutbox.body,
+            PushOutbox.url,
+            PushOutbox.attempts,
+        )
+        .where(PushOutbox.claim_token == token)
+        .order_by(PushOutbox.id)
+    ).all()
+    if not messages:
+        return 0
+
+    outcomes = send_push_batch(
+        (message.user_id, message.title, message.body, message.url)
+        for message in messages
+    )
+
+    sent, skipped, failed = [], [], {}
+    for message, outcome in zip(messages, outcomes):
+        if outcome == PUSH_SENT:
+            sent.append(message.id)
+        elif outcome == PUSH_SKIPPED:
+            skipped.append(message.id)
+        else:
+            failed.setdefault(message.attempts + 1, []).append(message.id)
+
+    now = _utcnow()
+    done = {"claim_token": None, "attempts": PushOutbox.attempts + 1}
+    _update_messages(sent, status="sent", sent_at=now, last_error=None, **done)
+    _update_messages(skipped, status="skipped", **done)
+
+    max_attempts = config["PUSH_OUTBOX_MAX_ATTEMPTS"]
+    backoff = config["PUSH_OUTBOX_BACKOFF_SECONDS"]
+    for attempts, ids in failed.items():
+        if attempts >= max_attempts:
+            logger.warning(
+                "%d Push-Nachricht(en) nach %d Versuchen aufgegeben.",
+                len(ids),
+                attempts,
+            )
+            _update_messages(
+                ids, status="dead", last_error="Zustellung fehlgeschlagen", **done
+            )
+        else:
+            delay = timedelta(seconds=backoff * 2 ** (attempts - 1))
+            _update_messages(
+                ids,
+                next_attempt_at=now + delay,
+                last_error="Zustellung fehlgeschlagen",
+                **done,
+            )
+    db.session.commit()
+
+    failed_count = sum(len(ids) for ids in failed.values())
+    logger.info(
+        "Push-Outbox: %d gesendet, %d uebersprungen, %d fehlgeschlagen.",
+        len(sent),
+        len(skipped),
+        failed_count,
+    )
+    record_job_counts(items=len(messages), pushes=len(sent), failures=failed_count)
+    return len(messages)
+
+
+def purge_outbox(days=None):
+    """
+    Loescht abgeschlossene Nachrichten, die aelter als ``days`` Tage sind.
+
+    :param days: Aufbewahrungsdauer (Default: ``PUSH_OUTBOX_RETENTION_DAYS``)
+    :return: Anzahl geloeschter Nachrichten
+    :rtype: int
+    """
+    days = (
+        days if days is not None else current_app.config["PUSH_OUTBOX_RETENTION_DAYS"]
+    )
+    result = db.session.execute(
+        delete(PushOutbox).where(
+            PushOutbox.status != "pending",
+            PushOutbox.created_at < _utcnow() - timedelta(days=days),
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _update_messages(ids, **values):
+    """Setzt ``values`` fuer alle Nachrichten mit den angegebenen IDs."""
+    if not ids:
+        return
+    db.session.execute(
+        update(PushOutbox)
+        .where(PushOutbox.id.in_(ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _utcnow():
+    """Aktuelle UTC-Zeit ohne Zeitzone (wie in den DateTime-Spalten)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
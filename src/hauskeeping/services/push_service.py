@@ -1,7 +1,13 @@
 import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
 
-from pywebpush import WebPushException, webpush
+from sqlalchemy import and_, delete, func, or_, update
 
 from ..extensions import db
 from ..models.push_subscription import PushSubscription
@@ -9,12 +15,161 @@ from ..models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Ergebnis einer einzelnen Zustellung
+PUSH_SENT = "sent"
+PUSH_GONE = "gone"
+PUSH_FAILED = "failed"
+# Keine Zustellung noetig (Push deaktiviert, keine Subscription)
+PUSH_SKIPPED = "skipped"
+
+# Gueltigkeit eines VAPID-JWT (max. 24h laut RFC 8292) und Restlaufzeit,
+# ab der ein neues JWT signiert wird
+_VAPID_TOKEN_LIFETIME = 12 * 60 * 60
+_VAPID_TOKEN_RENEW_BEFORE = 60 * 60
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class PushClient:
+    """
+    Wiederverwendbarer Web-Push-Client.
+
+    Laedt den VAPID-Key einmalig, cached das signierte VAPID-JWT pro Origin
+    des Push-Dienstes bis kurz vor Ablauf und haelt pro Origin eine
+    ``requests.Session`` mit Keep-Alive-Verbindungspool. Ein Fan-out an
+    viele Subscriptions desselben Dienstes braucht damit nur wenige
+    TLS-Handshakes und Signaturen. Threadsicher; wird von den Worker-Threads
+    in :func:`deliver_push` gemeinsam genutzt.
+    """
+
+    def __init__(self, vapid_private_key, vapid_subject, pool_size=10):
+        """
+        :param vapid_private_key: VAPID Private Key (Base64 oder Pfad zu PEM-Datei)
+        :param vapid_subject: ``sub``-Claim, z.B. ``mailto:admin@example.com``
+        :param pool_size: Maximale Anzahl Verbindungen pro Origin
+        """
+        # pywebpush zieht cryptography, http_ece und requests nach und wird
+        # daher erst beim ersten Versand geladen
+        from py_vapid import Vapid
+
+        if os.path.isfile(vapid_private_key):
+            self._vapid = Vapid.from_file(private_key_file=vapid_private_key)
+        else:
+            self._vapid = Vapid.from_string(private_key=vapid_private_key)
+        self._subject = vapid_subject
+        self._pool_size = pool_size
+        self._tokens = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def send(self, subscription_info, data, timeout=None, ttl=0):
+        """
+        Sendet eine verschluesselte Nachricht an eine Subscription.
+
+        :param subscription_info: Dict mit ``endpoint`` und ``keys``
+        :param data: Payload als String
+        :param timeout: Timeout des Requests in Sekunden
+        :param ttl: Time-to-live der Nachricht beim Push-Dienst
+        :return: Response des Push-Dienstes
+        :raises WebPushException: Bei HTTP-Status > 202
+        """
+        from pywebpush import WebPusher, WebPushException
+
+        origin = _origin(subscription_info["endpoint"])
+        response = WebPusher(
+            subscription_info, requests_session=self._session(origin)
+        ).send(
+            data,
+            self._vapid_headers(origin),
+            ttl=ttl,
+            content_encoding="aes128gcm",
+            timeout=timeout,
+        )
+        if response.status_code > 202:
+            raise WebPushException(
+                f"Push failed: {response.status_code} {response.reason}",
+                response=response,
+            )
+        return response
+
+    def close(self):
+        """Schliesst alle offenen Verbindungen."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _vapid_headers(self, origin):
+        """VAPID-Header fuer eine Origin, neu signiert nur kurz vor Ablauf."""
+        now = time.time()
+        with self._lock:
+            cached = self._tokens.get(origin)
+            if cached is None or cached[0] - now < _VAPID_TOKEN_RENEW_BEFORE:
+                expires = int(now) + _VAPID_TOKEN_LIFETIME
+                headers = self._vapid.sign(
+                    {"sub": self._subject, "aud": origin, "exp": expires}
+                )
+                cached = (expires, headers)
+                self._tokens[origin] = cached
+        # WebPusher ergaenzt die Header-Dicts, daher eine Kopie pro Request
+        return dict(cached[1])
+
+    def _session(self, origin):
+        """Session mit Verbindungspool fuer eine Origin."""
+        import requests
+
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self._pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[origin] = session
+            return session
+
+
+def get_push_client(vapid_private_key, vapid_subject):
+    """
+    Liefert den prozessweit geteilten PushClient fuer einen VAPID-Key.
+
+    Benoetigt einen aktiven Flask-App-Kontext fuer den Zugriff auf die Config.
+
+    :param vapid_private_key: VAPID Private Key aus der Config
+    :param vapid_subject: ``sub``-Claim (mailto:-Adresse)
+    :rtype: PushClient
+    """
+    from flask import current_app
+
+    key = (vapid_private_key, vapid_subject)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = PushClient(
+                vapid_private_key,
+                vapid_subject,
+                pool_size=current_app.config["PUSH_MAX_WORKERS"],
+            )
+            _clients[key] = client
+        return client
+
+
+def _origin(endpoint):
+    """Origin (Schema und Host) eines Push-Endpoints, z.B. fuer den aud-Claim."""
+    url = urlparse(endpoint)
+    return f"{url.scheme}://{url.netloc}"
+
 
 def send_push_notification(subscription, payload, vapid_private_key, vapid_claims):
     """
     Sendet eine einzelne Web-Push-Nachricht an eine Subscription.
 
     Bei HTTP 410 (Gone) wird die Subscription automatisch aus der DB geloescht.
+    Committet die Zustellstatistik der Subscription.
 
     :param subscription: PushSubscription-Objekt aus der Datenbank
     :param payload: Dict mit Notification-Daten (title, body, icon, url)
@@ -22,41 +177,221 @@ def send_push_notification(subscription, payload, vapid_private_key, vapid_claim
     :param vapid_claims: Dict mit ``sub`` (mailto:-Adresse)
     :return: True bei Erfolg, False bei Fehler
     """
-    subscription_info = {
-        "endpoint": subscription.endpoint,
-        "keys": {
-            "p256dh": subscription.p256dh,
-            "auth": subscription.auth,
-        },
-    }
+    results = deliver_push([(subscription, payload)], vapid_private_key, vapid_claims)
+    return results[0] == PUSH_SENT
 
-    try:
-        webpush(
-            subscription_info=subscription_info,
-            data=json.dumps(payload),
-            vapid_private_key=vapid_private_key,
-            vapid_claims=vapid_claims,
+
+def deliver_push(messages, vapid_private_key, vapid_claims):
+    """
+    Stellt mehrere Web-Push-Nachrichten parallel zu.
+
+    Die HTTP-Requests laufen in einem Thread-Pool mit hoechstens
+    ``PUSH_MAX_WORKERS`` Threads, jeder Request ist auf ``PUSH_TIMEOUT``
+    Sekunden begrenzt. Die Gesamtdauer haengt damit vom langsamsten
+    Endpoint ab statt von der Summe aller Endpoints. Alle Requests laufen
+    ueber den geteilten :class:`PushClient` (Keep-Alive-Verbindungen,
+    gecachte VAPID-JWTs). Die Worker-Threads
+    greifen nicht auf die Datenbank zu; die Ergebnisse werden anschliessend
+    im aufrufenden Thread gesammelt zurueckgeschrieben (siehe
+    :func:`_record_results`).
+
+    Benoetigt einen aktiven Flask-App-Kontext fuer den Zugriff auf die Config.
+
+    :param messages: Liste von ``(PushSubscription, payload)``-Tupeln
+    :param vapid_private_key: VAPID Private Key aus der Config
+    :param vapid_claims: Dict mit ``sub`` (mailto:-Adresse)
+    :return: Ergebnisse in derselben Reihenfolge wie ``messages``
+        (``PUSH_SENT``, ``PUSH_GONE`` oder ``PUSH_FAILED``)
+    :rtype: list[str]
+    """
+    from flask import current_app
+
+    if not messages:
+        return []
+
+    timeout = current_app.config["PUSH_TIMEOUT"]
+    jobs = [
+        (
+            subscription.id,
+            {
+                "endpoint": subscription.endpoint,
+                "keys": {
+                    "p256dh": subscription.p256dh,
+                    "auth": subscription.auth,
+                },
+            },
+            json.dumps(payload),
         )
-        return True
-    except WebPushException as e:
-        if hasattr(e, "response") and e.response is not None:
-            status = e.response.status_code
-            if status == 410:
-                logger.info(
-                    "Subscription %d abgelaufen (410 Gone), wird geloescht.",
-                    subscription.id,
+        for subscription, payload in messages
+    ]
+
+    client = get_push_client(vapid_private_key, vapid_claims["sub"])
+
+    def send(job):
+        return _send_webpush(client, *job, timeout)
+
+    if len(jobs) == 1:
+        results = [send(jobs[0])]
+    else:
+        workers = min(current_app.config["PUSH_MAX_WORKERS"], len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="push") as pool:
+            results = list(pool.map(send, jobs))
+
+    _record_results(
+        [subscription.id for subscription, _ in messages],
+        results,
+        current_app.config["PUSH_SUBSCRIPTION_MAX_FAILURES"],
+    )
+    return results
+
+
+def _record_results(subscription_ids, results, max_failures):
+    """
+    Schreibt die Zustellergebnisse eines Fan-outs zurueck.
+
+    Aktualisiert die Zaehler der Subscriptions und loescht abgelaufene
+    (HTTP 410) sowie dauerhaft fehlschlagende Subscriptions
+    (``max_failures`` Fehler in Folge) mit einem einzigen ``DELETE``.
+    Insgesamt hoechstens drei Statements und ein Commit, unabhaengig von
+    der Anzahl der Subscriptions.
+    """
+    by_result = {}
+    for subscription_id, result in zip(subscription_ids, results):
+        by_result.setdefault(result, []).append(subscription_id)
+    sent = by_result.get(PUSH_SENT, [])
+    failed = by_result.get(PUSH_FAILED, [])
+    gone = by_result.get(PUSH_GONE, [])
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if sent:
+        db.session.execute(
+            update(PushSubscription)
+            .where(PushSubscription.id.in_(sent))
+            .values(last_success_at=now, failure_count=0)
+            .execution_options(synchronize_session=False)
+        )
+    if failed:
+        db.session.execute(
+            update(PushSubscription)
+            .where(PushSubscription.id.in_(failed))
+            .values(
+                last_failure_at=now, failure_count=PushSubscription.failure_count + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    if gone or failed:
+        result = db.session.execute(
+            delete(PushSubscription)
+            .where(
+                or_(
+                    PushSubscription.id.in_(gone),
+                    and_(
+                        PushSubscription.id.in_(failed),
+                        PushSubscription.failure_count >= max_failures,
+                    ),
                 )
-                db.session.delete(subscription)
-                db.session.commit()
-                return False
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info("%d Push-Subscription(s) entfernt.", result.rowcount)
+    if sent or failed or gone:
+        db.session.commit()
+
+
+def prune_stale_subscriptions(days=None):
+    """
+    Entfernt Subscriptions, die seit ``days`` Tagen nicht mehr erreichbar sind.
+
+    Betroffen sind nur Subscriptions, bei denen seit der letzten
+    erfolgreichen Zustellung (bzw. seit der Registrierung) mindestens eine
+    Zustellung fehlgeschlagen ist. Geraete, an die einfach nichts gesendet
+    wurde, bleiben erhalten.
+
+    :param days: Tage ohne erfolgreiche Zustellung (Default:
+        ``PUSH_SUBSCRIPTION_STALE_DAYS``)
+    :return: Anzahl entfernter Subscriptions
+    :rtype: int
+    """
+    from flask import current_app
+
+    if days is None:
+        days = current_app.config["PUSH_SUBSCRIPTION_STALE_DAYS"]
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    last_alive = func.coalesce(
+        PushSubscription.last_success_at, PushSubscription.created_at
+    )
+    result = db.session.execute(
+        delete(PushSubscription)
+        .where(
+            last_alive < cutoff,
+            PushSubscription.failure_count > 0,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _send_webpush(client, subscription_id, subscription_info, data, timeout):
+    """Fuehrt einen einzelnen Push-Request aus (laeuft im Worker-Thread)."""
+    from pywebpush import WebPushException
+
+    try:
+        client.send(subscription_info, data, timeout=timeout)
+        return PUSH_SENT
+    except WebPushException as e:
+        if getattr(e, "response", None) is not None and e.response.status_code == 410:
+            logger.info(
+                "Subscription %d abgelaufen (410 Gone), wird geloescht.",
+                subscription_id,
+            )
+            return PUSH_GONE
         logger.exception(
             "Fehler beim Senden der Push-Nachricht an Subscription %d",
-            subscription.id,
+            subscription_id,
+        )
+    except Exception:
+        # z.B. Timeout oder Verbindungsfehler von requests
+        logger.exception(
+            "Fehler beim Senden der Push-Nachricht an Subscription %d",
+            subscription_id,
+        )
+    return PUSH_FAILED
+
+
+def load_push_recipients(user_ids):
+    """
+    Laedt die Push-Subscriptions aller Empfaenger mit einer einzigen Abfrage.
+
+    Subscriptions und Benachrichtigungs-Einstellung kommen ueber einen Join
+    auf ``users``; User ohne aktivierte Push-Nachrichten oder ohne Geraet
+    fehlen im Ergebnis.
+
+    :param user_ids: IDs der moeglichen Empfaenger
+    :type user_ids: Iterable[int]
+    :return: Subscriptions pro User-ID
+    :rtype: dict[int, list[PushSubscription]]
+    """
+    user_ids = set(user_ids)
+    recipients = {}
+    if not user_ids:
+        return recipients
+
+    subscriptions = (
+        PushSubscription.query.join(User, User.id == PushSubscription.user_id)
+        .filter(
+            PushSubscription.user_id.in_(user_ids),
+            User.push_notifications_enabled == True,  # noqa: E712
         )
-        return False
+        .order_by(PushSubscription.id)
+    )
+    for sub in subscriptions:
+        recipients.setdefault(sub.user_id, []).append(sub)
+    return recipients
 
 
-def send_push_to_user(user, title, body, url=None):
+def send_push_to_user(user, title, body, url=None, recipients=None):
     """
     Sendet eine Push-Nachricht an alle registrierten Geraete eines Users.
 
@@ -66,34 +401,71 @@ def send_push_to_user(user, title, body, url=None):
     :param title: Titel der Benachrichtigung
     :param body: Text der Benachrichtigung
     :param url: Optionale URL, die beim Klick geoeffnet wird
+    :param recipients: Optional vorab mit :func:`load_push_recipients`
+        geladene Subscriptions; dann faellt keine weitere Abfrage an
     """
-    from flask import current_app
+    send_push_batch([(user, title, body, url)], recipients)
+
+
+def send_push_batch(notifications, recipients=None):
+    """
+    Sendet Push-Nachrichten an mehrere User in einem Durchgang.
 
-    if isinstance(user, int):
-        user = db.session.get(User, user)
+    Die Subscriptions aller Empfaenger werden mit einer Abfrage geladen
+    (oder als ``recipients`` uebergeben), alle Nachrichten anschliessend
+    gemeinsam ueber :func:`deliver_push` zugestellt.
 
-    if not user or not user.push_notifications_enabled:
-        return
+    Benoetigt einen aktiven Flask-App-Kontext fuer den Zugriff auf die Config.
+
+    :param notifications: Iterable von ``(user, title, body, url)``-Tupeln;
+        ``user`` ist ein User-Objekt oder eine User-ID, ``url`` optional
+    :param recipients: Optional vorab mit :func:`load_push_recipients`
+        geladene Subscriptions pro User-ID
+    :return: Ergebnis pro Nachricht in derselben Reihenfolge: ``PUSH_SENT``
+        (mindestens ein Geraet erreicht), ``PUSH_FAILED`` (kein Geraet
+        erreicht, Wiederholung sinnvoll) oder ``PUSH_SKIPPED``
+    :rtype: list[str]
+    """
+    from flask import current_app
 
-    subscriptions = PushSubscription.query.filter_by(user_id=user.id).all()
-    if not subscriptions:
-        return
+    notifications = [
+        (user if isinstance(user, int) else user.id, title, body, url)
+        for user, title, body, url in notifications
+    ]
+    outcomes = [PUSH_SKIPPED] * len(notifications)
+    if recipients is None:
+        recipients = load_push_recipients(user_id for user_id, *_ in notifications)
+    if not recipients:
+        return outcomes
 
     vapid_private_key = current_app.config.get("VAPID_PRIVATE_KEY")
     vapid_claim_email = current_app.config.get("VAPID_CLAIM_EMAIL")
 
     if not vapid_private_key or not vapid_claim_email:
-        logger.warning("VAPID-Keys nicht konfiguriert. Push-Nachricht wird nicht gesendet.")
-        return
+        logger.warning(
+            "VAPID-Keys nicht konfiguriert. Push-Nachricht wird nicht gesendet."
+        )
+        return outcomes
 
     vapid_claims = {"sub": f"mailto:{vapid_claim_email}"}
 
-    payload = {
-        "title": title,
-        "body": body,
-    }
-    if url:
-        payload["url"] = url
+    messages = []
+    owners = []
+    for index, (user_id, title, body, url) in enumerate(notifications):
+        payload = {
+            "title": title,
+            "body": body,
+        }
+        if url:
+            payload["url"] = url
+        for sub in recipients.get(user_id, []):
+            messages.append((sub, payload))
+            owners.append(index)
 
-    for sub in subscriptions:
-        send_push_notification(sub, payload, vapid_private_key, vapid_claims)
+    results = deliver_push(messages, vapid_private_key, vapid_claims)
+    for index, result in zip(owners, results):
+        if result == PUSH_SENT:
+            outcomes[index] = PUSH_SENT
+        elif result == PUSH_FAILED and outcomes[index] == PUSH_SKIPPED:
+            outcomes[index] = PUSH_FAILED
+    return outcomes
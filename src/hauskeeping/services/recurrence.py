@@ -0,0 +1,518 @@
+import calendar
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+
+from sqlalchemy import or_, select
+
+from ..extensions import db
+from ..models.task import Task
+from .stats_service import record_tasks
+
+logger = logging.getLogger(__name__)
+
+
+class VirtualTask:
+    """
+    Nicht gespeichertes Vorkommen eines wiederkehrenden Templates.
+
+    Stellt die Attribute eines Tasks bereit, die Listen und Kalender
+    anzeigen. Erst beim Erledigen oder Bearbeiten wird daraus per
+    :func:`materialize_occurrence` eine echte Aufgabe.
+    """
+
+    is_virtual = True
+    id = None
+    is_done = False
+    completed_by = None
+    completed_at = None
+    completer = None
+
+    def __init__(self, template, due_date):
+        self.template = template
+        self.template_id = template.id
+        self.parent_task_id = template.id
+        self.due_date = due_date
+        self.title = template.title
+        self.description = template.description
+        self.category_id = template.category_id
+        self.assigned_to = template.assigned_to
+        self.created_by = template.created_by
+        self.recurrence_rule = template.recurrence_rule
+
+    @property
+    def category(self):
+        return self.template.category
+
+    @property
+    def assignee(self):
+        return self.template.assignee
+
+    @property
+    def is_overdue(self):
+        """Gleiche Semantik wie :attr:`Task.is_overdue`."""
+        return self.due_date < datetime.now(timezone.utc).date()
+
+    def __repr__(self):
+        return f"<VirtualTask {self.title} {self.due_date}>"
+
+
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+# Alte Kurzformen aus der Zeit vor RRULE-Unterstuetzung
+_LEGACY_RULES = {
+    "daily": "FREQ=DAILY",
+    "weekly": "FREQ=WEEKLY",
+    "monthly": "FREQ=MONTHLY",
+}
+# Obergrenze fuer Perioden ohne Vorkommen (z.B. BYMONTHDAY=31 mit
+# INTERVAL=12 ab Februar), damit die Suche immer terminiert
+_MAX_EMPTY_PERIODS = 1000
+
+_BYDAY_RE = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class RecurrenceRule:
+    """
+    Geparste Wiederholungsregel (Teilmenge von RFC 5545 RRULE).
+
+    Unterstuetzt ``FREQ`` (DAILY, WEEKLY, MONTHLY), ``INTERVAL``, ``BYDAY``
+    (bei MONTHLY auch mit Ordinalzahl, z.B. ``2TU`` oder ``-1FR``),
+    ``BYMONTHDAY`` (auch negativ, ``-1`` = letzter Tag), ``COUNT`` und
+    ``UNTIL``. Die Wochen beginnen immer am Montag (``WKST=MO``).
+    """
+
+    __slots__ = ("freq", "interval", "byday", "bymonthday", "count", "until")
+
+    def __init__(
+        self, freq, interval=1, byday=(), bymonthday=(), count=None, until=None
+    ):
+        self.freq = freq
+        self.interval = interval
+        self.byday = byday
+        self.bymonthday = bymonthday
+        self.count = count
+        self.until = until
+
+    def __repr__(self):
+        return f"<RecurrenceRule {self.freq}/{self.interval}>"
+
+
+@lru_cache(maxsize=256)
+def parse_rule(text):
+    """
+    Parst eine Wiederholungsregel.
+
+    Akzeptiert RRULE-Strings (optional mit Praefix ``RRULE:``) sowie die
+    alten Kurzformen ``daily``, ``weekly`` und ``monthly``. Das Ergebnis
+    wird pro String zwischengespeichert.
+
+    :param text: Inhalt von ``Task.recurrence_rule``
+    :type text: str
+    :return: Geparste Regel
+    :rtype: RecurrenceRule
+    :raises ValueError: Bei unbekannten oder ungueltigen Bestandteilen
+    """
+    text = _LEGACY_RULES.get(text.strip(), text.strip())
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+
+    parts = {}
+    for part in text.upper().split(";"):
+        if not part:
+            continue
+        name, sep, value = part.partition("=")
+        if not sep or not value or name in parts:
+            raise ValueError(f"Ungueltiger Regelbestandteil: {part}")
+        parts[name] = value
+
+    freq = parts.pop("FREQ", None)
+    if freq not in _FREQUENCIES:
+        raise ValueError(f"Nicht unterstuetzte Frequenz: {freq}")
+
+    interval = _parse_int(parts.pop("INTERVAL", "1"), 1, 999)
+
+    byday = []
+    if "BYDAY" in parts:
+        for item in parts.pop("BYDAY").split(","):
+            match = _BYDAY_RE.match(item)
+            if not match:
+                raise ValueError(f"Ungueltiger BYDAY-Wert: {item}")
+            ordinal = int(match.group(1)) if match.group(1) else None
+            # Ordinalzahlen ("2. Dienstag im Monat") nur bei FREQ=MONTHLY
+            if ordinal is not None and (
+                freq != "MONTHLY" or not 1 <= abs(ordinal) <= 5
+            ):
+                raise ValueError(f"Ungueltiger BYDAY-Wert: {item}")
+            byday.append((ordinal, _WEEKDAYS[match.group(2)]))
+
+    bymonthday = []
+    if "BYMONTHDAY" in parts:
+        for item in parts.pop("BYMONTHDAY").split(","):
+            day = _parse_int(item, -31, 31)
+            if day == 0:
+                raise ValueError("BYMONTHDAY darf nicht 0 sein.")
+            bymonthday.append(day)
+
+    count = _parse_int(parts.pop("COUNT"), 1, 10000) if "COUNT" in parts else None
+    until = None
+    if "UNTIL" in parts:
+        try:
+            until = datetime.strptime(parts.pop("UNTIL")[:8], "%Y%m%d").date()
+        except ValueError:
+            raise ValueError("Ungueltiges UNTIL-Datum.") from None
+    if count is not None and until is not None:
+        raise ValueError("COUNT und UNTIL schliessen sich aus.")
+
+    # Wochenbeginn ist immer Montag, WKST=MO ist daher erlaubt
+    if parts.get("WKST") == "MO":
+        del parts["WKST"]
+    if parts:
+        raise ValueError(f"Nicht unterstuetzte Bestandteile: {', '.join(parts)}")
+
+    return RecurrenceRule(
+        freq,
+        interval=interval,
+        byday=tuple(byday),
+        bymonthday=tuple(bymonthday),
+        count=count,
+        until=until,
+    )
+
+
+def _parse_int(value, minimum, maximum):
+    """Parst eine Ganzzahl innerhalb der Grenzen, sonst ValueError."""
+    number = int(value)
+    if not minimum <= number <= maximum:
+        raise ValueError(f"Wert ausserhalb des gueltigen Bereichs: {value}")
+    return number
+
+
+class CompiledRule:
+    """
+    Auf ein Startdatum (``due_date`` des Templates) festgelegte Regel.
+
+    Die Vorkommen werden periodenweise (Tag, Woche bzw. Monat) berechnet:
+    Die erste relevante Periode wird direkt aus dem Abstand zum Startdatum
+    bestimmt, danach liefert jede Periode ihre Vorkommen ohne Tag-fuer-Tag-
+    Suche. Wie bei RFC 5545 zaehlt das Startdatum nur als Vorkommen (auch
+    fuer ``COUNT``), wenn es der Regel entspricht.
+    """
+
+    def __init__(self, rule, dtstart):
+        self.rule = rule
+        self.dtstart = dtstart
+        self.until = rule.until
+        self._weekdays = sorted({wd for ordinal, wd in rule.byday if ordinal is None})
+        if rule.count is not None:
+            # COUNT einmalig in ein Enddatum umrechnen
+            last = self.dtstart - timedelta(days=1)
+            for last in islice(self._iter_periods(0), rule.count):
+                pass
+            self.until = last
+
+    def between(self, start, end):
+        """
+        Alle Vorkommen von ``start`` bis ``end`` (jeweils inklusive).
+
+        :rtype: list[date]
+        """
+        if self.until is not None and end > self.until:
+            end = self.until
+        start = max(start, self.dtstart)
+        if start > end:
+            return []
+
+        result = []
+        for occ_date in self._iter_periods(self._first_period(start), end):
+            if occ_date > end:
+                break
+            if occ_date >= start:
+                result.append(occ_date)
+        return result
+
+    def _first_period(self, start):
+        """Index der ersten Periode, die Vorkommen ab ``start`` enthalten kann."""
+        rule = self.rule
+        if rule.freq == "DAILY":
+            # Aufrunden: Periode k liegt auf dtstart + k * INTERVAL Tagen
+            return -(-(start - self.dtstart).days // rule.interval)
+        if rule.freq == "WEEKLY":
+            weeks = (_monday(start) - _monday(self.dtstart)).days // 7
+            return weeks // rule.interval
+        months = _month_index(start) - _month_index(self.dtstart)
+        return months // rule.interval
+
+    def _iter_periods(self, period, end=None):
+        """Liefert die Vorkommen ab Periode ``period`` in aufsteigender Folge."""
+        empty = 0
+        while empty < _MAX_EMPTY_PERIODS:
+            period_start, dates = self._period(period)
+            if end is not None and period_start > end:
+                return
+            if self.until is not None and period_start > self.until:
+                return
+            found = False
+            for occ_date in dates:
+                if occ_date >= self.dtstart:
+                    found = True
+                    yield occ_date
+            empty = 0 if found else empty + 1
+            period += 1
+
+    def _period(self, period):
+        """Beginn und sortierte Kandidaten einer Periode."""
+        rule = self.rule
+        if rule.freq == "DAILY":
+            day = self.dtstart + timedelta(days=period * rule.interval)
+            if self._weekdays and day.weekday() not in self._weekdays:
+                return day, ()
+            if rule.bymonthday and not _matches_monthday(day, rule.bymonthday):
+                return day, ()
+            return day, (day,)
+
+        if rule.freq == "WEEKLY":
+            monday = _monday(self.dtstart) + timedelta(weeks=period * rule.interval)
+            weekdays = self._weekdays or [self.dtstart.weekday()]
+            dates = [monday + timedelta(days=wd) for wd in weekdays]
+            if rule.bymonthday:
+                dates = [d for d in dates if _matches_monthday(d, rule.bymonthday)]
+            return monday, dates
+
+        year, month = divmod(_month_index(self.dtstart) + period * rule.interval, 12)
+        month += 1
+        first = date(year, month, 1)
+        days_in_month = calendar.monthrange(year, month)[1]
+
+        if rule.byday:
+            days = set()
+            for ordinal, weekday in rule.byday:
+                offset = (weekday - first.weekday()) % 7 + 1
+                matches = list(range(offset, days_in_month + 1, 7))
+                if ordinal is None:
+                    days.update(matches)
+                elif ordinal <= len(matches) and -ordinal <= len(matches):
+                    days.add(matches[ordinal - 1 if ordinal > 0 else ordinal])
+            if rule.bymonthday:
+                days &= _monthdays(rule.bymonthday, days_in_month)
+        elif rule.bymonthday:
+            days = _monthdays(rule.bymonthday, days_in_month)
+        else:
+            # Gleicher Tag im Monat; bei kuerzeren Monaten wird auf den letzten
+            # gueltigen Tag geklemmt (z.B. 31. -> 28./29. im Februar).
+            days = {min(self.dtstart.day, days_in_month)}
+        return first, [first.replace(day=day) for day in sorted(days)]
+
+
+def _monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def _monthdays(bymonthday, days_in_month):
+    """Loest (auch negative) BYMONTHDAY-Werte fuer einen Monat auf."""
+    days = set()
+    for value in bymonthday:
+        day = value if value > 0 else days_in_month + value + 1
+        if 1 <= day <= days_in_month:
+            days.add(day)
+    return days
+
+
+def _matches_monthday(day, bymonthday):
+    days_in_month = calendar.monthrange(day.year, day.month)[1]
+    return day.day in _monthdays(bymonthday, days_in_month)
+
+
+@lru_cache(maxsize=1024)
+def compile_rule(text, dtstart):
+    """
+    Parst eine Regel und legt sie auf ein Startdatum fest (gecacht).
+
+    :param text: Inhalt von ``Task.recurrence_rule``
+    :type text: str
+    :param dtstart: Faelligkeitsdatum des Templates
+    :type dtstart: date
+    :rtype: CompiledRule
+    :raises ValueError: Bei ungueltiger Regel
+    """
+    return CompiledRule(parse_rule(text), dtstart)
+
+
+def validate_rule(text):
+    """
+    Prueft eine Regel aus einem Formular.
+
+    :return: Fehlermeldung oder None, wenn die Regel gueltig ist
+    :rtype: str | None
+    """
+    try:
+        parse_rule(text)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def iter_occurrences(template, start, end):
+    """
+    Liefert alle Vorkommen eines Templates im Zeitraum ``start`` bis ``end``.
+
+    Templates mit ungueltiger Regel haben keine Vorkommen (mit Warnung im
+    Log), damit eine einzelne kaputte Regel den Spawn nicht blockiert.
+
+    :param template: Task-Objekt mit gesetzter recurrence_rule
+    :param start: Erster Tag (inklusive)
+    :type start: date
+    :param end: Letzter Tag (inklusive)
+    :type end: date
+    :return: Liste von date-Objekten in aufsteigender Reihenfolge
+    """
+    try:
+        rule = compile_rule(template.recurrence_rule, template.due_date)
+    except ValueError:
+        logger.warning(
+            "Ungueltige Wiederholungsregel %r bei Aufgabe %s ignoriert.",
+            template.recurrence_rule,
+            template.id,
+        )
+        return []
+    return rule.between(start, end)
+
+
+def expand_recurrences(start, end, assignee=None, category=None):
+    """
+    Berechnet die nicht gespeicherten Vorkommen aller Templates im Zeitraum.
+
+    Jedes Template wird erst ab dem Tag nach seinem ``spawned_until``
+    expandiert: Bis dahin sind alle Vorkommen als Tasks gespeichert, fehlende
+    Instanzen wurden dort bewusst geloescht und duerfen nicht virtuell wieder
+    auftauchen. Bereits gespeicherte Instanzen werden anhand ihres
+    urspruenglichen Datums (``occurrence_date``) uebersprungen, auch wenn sie
+    verschoben wurden. Die Kosten haengen nur von der Anzahl der Templates
+    und der Laenge des Zeitraums ab, nicht von der Anzahl gespeicherter
+    Aufgaben: eine Abfrage fuer die Templates, eine fuer die vorhandenen
+    Instanzen des Zeitraums.
+
+    :param start: Erster Tag (inklusive)
+    :type start: date
+    :param end: Letzter Tag (inklusive)
+    :type end: date
+    :param assignee: Nur Templates dieses Users
+    :type assignee: int | None
+    :param category: Nur Templates dieser Kategorie
+    :type category: int | None
+    :return: VirtualTask-Objekte sortiert nach Faelligkeitsdatum
+    :rtype: list[VirtualTask]
+    """
+    if start > end:
+        return []
+
+    query = Task.query.filter(
+        Task.recurrence_rule.isnot(None),
+        Task.parent_task_id.is_(None),
+        Task.due_date <= end,
+        or_(Task.spawned_until.is_(None), Task.spawned_until < end),
+    )
+    if assignee:
+        query = query.filter(Task.assigned_to == assignee)
+    if category:
+        query = query.filter(Task.category_id == category)
+    templates = query.options(*Task.display_options()).all()
+    if not templates:
+        return []
+
+    starts = {
+        template.id: (
+            max(start, template.spawned_until + timedelta(days=1))
+            if template.spawned_until is not None
+            else start
+        )
+        for template in templates
+    }
+    existing = set(
+        db.session.execute(
+            select(Task.parent_task_id, Task.occurrence_date).where(
+                Task.parent_task_id.isnot(None),
+                Task.occurrence_date >= min(starts.values()),
+                Task.occurrence_date <= end,
+            )
+        ).all()
+    )
+    existing.update((template.id, template.due_date) for template in templates)
+
+    virtual = [
+        VirtualTask(template, occ_date)
+        for template in templates
+        for occ_date in iter_occurrences(template, starts[template.id], end)
+        if (template.id, occ_date) not in existing
+    ]
+    virtual.sort(key=lambda task: (task.due_date, task.template_id))
+    return virtual
+
+
+def is_occurrence(template, due_date):
+    """
+    Prueft, ob ``due_date`` ein Vorkommen des Templates ist.
+
+    :rtype: bool
+    """
+    if template.recurrence_rule is None or template.parent_task_id is not None:
+        return False
+    return due_date in iter_occurrences(template, due_date, due_date)
+
+
+def find_occurrence(template, due_date):
+    """
+    Sucht die gespeicherte Instanz eines Vorkommens.
+
+    Gefunden wird auch eine Instanz, die auf ein anderes Datum verschoben
+    wurde.
+
+    :param due_date: Urspruengliches Datum des Vorkommens
+    :return: Task oder None
+    """
+    if template.due_date == due_date:
+        return template
+    return Task.query.filter_by(
+        parent_task_id=template.id, occurrence_date=due_date
+    ).first()
+
+
+def materialize_occurrence(template, due_date):
+    """
+    Legt ein virtuelles Vorkommen als echte Aufgabe an.
+
+    Existiert die Instanz bereits, wird sie unveraendert zurueckgegeben.
+    Flusht, committet aber nicht.
+
+    :param template: Template-Task
+    :param due_date: Datum des Vorkommens
+    :type due_date: date
+    :return: Gespeicherte Aufgabe
+    :rtype: Task
+    """
+    task = find_occurrence(template, due_date)
+    if task is not None:
+        return task
+
+    task = Task(
+        title=template.title,
+        description=template.description,
+        due_date=due_date,
+        occurrence_date=due_date,
+        category_id=template.category_id,
+        assigned_to=template.assigned_to,
+        created_by=template.created_by,
+        recurrence_rule=template.recurrence_rule,
+        parent_task_id=template.id,
+        is_done=False,
+    )
+    db.session.add(task)
+    record_tasks([task])
+    db.session.flush()
+    return task
@@ -0,0 +1,336 @@
+from datetime import timedelta
+
+from sqlalchemy import case, delete, extract, func, insert, literal, or_, select, update
+
+from ..extensions import db
+from ..models.shopping import ShoppingListItem
+from ..models.task import Task, TaskCategory
+from ..models.task_stats import TaskStatsDaily
+from ..models.user import User
+
+DAY_NAMES = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+
+def collect_stats(today):
+    """
+    Berechnet alle Kennzahlen fuer die Statistik-Seite.
+
+    Liest ausschliesslich die vorberechnete Tabelle ``task_stats_daily``
+    (O(Tage x User) Zeilen) statt die komplette ``tasks``-Tabelle zu
+    scannen. Alle Werte kommen aus wenigen gruppierten Abfragen, die
+    Anzahl der Roundtrips ist unabhaengig von der Anzahl der User.
+
+    :param today: Stichtag fuer ueberfaellige Aufgaben und die aktuelle Woche
+    :type today: date
+    :return: Template-Kontext fuer ``stats/index.html``
+    :rtype: dict
+    """
+    monday = today - timedelta(days=today.weekday())
+    sunday = monday + timedelta(days=6)
+
+    stats = TaskStatsDaily
+    # Ausgeschlossene Kategorien als Subquery – kein eigener Roundtrip
+    excluded_ids = select(TaskCategory.id).where(
+        TaskCategory.exclude_from_stats == True  # noqa: E712
+    )
+    included = or_(stats.category_id.is_(None), stats.category_id.notin_(excluded_ids))
+    in_week = stats.day.between(monday, sunday)
+
+    # --- Zaehler pro Rolle und User ---
+    rows = (
+        db.session.query(
+            stats.kind,
+            stats.user_id,
+            func.sum(stats.total),
+            func.sum(stats.done),
+            _sum_if(stats.day < today, stats.total - stats.done),
+            _sum_if(in_week, stats.total),
+            _sum_if(in_week, stats.done),
+        )
+        .filter(included)
+        .group_by(stats.kind, stats.user_id)
+        .all()
+    )
+
+    # Jede Aufgabe hat genau einen Ersteller, daher liefert die Rolle
+    # "created" ueber alle User summiert die globalen Zahlen.
+    totals = [0] * 5
+    counts_by_kind = {"created": {}, "assigned": {}, "completed": {}}
+    for kind, user_id, *counts in rows:
+        counts = [c or 0 for c in counts]
+        counts_by_kind.setdefault(kind, {})[user_id] = counts
+        if kind == "created":
+            totals = [t + c for t, c in zip(totals, counts)]
+    (
+        total_tasks,
+        total_done,
+        total_overdue,
+        tasks_this_week,
+        tasks_done_this_week,
+    ) = totals
+
+    shopping_by_user = dict(
+        db.session.query(ShoppingListItem.added_by, func.count(ShoppingListItem.id))
+        .group_by(ShoppingListItem.added_by)
+        .all()
+    )
+
+    # --- Pro User Statistiken ---
+    user_stats = []
+    for user in User.query.order_by(User.username).all():
+        tasks_assigned, assigned_done, tasks_overdue, _, _ = counts_by_kind[
+            "assigned"
+        ].get(user.id, [0] * 5)
+        tasks_completed = counts_by_kind["completed"].get(user.id, [0])[0]
+
+        completion_rate = 0
+        if tasks_assigned > 0:
+            completion_rate = round(tasks_completed / tasks_assigned * 100)
+
+        user_stats.append(
+            {
+                "user": user,
+                "tasks_created": counts_by_kind["created"].get(user.id, [0])[0],
+                "tasks_completed": tasks_completed,
+                "tasks_open": tasks_assigned - assigned_done,
+                "tasks_overdue": tasks_overdue,
+                "shopping_added": shopping_by_user.get(user.id, 0),
+                "completion_rate": completion_rate,
+            }
+        )
+
+    # --- Aufgaben pro Wochentag (dow: 0 = Sonntag, 6 = Samstag) ---
+    dow = extract("dow", stats.day)
+    by_dow = dict(
+        db.session.query(dow, func.sum(stats.total))
+        .filter(included, stats.kind == "created")
+        .group_by(dow)
+        .all()
+    )
+    tasks_by_weekday = [
+        {"day": DAY_NAMES[i], "count": by_dow.get((i + 1) % 7) or 0} for i in range(7)
+    ]
+
+    # --- Top-Kategorie (meiste Aufgaben, nur nicht ausgeschlossene) ---
+    top_category = (
+        db.session.query(TaskCategory.name)
+        .join(stats, stats.category_id == TaskCategory.id)
+        .filter(
+            stats.kind == "created",
+            TaskCategory.exclude_from_stats == False,  # noqa: E712
+        )
+        .group_by(TaskCategory.id, TaskCategory.name)
+        .having(func.sum(stats.total) > 0)
+        .order_by(func.sum(stats.total).desc())
+        .first()
+    )
+
+    return {
+        "user_stats": user_stats,
+        "total_tasks": total_tasks,
+        "total_done": total_done,
+        "total_open": total_tasks - total_done,
+        "total_overdue": total_overdue,
+        "total_shopping": sum(shopping_by_user.values()),
+        "tasks_this_week": tasks_this_week,
+        "tasks_done_this_week": tasks_done_this_week,
+        "tasks_by_weekday": tasks_by_weekday,
+        "top_category_name": top_category[0] if top_category else None,
+    }
+
+
+def record_tasks(tasks, sign=1):
+    """
+    Traegt Aufgaben inkrementell in ``task_stats_daily`` ein.
+
+    Mit ``sign=-1`` wird der Beitrag der Aufgaben wieder abgezogen. Bei
+    Aenderungen an einer Aufgabe wird daher zuerst der alte Zustand mit
+    ``sign=-1`` und danach der neue Zustand mit ``sign=1`` eingetragen.
+    Die Aenderungen laufen in der aktuellen Session und werden mit dem
+    naechsten Commit gemeinsam mit den Aufgaben gespeichert.
+
+    :param tasks: Task-Objekte (muessen noch nicht geflusht sein)
+    :type tasks: Iterable[Task]
+    :param sign: ``1`` zum Hinzufuegen, ``-1`` zum Entfernen
+    :type sign: int
+    """
+    _apply_deltas(
+        (
+            (
+                task.due_date,
+                task.is_done,
+                task.created_by,
+                task.assigned_to,
+                task.completed_by,
+                task.category_id,
+            )
+            for task in tasks
+        ),
+        sign,
+    )
+
+
+def record_task_rows(rows, sign=1):
+    """
+    Wie :func:`record_tasks`, aber fuer Spalten-Dicts eines Bulk-``INSERT``.
+
+    :param rows: Dicts mit den Spalten der Aufgaben (fehlende Spalten = None)
+    :type rows: Iterable[dict]
+    :param sign: ``1`` zum Hinzufuegen, ``-1`` zum Entfernen
+    :type sign: int
+    """
+    _apply_deltas(
+        (
+            (
+                row["due_date"],
+                row.get("is_done"),
+                row["created_by"],
+                row.get("assigned_to"),
+                row.get("completed_by"),
+                row.get("category_id"),
+            )
+            for row in rows
+        ),
+        sign,
+    )
+
+
+def _apply_deltas(items, sign):
+    """Fasst Aufgaben zu Zaehler-Deltas zusammen und schreibt sie in die Tabelle."""
+    deltas = {}
+    for due_date, is_done, created_by, assigned_to, completed_by, category_id in items:
+        done = 1 if is_done else 0
+        contributions = [("created", created_by, done)]
+        if assigned_to is not None:
+            contributions.append(("assigned", assigned_to, done))
+        if completed_by is not None:
+            contributions.append(("completed", completed_by, 1))
+
+        for kind, user_id, task_done in contributions:
+            key = (due_date, kind, user_id, category_id)
+            total_delta, done_delta = deltas.get(key, (0, 0))
+            deltas[key] = (total_delta + sign, done_delta + sign * task_done)
+
+    stats = TaskStatsDaily
+    for (day, kind, user_id, category_id), (total, done) in deltas.items():
+        if not total and not done:
+            continue
+
+        # Nur genau eine Zeile pro Schluessel anpassen (Duplikate sind erlaubt)
+        target_id = (
+            select(func.min(stats.id))
+            .where(
+                stats.day == day,
+                stats.kind == kind,
+                _is(stats.user_id, user_id),
+                _is(stats.category_id, category_id),
+            )
+            .scalar_subquery()
+        )
+        result = db.session.execute(
+            update(stats)
+            .where(stats.id == target_id)
+            .values(total=stats.total + total, done=stats.done + done)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.add(
+                stats(
+                    day=day,
+                    kind=kind,
+                    user_id=user_id,
+                    category_id=category_id,
+                    total=total,
+                    done=done,
+                )
+            )
+
+
+def reassign_user_stats(user_id, new_creator_id):
+    """
+    Passt ``task_stats_daily`` an, wenn ein User entfernt wird.
+
+    Spiegelt die Massen-Updates in ``admin.delete_user``: Erstellte Aufgaben
+    gehen an ``new_creator_id`` ueber, Zuweisungen und Erledigt-Vermerke
+    des Users entfallen.
+
+    :param user_id: ID des zu entfernenden Users
+    :type user_id: int
+    :param new_creator_id: ID des Users, der die erstellten Aufgaben uebernimmt
+    :type new_creator_id: int
+    """
+    stats = TaskStatsDaily
+    db.session.execute(
+        update(stats)
+        .where(stats.kind == "created", stats.user_id == user_id)
+        .values(user_id=new_creator_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        delete(stats)
+        .where(stats.kind.in_(["assigned", "completed"]), stats.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def clear_category_stats(category_id):
+    """
+    Setzt die Kategorie in ``task_stats_daily`` auf keine Kategorie.
+
+    :param category_id: ID der geloeschten Kategorie
+    :type category_id: int
+    """
+    db.session.execute(
+        update(TaskStatsDaily)
+        .where(TaskStatsDaily.category_id == category_id)
+        .values(category_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_task_stats():
+    """
+    Baut ``task_stats_daily`` komplett aus der ``tasks``-Tabelle neu auf.
+
+    :return: Anzahl der erzeugten Zeilen
+    :rtype: int
+    """
+    stats = TaskStatsDaily
+    done = case((Task.is_done == True, 1), else_=0)  # noqa: E712
+    sources = [
+        ("created", Task.created_by, done, Task.created_by.isnot(None)),
+        ("assigned", Task.assigned_to, done, Task.assigned_to.isnot(None)),
+        ("completed", Task.completed_by, literal(1), Task.completed_by.isnot(None)),
+    ]
+
+    db.session.execute(delete(stats))
+    for kind, user_col, done_expr, condition in sources:
+        source = (
+            select(
+                Task.due_date,
+                literal(kind),
+                user_col,
+                Task.category_id,
+                func.count(Task.id),
+                func.sum(done_expr),
+            )
+            .where(condition)
+            .group_by(Task.due_date, user_col, Task.category_id)
+        )
+        db.session.execute(
+            insert(stats).from_select(
+                ["day", "kind", "user_id", "category_id", "total", "done"], source
+            )
+        )
+    db.session.commit()
+    return db.session.query(func.count(stats.id)).scalar()
+
+
+def _sum_if(condition, value):
+    """Summiert ``value`` ueber die Zeilen einer Gruppe, die ``condition`` erfuellen."""
+    return func.sum(case((condition, value), else_=0))
+
+
+def _is(column, value):
+    """NULL-sicherer Gleichheitsvergleich."""
+    return column.is_(None) if value is None else column == value
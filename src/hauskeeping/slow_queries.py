@@ -0,0 +1,113 @@
+import logging
+import time
+
+from sqlalchemy import event
+
+from .extensions import db
+from .metrics import current_origin
+
+logger = logging.getLogger(__name__)
+
+# Maximale Laenge der geloggten Parameter (executemany kann sehr lang werden)
+_MAX_PARAMS_LENGTH = 1000
+
+# EXPLAIN-Praefix pro Datenbank-Dialekt
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+# Nur lesende Abfragen erklaeren
+_EXPLAINABLE = ("SELECT", "WITH")
+
+
+def init_slow_query_log(app):
+    """
+    Loggt SQL-Abfragen, die laenger als ``SLOW_QUERY_MS`` dauern.
+
+    Jede langsame Abfrage wird mit Dauer, Parametern und Herkunft (Endpoint
+    oder Scheduler-Job, siehe :func:`~hauskeeping.metrics.current_origin`)
+    als Warnung geloggt. Bei ``SLOW_QUERY_EXPLAIN`` wird fuer lesende Abfragen
+    auf SQLite und PostgreSQL zusaetzlich der Ausfuehrungsplan ermittelt.
+
+    :param app: Die Flask-App-Instanz
+    :type app: Flask
+    """
+    threshold_ms = app.config["SLOW_QUERY_MS"]
+    if threshold_ms <= 0:
+        return
+
+    threshold = threshold_ms / 1000
+    explain = app.config["SLOW_QUERY_EXPLAIN"]
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < threshold:
+            return
+
+        plan = None
+        if explain and not many:
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Langsame Abfrage (%.1f ms, %s): %s\nParameter: %s%s",
+            elapsed * 1000,
+            current_origin() or "unbekannt",
+            statement.strip(),
+            _format_parameters(parameters),
+            f"\nPlan:\n{plan}" if plan else "",
+        )
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def _explain(conn, statement, parameters):
+    """
+    Ermittelt den Ausfuehrungsplan einer lesenden Abfrage.
+
+    Laeuft direkt auf dem DBAPI-Cursor, damit die EXPLAIN-Abfrage selbst
+    keine Engine-Events ausloest. Auf PostgreSQL in einem Savepoint, damit
+    ein Fehler die laufende Transaktion nicht abbricht.
+
+    :return: Plan als Text oder ``None``, wenn kein Plan ermittelt werden kann
+    :rtype: str | None
+    """
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+
+    savepoint = conn.dialect.name == "postgresql"
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        finally:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    except Exception:
+        logger.debug("EXPLAIN fehlgeschlagen.", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+    # SQLite: (id, parent, notused, detail), PostgreSQL: (zeile,)
+    return "\n".join(f"  {row[-1]}" for row in rows)
+
+
+def _format_parameters(parameters):
+    """Kuerzt die Parameter auf :data:`_MAX_PARAMS_LENGTH` Zeichen."""
+    text = repr(parameters)
+    if len(text) > _MAX_PARAMS_LENGTH:
+        return text[:_MAX_PARAMS_LENGTH] + "..."
+    return text
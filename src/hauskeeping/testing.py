@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+from flask import current_app
+from sqlalchemy import event
+
+from .extensions import db
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Wird geworfen, wenn ein Codeblock mehr SQL-Abfragen absetzt als erlaubt."""
+
+
+class QueryCounter:
+    """Zaehlt die ueber die Engine abgesetzten SQL-Statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Zaehlt alle SQL-Statements, die innerhalb des Blocks ausgefuehrt werden.
+
+    Benoetigt einen aktiven Flask-App-Kontext.
+
+    :return: QueryCounter mit den abgesetzten Statements
+    :rtype: QueryCounter
+    """
+    counter = QueryCounter()
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._record)
+
+
+@contextmanager
+def query_budget(budget=None):
+    """
+    Schlaegt fehl, wenn der Block mehr als ``budget`` SQL-Abfragen absetzt.
+
+    Ohne ``budget`` gilt ``QUERY_BUDGET`` aus der App-Config.
+
+    :param budget: Maximale Anzahl erlaubter Abfragen
+    :type budget: int
+    :raises QueryBudgetExceeded: Wenn das Budget ueberschritten wurde
+    """
+    if budget is None:
+        budget = current_app.config["QUERY_BUDGET"]
+
+    with count_queries() as counter:
+        yield counter
+
+    if counter.count > budget:
+        listing = "\n".join(f"  {s}" for s in counter.statements)
+        raise QueryBudgetExceeded(
+            f"{counter.count} SQL-Abfragen, erlaubt sind {budget}:\n{listing}"
+        )
+
+
+def assert_view_query_budget(client, url, budget=None, **kwargs):
+    """
+    Ruft eine View ueber den Test-Client auf und prueft das Query-Budget.
+
+    :param client: Flask-Test-Client (ggf. bereits eingeloggt)
+    :type client: FlaskClient
+    :param url: Aufzurufende URL
+    :type url: str
+    :param budget: Maximale Anzahl erlaubter Abfragen (Default: ``QUERY_BUDGET``)
+    :type budget: int
+    :return: Die Response der View
+    :rtype: TestResponse
+    :raises QueryBudgetExceeded: Wenn das Budget ueberschritten wurde
+    """
+    with client.application.app_context():
+        with query_budget(budget):
+            return client.get(url, **kwargs)
@@ -0,0 +1,63 @@
+"""
+Eigenstaendiger Hintergrund-Prozess fuer Hauskeeping.
+
+Fuehrt ausschliesslich den Scheduler mit allen geplanten Jobs (E-Mail,
+Push-Outbox, Recurrence-Spawn, ...) aus. Die Web-Prozesse koennen dann mit
+``SCHEDULER_ENABLED=false`` ohne eigenen Scheduler laufen.
+
+Start::
+
+    flask hauskeeping-worker
+    python -m hauskeeping.worker
+"""
+
+import logging
+import signal
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(app):
+    """
+    Startet den Scheduler und blockiert bis SIGINT/SIGTERM.
+
+    Der Scheduler wird unabhaengig von ``SCHEDULER_ENABLED`` gestartet;
+    laeuft er im Prozess bereits, wird er weiterverwendet.
+
+    :param app: Die Flask-App-Instanz
+    :type app: Flask
+    """
+    from .scheduler import init_scheduler, scheduler
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    init_scheduler(app)
+    logger.info("Hauskeeping-Worker laeuft (%d Jobs).", len(scheduler.get_jobs()))
+
+    # Mit Timeout warten, damit Signale auch waehrend des Wartens ankommen
+    while not stop.wait(1):
+        pass
+
+    logger.info("Hauskeeping-Worker wird beendet.")
+    scheduler.shutdown()
+
+
+def main():
+    """Einstiegspunkt fuer ``python -m hauskeeping.worker``."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    from . import create_app
+
+    run_worker(create_app())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+# Die Config liest die Umgebung beim Import, daher vor dem App-Import setzen
+_DB_DIR = tempfile.mkdtemp(prefix="hauskeeping-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["JINJA_BYTECODE_CACHE"] = "false"
+os.environ.setdefault("MAIL_DEFAULT_SENDER", "test@example.com")
+
+from hauskeeping import create_app  # noqa: E402
+from hauskeeping.extensions import bcrypt, db  # noqa: E402
+from hauskeeping.models import AppState, User  # noqa: E402
+
+PASSWORD = "pw"
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    app.extensions["mail"].suppress = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(app):
+    user = User(
+        username="hausmeister",
+        email="hausmeister@example.com",
+        password_hash=bcrypt.generate_password_hash(PASSWORD).decode("utf-8"),
+        role="hausmeister",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    client = app.test_client()
+    client.post("/auth/login", data={"username": user.username, "password": PASSWORD})
+    return client
+
+
+@pytest.fixture
+def spawned_until(app):
+    """
+    Stand nach einem Spawn-Lauf: Marker auf dem Spawn-Horizont.
+
+    :return: Sonntag der letzten gespawnten Woche
+    """
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    horizon = monday + timedelta(weeks=app.config["RECURRENCE_LOOKAHEAD_WEEKS"])
+    db.session.add(AppState(key="last_recurrence_monday", value=str(horizon)))
+    db.session.commit()
+    return horizon + timedelta(days=6)
@@ -0,0 +1,42 @@
+from sqlalchemy import func, select
+
+from hauskeeping.extensions import db
+from hauskeeping.models import PushOutbox
+from hauskeeping.services.outbox_service import enqueue_push, enqueue_pushes
+
+
+def _outbox_count():
+    return db.session.scalar(select(func.count(PushOutbox.id)))
+
+
+def test_enqueue_skips_existing_idempotency_keys(app, user):
+    assert enqueue_push(user, "Titel", "Text", idempotency_key="k1")
+    db.session.commit()
+
+    count = enqueue_pushes(
+        [
+            (user, "Titel", "Text", None, "k1"),
+            (user, "Titel", "Text", None, "k2"),
+            (user, "Titel", "Text", None, "k2"),
+            (user, "Ohne Schluessel", "Text", None, None),
+        ]
+    )
+    db.session.commit()
+
+    assert count == 2
+    assert _outbox_count() == 3
+
+
+def test_enqueue_tolerates_key_committed_by_other_process(app, user):
+    # Anderer Prozess traegt denselben Schluessel ueber eine eigene
+    # Verbindung ein, waehrend diese Session bereits eine Transaktion hat
+    assert _outbox_count() == 0
+    with db.engine.begin() as connection:
+        connection.execute(
+            PushOutbox.__table__.insert(),
+            {"user_id": user.id, "title": "T", "body": "B", "idempotency_key": "k"},
+        )
+
+    assert not enqueue_push(user, "Titel", "Text", idempotency_key="k")
+    db.session.commit()
+    assert _outbox_count() == 1
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import url_for
+
+from hauskeeping.extensions import db
+from hauskeeping.models import Task, TaskCategory, User
+from hauskeeping.services.mail_service import send_weekly_summary
+from hauskeeping.testing import assert_view_query_budget, query_budget
+
+# Mehr Aufgaben als das Query-Budget: ein Lazy Load pro Zeile faellt auf
+TASKS = 40
+
+
+@pytest.fixture
+def tasks(app, user):
+    """Aufgaben der aktuellen Woche mit Kategorie, Zuweisung und Erlediger."""
+    today = datetime.now(timezone.utc).date()
+    monday = today - timedelta(days=today.weekday())
+    members = [
+        User(
+            username=f"member{i}",
+            email=f"member{i}@example.com",
+            password_hash="x",
+            email_notifications_enabled=True,
+            email_notification_day=today.weekday(),
+        )
+        for i in range(4)
+    ]
+    # Eine Kategorie pro Aufgabe, damit Lazy Loads nicht aus der Identity Map
+    # bedient werden
+    categories = [
+        TaskCategory(name=f"Kategorie {i}", slug=f"kategorie-{i}") for i in range(TASKS)
+    ]
+    db.session.add_all(members + categories)
+    db.session.flush()
+
+    for i in range(TASKS):
+        done = i % 3 == 0
+        member = members[i % len(members)]
+        db.session.add(
+            Task(
+                title=f"Aufgabe {i}",
+                due_date=monday + timedelta(days=i % 7),
+                category_id=categories[i].id,
+                assigned_to=member.id,
+                created_by=user.id,
+                is_done=done,
+                completed_by=members[(i + 1) % len(members)].id if done else None,
+                completed_at=datetime.now(timezone.utc) if done else None,
+            )
+        )
+    db.session.commit()
+    assert TASKS > app.config["QUERY_BUDGET"]
+
+
+@pytest.mark.parametrize(
+    "endpoint, params",
+    [
+        ("tasks.task_list", {"show": "all"}),
+        ("tasks.task_list_json", {"show": "all"}),
+        ("main.dashboard", {}),
+    ],
+)
+def test_view_stays_within_query_budget(app, client, tasks, endpoint, params):
+    with app.test_request_context():
+        url = url_for(endpoint, **params)
+
+    response = assert_view_query_budget(client, url)
+
+    assert response.status_code == 200
+    assert "Aufgabe 1" in response.get_data(as_text=True)
+
+
+def test_weekly_summary_stays_within_query_budget(app, tasks):
+    with query_budget():
+        assert send_weekly_summary() == 4
@@ -0,0 +1,162 @@
+from datetime import date
+
+import pytest
+
+from hauskeeping.services.recurrence import compile_rule, parse_rule, validate_rule
+
+# 01.01.2026 ist ein Donnerstag
+START = date(2026, 1, 1)
+
+
+def _dates(*values):
+    return [date.fromisoformat(value) for value in values]
+
+
+@pytest.mark.parametrize(
+    ("rule", "dtstart", "start", "end", "expected"),
+    [
+        # Alte Kurzformen
+        (
+            "daily",
+            START,
+            START,
+            date(2026, 1, 4),
+            _dates("2026-01-01", "2026-01-02", "2026-01-03", "2026-01-04"),
+        ),
+        (
+            "weekly",
+            START,
+            START,
+            date(2026, 1, 31),
+            _dates(
+                "2026-01-01", "2026-01-08", "2026-01-15", "2026-01-22", "2026-01-29"
+            ),
+        ),
+        # Monatlich ohne BYDAY/BYMONTHDAY: 31. wird auf das Monatsende geklemmt
+        (
+            "monthly",
+            date(2026, 1, 31),
+            START,
+            date(2026, 5, 31),
+            _dates(
+                "2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30", "2026-05-31"
+            ),
+        ),
+        # INTERVAL
+        (
+            "FREQ=DAILY;INTERVAL=3",
+            START,
+            START,
+            date(2026, 1, 10),
+            _dates("2026-01-01", "2026-01-04", "2026-01-07", "2026-01-10"),
+        ),
+        (
+            "FREQ=DAILY;INTERVAL=3",
+            START,
+            date(2026, 1, 5),
+            date(2026, 1, 12),
+            _dates("2026-01-07", "2026-01-10"),
+        ),
+        # Der Montag der Startwoche liegt vor dtstart und zaehlt nicht
+        (
+            "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+            START,
+            START,
+            date(2026, 1, 31),
+            _dates(
+                "2026-01-01", "2026-01-12", "2026-01-15", "2026-01-26", "2026-01-29"
+            ),
+        ),
+        (
+            "RRULE:FREQ=WEEKLY;BYDAY=SA;WKST=MO",
+            START,
+            START,
+            date(2026, 1, 17),
+            _dates("2026-01-03", "2026-01-10", "2026-01-17"),
+        ),
+        # BYDAY mit Ordinalzahlen
+        (
+            "FREQ=MONTHLY;BYDAY=-1FR",
+            START,
+            START,
+            date(2026, 3, 31),
+            _dates("2026-01-30", "2026-02-27", "2026-03-27"),
+        ),
+        # Nur Maerz und Juni haben einen fuenften Montag
+        (
+            "FREQ=MONTHLY;BYDAY=5MO",
+            START,
+            START,
+            date(2026, 6, 30),
+            _dates("2026-03-30", "2026-06-29"),
+        ),
+        # BYMONTHDAY
+        (
+            "FREQ=MONTHLY;BYMONTHDAY=-1",
+            START,
+            START,
+            date(2026, 4, 30),
+            _dates("2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30"),
+        ),
+        (
+            "FREQ=MONTHLY;BYMONTHDAY=31",
+            START,
+            START,
+            date(2026, 5, 31),
+            _dates("2026-01-31", "2026-03-31", "2026-05-31"),
+        ),
+        # COUNT und UNTIL
+        (
+            "FREQ=WEEKLY;COUNT=3",
+            START,
+            START,
+            date(2026, 12, 31),
+            _dates("2026-01-01", "2026-01-08", "2026-01-15"),
+        ),
+        # dtstart passt nicht zur Regel und zaehlt daher nicht fuer COUNT
+        (
+            "FREQ=WEEKLY;BYDAY=MO;COUNT=2",
+            START,
+            START,
+            date(2026, 12, 31),
+            _dates("2026-01-05", "2026-01-12"),
+        ),
+        (
+            "FREQ=DAILY;UNTIL=20260103",
+            START,
+            START,
+            date(2026, 1, 31),
+            _dates("2026-01-01", "2026-01-02", "2026-01-03"),
+        ),
+        # Fenster vor dtstart
+        ("FREQ=DAILY", START, date(2025, 12, 1), date(2025, 12, 31), []),
+    ],
+)
+def test_between(rule, dtstart, start, end, expected):
+    assert validate_rule(rule) is None
+    assert compile_rule(rule, dtstart).between(start, end) == expected
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "FREQ=YEARLY",
+        "FREQ=DAILY;INTERVAL=0",
+        "FREQ=DAILY;INTERVAL=x",
+        "FREQ=WEEKLY;BYDAY=2MO",
+        "FREQ=MONTHLY;BYDAY=6MO",
+        "FREQ=MONTHLY;BYDAY=XX",
+        "FREQ=MONTHLY;BYMONTHDAY=0",
+        "FREQ=MONTHLY;BYMONTHDAY=32",
+        "FREQ=DAILY;COUNT=2;UNTIL=20260101",
+        "FREQ=DAILY;UNTIL=2026",
+        "FREQ=DAILY;BYHOUR=3",
+        "FREQ=DAILY;FREQ=WEEKLY",
+        "BYDAY=MO",
+        "yearly",
+    ],
+)
+def test_rejected_rules(rule):
+    with pytest.raises(ValueError):
+        parse_rule(rule)
+    assert validate_rule(rule)
@@ -0,0 +1,153 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from hauskeeping.extensions import db
+from hauskeeping.models import Task
+
+
+def _instance_dates(template_id):
+    return db.session.scalars(
+        select(Task.due_date)
+        .where(Task.parent_task_id == template_id)
+        .order_by(Task.due_date)
+    ).all()
+
+
+def _weekly_after(day, until):
+    dates = []
+    day += timedelta(weeks=1)
+    while day <= until:
+        dates.append(day)
+        day += timedelta(weeks=1)
+    return dates
+
+
+def test_template_created_after_spawn_gets_covered_weeks(client, spawned_until):
+    today = date.today()
+
+    response = client.post(
+        "/tasks/create",
+        data={
+            "title": "Muell rausbringen",
+            "due_date": today.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    assert response.status_code == 302
+
+    template = db.session.scalar(select(Task).where(Task.parent_task_id.is_(None)))
+    assert _instance_dates(template.id) == _weekly_after(today, spawned_until)
+
+
+def test_rule_added_on_edit_spawns_covered_weeks(client, user, spawned_until):
+    today = date.today()
+    task = Task(title="Bad putzen", due_date=today, created_by=user.id)
+    db.session.add(task)
+    db.session.commit()
+
+    response = client.post(
+        f"/tasks/{task.id}/edit",
+        data={
+            "title": "Bad putzen",
+            "due_date": today.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    assert response.status_code == 302
+    assert _instance_dates(task.id) == _weekly_after(today, spawned_until)
+
+    # Speichern ohne Aenderung der Regel legt nichts doppelt an
+    client.post(
+        f"/tasks/{task.id}/edit",
+        data={
+            "title": "Bad putzen (gruendlich)",
+            "due_date": today.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    assert _instance_dates(task.id) == _weekly_after(today, spawned_until)
+
+
+def _make_weekly(client, user, title, due_date):
+    task = Task(title=title, due_date=due_date, created_by=user.id)
+    db.session.add(task)
+    db.session.commit()
+    client.post(
+        f"/tasks/{task.id}/edit",
+        data={
+            "title": title,
+            "due_date": due_date.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    return task
+
+
+def test_changed_weekday_replaces_open_instances(client, user, spawned_until):
+    today = date.today()
+    task = _make_weekly(client, user, "Rasen maehen", today)
+
+    shifted = today + timedelta(days=1)
+    response = client.post(
+        f"/tasks/{task.id}/edit",
+        data={
+            "title": "Rasen maehen (hinten)",
+            "due_date": shifted.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+    assert response.status_code == 302
+
+    # Genau ein Vorkommen pro Woche, mit den neuen Werten des Templates
+    instances = db.session.scalars(
+        select(Task).where(Task.parent_task_id == task.id)
+    ).all()
+    assert sorted(t.due_date for t in instances) == _weekly_after(
+        shifted, spawned_until
+    )
+    assert {t.title for t in instances} == {"Rasen maehen (hinten)"}
+
+
+def test_edit_keeps_done_and_moved_instances(client, user, spawned_until):
+    today = date.today()
+    task = _make_weekly(client, user, "Bad putzen", today)
+    done, moved = db.session.scalars(
+        select(Task)
+        .where(Task.parent_task_id == task.id)
+        .order_by(Task.due_date)
+        .limit(2)
+    ).all()
+    done.is_done = True
+    moved.due_date += timedelta(days=3)
+    db.session.commit()
+    kept = {(done.id, done.due_date), (moved.id, moved.due_date)}
+
+    client.post(
+        f"/tasks/{task.id}/edit",
+        data={
+            "title": "Bad putzen (gruendlich)",
+            "due_date": today.isoformat(),
+            "recurrence_rule": "FREQ=WEEKLY",
+        },
+    )
+
+    instances = db.session.scalars(
+        select(Task).where(Task.parent_task_id == task.id)
+    ).all()
+    assert kept <= {(t.id, t.due_date) for t in instances}
+    assert sorted(t.occurrence_date for t in instances) == _weekly_after(
+        today, spawned_until
+    )
+
+
+def test_removed_rule_deletes_open_instances(client, user, spawned_until):
+    today = date.today()
+    task = _make_weekly(client, user, "Fenster putzen", today)
+    assert _instance_dates(task.id)
+
+    client.post(
+        f"/tasks/{task.id}/edit",
+        data={"title": "Fenster putzen", "due_date": today.isoformat()},
+    )
+    assert _instance_dates(task.id) == []
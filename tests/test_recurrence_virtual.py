@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+from hauskeeping.extensions import db
+from hauskeeping.models import Task
+from hauskeeping.scheduler import spawn_template
+from hauskeeping.services.recurrence import expand_recurrences
+
+
+def _weekly_template(user, due_date):
+    template = Task(
+        title="Rasen maehen",
+        due_date=due_date,
+        created_by=user.id,
+        recurrence_rule="FREQ=WEEKLY",
+    )
+    db.session.add(template)
+    db.session.commit()
+    return template
+
+
+def test_unspawned_template_expands_before_marker(app, user, spawned_until):
+    # Z.B. angelegt, waehrend ein Spawn-Lauf die Templates schon geladen hatte
+    today = date.today()
+    template = _weekly_template(user, today)
+
+    virtual = expand_recurrences(today, spawned_until)
+
+    assert [task.due_date for task in virtual] == [
+        today + timedelta(weeks=week)
+        for week in range(1, (spawned_until - today).days // 7 + 1)
+    ]
+    assert {task.template_id for task in virtual} == {template.id}
+
+
+def test_moved_occurrence_is_not_regenerated(app, client, user, spawned_until):
+    today = date.today()
+    template = _weekly_template(user, today)
+    spawn_template(template)
+    db.session.commit()
+
+    original = today + timedelta(weeks=1)
+    instance = Task.query.filter_by(parent_task_id=template.id, due_date=original).one()
+    response = client.post(
+        f"/tasks/{instance.id}/edit",
+        data={
+            "title": instance.title,
+            "due_date": (original + timedelta(days=2)).isoformat(),
+            "recurrence_rule": instance.recurrence_rule,
+        },
+    )
+    assert response.status_code == 302
+
+    # Weder erneut gespawnt noch virtuell, auch nach dem Spawn-Horizont
+    spawn_template(template)
+    db.session.commit()
+    assert not Task.query.filter_by(
+        parent_task_id=template.id, due_date=original
+    ).count()
+    assert original not in [
+        task.due_date for task in expand_recurrences(today, spawned_until)
+    ]
+
+    # Verschobenes Vorkommen jenseits von spawned_until
+    later = spawned_until + timedelta(days=1 + today.weekday())
+    client.post(
+        f"/tasks/recurring/{template.id}/{later.isoformat()}/edit",
+        data={
+            "title": template.title,
+            "due_date": (later + timedelta(days=1)).isoformat(),
+            "recurrence_rule": template.recurrence_rule,
+        },
+    )
+    virtual = expand_recurrences(later, later + timedelta(days=1))
+    assert later not in [task.due_date for task in virtual]
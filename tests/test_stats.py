@@ -0,0 +1,104 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from hauskeeping.extensions import bcrypt, db
+from hauskeeping.models import Task, TaskCategory, TaskStatsDaily, User
+from hauskeeping.services.stats_service import collect_stats, rebuild_task_stats
+
+MEMBER_PASSWORD = "mitglied"
+
+
+def _task_id(title):
+    return db.session.scalar(
+        select(Task.id).where(Task.title == title, Task.parent_task_id.is_(None))
+    )
+
+
+def _stats_rows():
+    """Summen aus ``task_stats_daily`` ohne leer gewordene Gruppen."""
+    stats = TaskStatsDaily
+    columns = (stats.day, stats.kind, stats.user_id, stats.category_id)
+    rows = db.session.execute(
+        select(*columns, func.sum(stats.total), func.sum(stats.done))
+        .group_by(*columns)
+        .having(func.sum(stats.total) != 0)
+    )
+    return sorted(tuple(row) for row in rows)
+
+
+def _category_id(name):
+    return db.session.scalar(select(TaskCategory.id).where(TaskCategory.name == name))
+
+
+def _create(client, title, due_date, **fields):
+    form = {"title": title, "due_date": due_date.isoformat(), **fields}
+    response = client.post("/tasks/create", data=form)
+    assert response.status_code == 302
+    return _task_id(title)
+
+
+def test_incremental_stats_match_rebuild(app, client, user, spawned_until):
+    today = date.today()
+    member = User(
+        username="mitglied",
+        email="mitglied@example.com",
+        password_hash=bcrypt.generate_password_hash(MEMBER_PASSWORD).decode("utf-8"),
+    )
+    db.session.add(member)
+    db.session.commit()
+    member_id = member.id
+    member_client = app.test_client()
+    member_client.post(
+        "/auth/login", data={"username": "mitglied", "password": MEMBER_PASSWORD}
+    )
+
+    for name in ("Kueche", "Bad", "Garten"):
+        client.post("/tasks/categories/add", data={"name": name})
+    kitchen, bath, garden = (_category_id(n) for n in ("Kueche", "Bad", "Garten"))
+
+    spuelen = _create(
+        member_client,
+        "Spuelen",
+        today - timedelta(days=2),
+        category_id=bath,
+        assigned_to=user.id,
+    )
+    putzen = _create(client, "Putzen", today, category_id=bath, assigned_to=member_id)
+    _create(
+        member_client,
+        "Rasen maehen",
+        today,
+        category_id=garden,
+        assigned_to=member_id,
+        recurrence_rule="FREQ=WEEKLY",
+    )
+    muell = _create(client, "Muell", today + timedelta(days=1), category_id=kitchen)
+
+    client.post(
+        f"/tasks/{spuelen}/edit",
+        data={
+            "title": "Spuelen",
+            "due_date": (today - timedelta(days=1)).isoformat(),
+            "category_id": kitchen,
+            "assigned_to": member_id,
+        },
+    )
+    member_client.post(f"/tasks/{putzen}/toggle")
+    client.post(f"/tasks/{spuelen}/toggle")
+    client.post(f"/tasks/{spuelen}/toggle")
+    client.post(f"/tasks/{muell}/delete")
+    client.post(f"/tasks/categories/{kitchen}/delete")
+    client.post(f"/admin/users/{member_id}/delete")
+    assert db.session.get(User, member_id) is None
+
+    incremental = collect_stats(today)
+    incremental_rows = _stats_rows()
+    assert incremental["total_tasks"] > 3
+    assert incremental["total_done"] == 1
+
+    rebuild_task_stats()
+
+    assert collect_stats(today) == incremental
+    # Geloeschte User/Kategorien fallen in collect_stats() nicht auf
+    assert _stats_rows() == incremental_rows
@@ -0,0 +1,94 @@
+import smtplib
+from datetime import date
+
+import flask_mail
+import pytest
+
+from hauskeeping.extensions import db
+from hauskeeping.models import User
+from hauskeeping.services.mail_service import send_weekly_summary
+
+
+class FakeSMTP:
+    """SMTP-Host, der nach ``drop_after`` Mails die Verbindung verliert."""
+
+    def __init__(self, drop_after=None):
+        self.drop_after = drop_after
+        self.sent = []
+        self.closed = False
+
+    def sendmail(self, sender, recipients, *args):
+        if self.closed or len(self.sent) == self.drop_after:
+            self.closed = True
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.extend(recipients)
+
+    def quit(self):
+        if self.closed:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    """Zaehlt die Verbindungen; die erste bricht nach ``drop_first_after`` ab."""
+
+    def __init__(self):
+        self.drop_first_after = None
+        self.hosts = []
+
+    def open_host(self):
+        drop_after = None if self.hosts else self.drop_first_after
+        self.hosts.append(FakeSMTP(drop_after))
+        return self.hosts[-1]
+
+    @property
+    def sent(self):
+        return [email for host in self.hosts for email in host.sent]
+
+
+@pytest.fixture
+def smtp(app, monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(
+        flask_mail.Connection, "configure_host", lambda connection: server.open_host()
+    )
+    monkeypatch.setattr(app.extensions["mail"], "suppress", False)
+    return server
+
+
+def _recipients(count):
+    weekday = date.today().weekday()
+    users = [
+        User(
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            password_hash="x",
+            email_notifications_enabled=True,
+            email_notification_day=weekday,
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.email for user in users]
+
+
+def test_weekly_summary_reconnects_after_disconnect(app, smtp):
+    smtp.drop_first_after = 2
+    emails = _recipients(5)
+
+    assert send_weekly_summary() == 5
+    assert smtp.sent == emails
+    assert len(smtp.hosts) == 2
+
+
+def test_weekly_summary_uses_one_connection_per_batch(app, smtp):
+    app.config["WEEKLY_MAIL_BATCH_SIZE"] = 2
+    emails = _recipients(5)
+
+    assert send_weekly_summary() == 5
+    assert smtp.sent == emails
+    assert len(smtp.hosts) == 3